@@ -90,12 +90,14 @@ class SimpleAgent(AgentController):
     - Speaks during dialogue phase, votes during voting phase
     """
 
-    def __init__(self, agent_id, role="CREW"):
+    def __init__(self, agent_id, role="CREW", rng=None):
         self.agent_id = agent_id
         self.role = role
-        self.current_direction = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+        # random.Random stream for this agent (default: the shared random module)
+        self.rng = rng if rng is not None else random
+        self.current_direction = self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])
         self.direction_ticks = 0
-        self.direction_duration = random.randint(30, 120)
+        self.direction_duration = self.rng.randint(30, 120)
         self.has_voted = False
         self.has_spoken = False
         self.vote_target = None  # Remember who we accused for consistent voting
@@ -109,34 +111,34 @@ class SimpleAgent(AgentController):
         
         # Pick a random target (someone to accuse or mention)
         candidates = [a for a in alive if a != self.agent_id]
-        target = random.choice(candidates) if candidates else "someone"
+        target = self.rng.choice(candidates) if candidates else "someone"
         
         if self.role == "IMPOSTER":
             # Imposter deflects blame onto others
-            if random.random() < 0.7:
-                template = random.choice(IMPOSTER_DEFLECT_TEMPLATES)
+            if self.rng.random() < 0.7:
+                template = self.rng.choice(IMPOSTER_DEFLECT_TEMPLATES)
             else:
-                template = random.choice(DEFENSE_TEMPLATES)
+                template = self.rng.choice(DEFENSE_TEMPLATES)
             self.vote_target = target  # Vote for who we accused
         else:
             # Crew member: accuse, observe, or express uncertainty
-            roll = random.random()
+            roll = self.rng.random()
             if roll < 0.4:
-                template = random.choice(ACCUSATION_TEMPLATES)
+                template = self.rng.choice(ACCUSATION_TEMPLATES)
                 self.vote_target = target
             elif roll < 0.6:
-                template = random.choice(OBSERVATION_TEMPLATES)
+                template = self.rng.choice(OBSERVATION_TEMPLATES)
                 self.vote_target = target
             elif roll < 0.8:
-                template = random.choice(UNCERTAINTY_TEMPLATES)
+                template = self.rng.choice(UNCERTAINTY_TEMPLATES)
                 self.vote_target = None  # Will skip
             else:
-                template = random.choice(DEFENSE_TEMPLATES)
-                self.vote_target = random.choice(candidates) if candidates else None
+                template = self.rng.choice(DEFENSE_TEMPLATES)
+                self.vote_target = self.rng.choice(candidates) if candidates else None
         
         # Fill in template placeholders
-        safe = random.choice([a for a in alive if a != target and a != self.agent_id]) if len(alive) > 1 else self.agent_id
-        room = random.choice(ROOMS)
+        safe = self.rng.choice([a for a in alive if a != target and a != self.agent_id]) if len(alive) > 1 else self.agent_id
+        room = self.rng.choice(ROOMS)
         
         message = template.format(target=target, safe=safe, room=room)
         return message
@@ -167,7 +169,7 @@ class SimpleAgent(AgentController):
                     alive = observation.get("alive_agents", [])
                     candidates = [a for a in alive if a != self.agent_id]
                     candidates.append(None)  # skip option
-                    return {"type": "VOTE", "data": random.choice(candidates)}
+                    return {"type": "VOTE", "data": self.rng.choice(candidates)}
                 return {"type": "NONE"}
             
             return {"type": "NONE"}
@@ -191,21 +193,21 @@ class SimpleAgent(AgentController):
         # Force direction change when stuck against wall
         if self.wall_stuck_counter > 10:
             self.wall_stuck_counter = 0
-            self.current_direction = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
-            self.direction_duration = random.randint(20, 60)
+            self.current_direction = self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            self.direction_duration = self.rng.randint(20, 60)
             self.direction_ticks = 0
 
         # --- IMPOSTER: try to kill nearby agents ---
         if self.role == "IMPOSTER" and observation.get("can_kill", False):
             nearby = observation.get("nearby_agents", [])
-            if nearby and random.random() < 0.5:
-                return {"type": "KILL", "data": random.choice(nearby)}
+            if nearby and self.rng.random() < 0.5:
+                return {"type": "KILL", "data": self.rng.choice(nearby)}
 
         # --- MOVEMENT: random walk with periodic direction changes ---
         self.direction_ticks += 1
         if self.direction_ticks >= self.direction_duration:
-            self.current_direction = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
-            self.direction_duration = random.randint(30, 120)
+            self.current_direction = self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+            self.direction_duration = self.rng.randint(30, 120)
             self.direction_ticks = 0
 
         return {"type": "MOVE", "data": self.current_direction}
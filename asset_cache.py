@@ -0,0 +1,144 @@
+"""
+On-Disk Cache of Converted / Pre-Scaled Images for MonadSus.
+
+Game.load_data decodes dozens of PNGs and then runs convert_alpha() and
+smoothscale on many of them (UI icons, task panels, the light masks at
+LIGHT_RADIUS, every Button). load() keeps the final pixels of each of
+those in .asset_cache/, already in the display's pixel format:
+
+    self.light_bulb_icon = asset_cache.load("Assets/Images/UI/light_bulb_icon.png", (75, 90))
+
+The first launch does the work as before and writes the result. Later
+launches read the raw pixels back with pg.image.frombuffer: no PNG decode,
+no resampling, and no convert_alpha() when the stored format is the
+display's.
+
+Entries are keyed by a hash of the source file's bytes plus everything
+that shapes the output (size, smooth / plain scale, pixel format, pygame
+version), so editing an asset or a scale parameter simply misses the old
+entry. Stale entries are never read again; `python asset_cache.py clear`
+deletes them all.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+from os import path
+
+import pygame as pg
+
+CACHE_DIR = ".asset_cache"
+VERSION = 1
+MAGIC = b"MSAC"
+HEADER = struct.Struct("<4sHII4s")         # magic, version, width, height, format
+
+# SRCALPHA masks (R, G, B, A) -> frombuffer / tobytes format
+ALPHA_FORMATS = {(0xFF0000, 0x00FF00, 0x0000FF, 0xFF000000): "BGRA",
+                 (0x0000FF, 0x00FF00, 0xFF0000, 0xFF000000): "RGBA"}
+
+enabled = True
+hits = 0
+misses = 0
+
+
+def display_format():
+    """The frombuffer format convert_alpha() produces, or None without a display."""
+    if pg.display.get_surface() is None:
+        return None
+    probe = pg.Surface((1, 1), pg.SRCALPHA).convert_alpha()
+    return ALPHA_FORMATS.get(probe.get_masks(), "RGBA")
+
+
+def _key(data, size, smooth, fmt):
+    h = hashlib.sha256(data)
+    h.update(repr((VERSION, pg.version.ver, size and tuple(size), smooth, fmt)).encode())
+    return h.hexdigest()
+
+
+def _build(file, size, smooth, converting):
+    # exactly the load_data sequence: load, convert, scale, convert
+    image = pg.image.load(file)
+    if converting:
+        image = image.convert_alpha()
+    if size is not None and tuple(size) != image.get_size():
+        scale = pg.transform.smoothscale if smooth else pg.transform.scale
+        image = scale(image, size)
+        if converting:
+            image = image.convert_alpha()
+    return image
+
+
+def _read(entry, fmt):
+    with open(entry, "rb") as f:
+        magic, version, width, height, stored = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or stored.decode() != fmt:
+            return None
+        pixels = bytearray(width * height * 4)           # writable: the surface may be drawn on
+        if f.readinto(pixels) != len(pixels):
+            return None
+    return pg.image.frombuffer(pixels, (width, height), fmt)
+
+
+def _write(entry, image, fmt):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp = f"{entry}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, image.get_width(), image.get_height(), fmt.encode()))
+        f.write(pg.image.tobytes(image, fmt))
+    os.replace(temp, entry)                              # concurrent launches never see half a file
+
+
+def load(file, size=None, smooth=True) -> pg.Surface:
+    """file loaded with per-pixel alpha, scaled to size, in the display format when there is one.
+
+    Same pixels as pg.image.load(file).convert_alpha() followed by
+    pg.transform.smoothscale (smooth=False: pg.transform.scale) and
+    another convert_alpha().
+    """
+    global hits, misses
+    fmt = display_format()
+    if not enabled:
+        return _build(file, size, smooth, fmt is not None)
+    with open(file, "rb") as f:
+        data = f.read()
+    entry = path.join(CACHE_DIR, _key(data, size, smooth, fmt or "RGBA") + ".px")
+    try:
+        image = _read(entry, fmt or "RGBA")
+    except (OSError, ValueError, struct.error, pg.error):
+        image = None
+    if image is not None:
+        hits += 1
+        return image
+
+    misses += 1
+    image = _build(file, size, smooth, fmt is not None)
+    try:
+        _write(entry, image, fmt or "RGBA")
+    except (OSError, pg.error) as e:
+        print(f"  [ASSETS] could not cache {file}: {e}")
+    return image
+
+
+def clear():
+    """Delete every cached entry; returns (files, bytes) removed."""
+    removed = freed = 0
+    if path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            entry = path.join(CACHE_DIR, name)
+            freed += os.path.getsize(entry)
+            os.remove(entry)
+            removed += 1
+    return removed, freed
+
+
+if __name__ == "__main__":
+    # python asset_cache.py [stats|clear]
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "clear":
+        removed, freed = clear()
+        print(f"  [ASSETS] removed {removed} entries ({freed / 1024:.0f} KiB) from {CACHE_DIR}")
+    else:
+        names = os.listdir(CACHE_DIR) if path.isdir(CACHE_DIR) else []
+        size = sum(os.path.getsize(path.join(CACHE_DIR, n)) for n in names)
+        print(f"  [ASSETS] {len(names)} entries, {size / 1024:.0f} KiB in {CACHE_DIR}")
@@ -0,0 +1,202 @@
+"""
+Packed Player Sprite Atlases for MonadSus.
+
+Every colour's animation frames (walk left / right / up / down, ghost,
+dead body) are packed into one sheet per colour, and each frame is a
+subsurface view into it, found by (colour, animation, frame):
+
+    atlas = PLAYER_ATLASES["Blue"]          # settings.py
+    atlas.frames("left")                     # list of subsurfaces, frame order
+    atlas.image("dead")                      # frame 0
+
+The packed sheet and its index are saved next to the sprites
+(Assets/Images/Player/Atlas/<Colour>.png + .json) the first time they are
+built, so later starts load one PNG per colour instead of ~70 files and
+skip the smoothscale of every frame. The index records each source file's
+size and mtime; if any source changes, the sheet is rebuilt.
+
+Call convert_atlases() once a display exists (Game() does): each sheet
+is converted to the display format and the frame lists are refilled in
+place, so lists already handed out (settings' red_player_imgs_left, ...)
+blit converted frames too.
+"""
+
+import json
+import os
+from os import path
+
+import pygame as pg
+
+SPRITE_SIZE = (64, 86)          # walk and ghost frames are scaled to this
+PLAYER_DIR = "Assets/Images/Player"
+ATLAS_DIR = path.join(PLAYER_DIR, "Atlas")
+ATLAS_VERSION = 1
+
+COLOURS = ("Red", "Blue", "Green", "Orange", "Yellow", "Black", "Brown", "Pink", "Purple", "White")
+WALKS = ("left", "right", "up", "down")
+# Colours with full walk cycles and ghost frames; the others have one frame per direction
+ANIMATED = ("Red", "Blue", "Green", "Orange", "Yellow")
+WALK_FRAMES = {"left": 17, "right": 17, "up": 17, "down": 18}
+
+
+def player_sources(colour):
+    """[(animation, [(file, scale to SPRITE_SIZE?)])] for colour, in frame order."""
+    prefix = colour.lower()
+    sources = []
+    for walk in WALKS:
+        count = WALK_FRAMES[walk] if colour in ANIMATED else 1
+        sources.append((walk, [(f"{PLAYER_DIR}/{colour}/{prefix}_{walk}_walk/step{i}.png", True)
+                               for i in range(1, count + 1)]))
+    if colour in ANIMATED:
+        for side in ("left", "right"):
+            sources.append((f"ghost_{side}", [(f"{PLAYER_DIR}/{colour}/{prefix}_ghost/step1_{side}.png", True)]))
+    sources.append(("dead", [(f"{PLAYER_DIR}/Dead/Dead{prefix}.png", False)]))
+    return sources
+
+
+# ---------------------------------------------------------------------------
+# Atlas
+# ---------------------------------------------------------------------------
+
+class SpriteAtlas:
+    """One sheet plus {animation: [Rect per frame]}; frames are subsurfaces of the sheet."""
+
+    def __init__(self, colour, sheet, index):
+        self.colour = colour
+        self.sheet = sheet
+        self.index = index
+        self.converted = False
+        self._frames = {anim: [sheet.subsurface(rect) for rect in rects]
+                        for anim, rects in index.items()}
+
+    def __contains__(self, anim):
+        return anim in self._frames
+
+    def frames(self, anim):
+        """The frames of anim (the same list object every call)."""
+        return self._frames[anim]
+
+    def image(self, anim, frame=0):
+        frames = self._frames[anim]
+        return frames[frame % len(frames)]
+
+    def convert_alpha(self):
+        self.converted = True
+        self.sheet = self.sheet.convert_alpha()
+        for anim, rects in self.index.items():
+            self._frames[anim][:] = [self.sheet.subsurface(rect) for rect in rects]
+
+    @classmethod
+    def pack(cls, colour, animations):
+        """Shelf-pack {animation: [Surface]}: one row per animation, frames left to right."""
+        index, rows, width, height = {}, [], 0, 0
+        for anim, images in animations.items():
+            x, row_h, rects = 0, 0, []
+            for image in images:
+                rects.append(pg.Rect(x, height, *image.get_size()))
+                x += image.get_width()
+                row_h = max(row_h, image.get_height())
+            index[anim] = rects
+            rows.append(images)
+            width = max(width, x)
+            height += row_h
+        sheet = pg.Surface((width, height), pg.SRCALPHA)
+        for anim, images in zip(index, rows):
+            for rect, image in zip(index[anim], images):
+                # copy, not alpha-blend: translucent edges stay exactly as loaded
+                sheet.blit(image, rect, special_flags=pg.BLEND_RGBA_MAX)
+        return cls(colour, sheet, index)
+
+
+# ---------------------------------------------------------------------------
+# Building / loading
+# ---------------------------------------------------------------------------
+
+def _stamps(sources):
+    stamps = {}
+    for _, files in sources:
+        for file, _ in files:
+            try:
+                st = os.stat(file)
+            except OSError:
+                return None
+            stamps[file] = [st.st_size, st.st_mtime_ns]
+    return stamps
+
+
+def build_atlas(colour) -> SpriteAtlas:
+    """Load and scale colour's frames from the loose files and pack them."""
+    animations = {}
+    for anim, files in player_sources(colour):
+        images = []
+        for file, scale in files:
+            image = pg.image.load(file)
+            images.append(pg.transform.smoothscale(image, SPRITE_SIZE) if scale else image)
+        animations[anim] = images
+    return SpriteAtlas.pack(colour, animations)
+
+
+def save_atlas(atlas, stamps, directory=ATLAS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    base = path.join(directory, atlas.colour)
+    # each file lands whole (batch_runner workers may save the same colour at once);
+    # the sheet goes first so the .json never names pixels that are not there yet
+    temp = f"{base}.{os.getpid()}.tmp"
+    pg.image.save(atlas.sheet, temp + ".png")            # the extension picks the format
+    os.replace(temp + ".png", base + ".png")
+    with open(temp + ".json", "w") as f:
+        json.dump({"version": ATLAS_VERSION, "size": SPRITE_SIZE, "sources": stamps,
+                   "frames": {anim: [list(r) for r in rects] for anim, rects in atlas.index.items()}},
+                  f, indent=1)
+    os.replace(temp + ".json", base + ".json")
+
+
+def load_atlas(colour, directory=ATLAS_DIR) -> SpriteAtlas:
+    """The saved sheet if it matches the sources, else a fresh build (saved for next time)."""
+    sources = player_sources(colour)
+    stamps = _stamps(sources)
+    base = path.join(directory, colour)
+    try:
+        with open(base + ".json") as f:
+            meta = json.load(f)
+        if (stamps is not None and meta["version"] == ATLAS_VERSION
+                and tuple(meta["size"]) == SPRITE_SIZE and meta["sources"] == stamps):
+            index = {anim: [pg.Rect(r) for r in rects] for anim, rects in meta["frames"].items()}
+            return SpriteAtlas(colour, pg.image.load(base + ".png"), index)
+    except (OSError, ValueError, KeyError, pg.error):
+        pass
+    atlas = build_atlas(colour)
+    if stamps is not None:
+        try:
+            save_atlas(atlas, stamps, directory)
+        except (OSError, pg.error) as e:
+            print(f"  [ATLAS] could not save {colour} atlas: {e}")
+    return atlas
+
+
+def load_player_atlases():
+    return {colour: load_atlas(colour) for colour in COLOURS}
+
+
+def convert_atlases(atlases):
+    """Convert every sheet to the display format (needs pg.display.set_mode first)."""
+    for atlas in atlases.values():
+        if not atlas.converted:
+            atlas.convert_alpha()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    # python atlas.py [--rebuild]: (re)build and save every colour's sheet
+    start = time.perf_counter()
+    for colour in COLOURS:
+        if "--rebuild" in sys.argv:
+            atlas = build_atlas(colour)
+            save_atlas(atlas, _stamps(player_sources(colour)))
+        else:
+            atlas = load_atlas(colour)
+        frames = sum(len(rects) for rects in atlas.index.values())
+        print(f"  [ATLAS] {colour:<7} {frames:>3} frames in {atlas.sheet.get_width()}x{atlas.sheet.get_height()}")
+    print(f"  [ATLAS] done in {time.perf_counter() - start:.2f}s -> {ATLAS_DIR}")
@@ -28,6 +28,11 @@ from sprites import Player, Bot
 from settings import *
 from agent_controller import SimpleAgent
 from blockchain import MonadSusChainIntegration
+import fonts
+import hud
+from minimap import MiniMap, CROSS
+from replay import ReplayWriter, encode_state
+from frame_capture import FrameRingWriter
 
 
 # ---------------------------------------------------------------------------
@@ -35,19 +40,11 @@ from blockchain import MonadSusChainIntegration
 # ---------------------------------------------------------------------------
 
 def build_color_sprites():
-    """Build dict mapping colour name -> directional sprite arrays."""
-    return {
-        "Red":    {"left": red_player_imgs_left,    "right": red_player_imgs_right,    "up": red_player_imgs_up,    "down": red_player_imgs_down,    "dead": red_player_imgs_dead},
-        "Blue":   {"left": blue_player_imgs_left,   "right": blue_player_imgs_right,   "up": blue_player_imgs_up,   "down": blue_player_imgs_down,   "dead": blue_player_imgs_dead},
-        "Green":  {"left": green_player_imgs_left,  "right": green_player_imgs_right,  "up": green_player_imgs_up,  "down": green_player_imgs_down,  "dead": green_player_imgs_dead},
-        "Orange": {"left": orange_player_imgs_left, "right": orange_player_imgs_right, "up": orange_player_imgs_up, "down": orange_player_imgs_down, "dead": orange_player_imgs_dead},
-        "Yellow": {"left": yellow_player_imgs_left, "right": yellow_player_imgs_right, "up": yellow_player_imgs_up, "down": yellow_player_imgs_down, "dead": yellow_player_imgs_dead},
-        "Black":  {"left": black_player_imgs_left,  "right": black_player_imgs_right,  "up": black_player_imgs_up,  "down": black_player_imgs_down,  "dead": black_player_imgs_dead},
-        "Brown":  {"left": brown_player_imgs_left,  "right": brown_player_imgs_right,  "up": brown_player_imgs_up,  "down": brown_player_imgs_down,  "dead": brown_player_imgs_dead},
-        "Pink":   {"left": pink_player_imgs_left,   "right": pink_player_imgs_right,   "up": pink_player_imgs_up,   "down": pink_player_imgs_down,   "dead": pink_player_imgs_dead},
-        "Purple": {"left": purple_player_imgs_left, "right": purple_player_imgs_right, "up": purple_player_imgs_up, "down": purple_player_imgs_down, "dead": purple_player_imgs_dead},
-        "White":  {"left": white_player_imgs_left,  "right": white_player_imgs_right,  "up": white_player_imgs_up,  "down": white_player_imgs_down,  "dead": white_player_imgs_dead},
-    }
+    """Build dict mapping colour name -> directional sprite arrays (views into the atlases)."""
+    return {colour: {"left": atlas.frames("left"), "right": atlas.frames("right"),
+                     "up": atlas.frames("up"), "down": atlas.frames("down"),
+                     "dead": atlas.image("dead")}
+            for colour, atlas in PLAYER_ATLASES.items()}
 
 
 # Display-color mapping for HUD text
@@ -84,9 +81,31 @@ class AutonomousGame:
     PRE_GAME_TRADING_DURATION = 300  # 5 minutes in seconds
     PRE_GAME_TRADING_TICKS = PRE_GAME_TRADING_DURATION * 60  # Convert to ticks @ 60 FPS
 
-    def __init__(self):
+    # Spectator HUD
+    HUD_MAP_SIZE = (232, 127)       # mini map, 1/25 of the world map
+
+    def __init__(self, headless: bool = False, seed: int | None = None, fixed_step: bool = False,
+                 replay_path: str | None = None, capture: FrameRingWriter | None = None):
+        # Headless: no window, no rendering, no frame cap — ticks run as fast
+        # as the CPU allows with the same fixed 1/FPS step as a 60 FPS window
+        self.headless = headless
+        # fixed_step: physics advances 1/FPS per tick whatever the wall clock says
+        self.fixed_step = fixed_step or headless
+
+        # One seed drives the whole match: self.rng for the simulation, and a
+        # child stream per agent (agent_rng) so one agent's draws never shift
+        # another's. Same seed + fixed step = byte-identical event log.
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if headless:
+            # must happen before pygame opens a display (Game() calls pg.init())
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         self.color_sprites = build_color_sprites()
         self.game = Game()
+        self.profiler = self.game.profiler
 
         # Agent / entity maps
         self.agents = {}          # colour → SimpleAgent
@@ -135,16 +154,30 @@ class AutonomousGame:
         self.hud_font: pg.font.Font | None = None
         self.hud_font_sm: pg.font.Font | None = None
         self.hud_font_lg: pg.font.Font | None = None
+        self.hud_status: hud.StatusPanel | None = None
+        self.hud_roster: hud.Roster | None = None
+        self.hud_log: hud.EventLog | None = None
+        self.hud_map: MiniMap | None = None
         self.dim_screen: pg.Surface | None = None
         self.event_log: list[str] = []
+        self.event_log_version = 0           # bumped by _log(); the HUD log redraws on change
         
         # Blockchain integration
         # Set MONAD_LIVE_MODE=1 to enable real blockchain transactions
         # Requires MONAD_RPC_URL, MONAD_PRIVATE_KEY, and contract addresses
         live_mode = os.environ.get("MONAD_LIVE_MODE", "").lower() in ("1", "true", "yes")
-        self.chain = MonadSusChainIntegration(live_mode=live_mode)
+        # event times come from the tick counter, not the wall clock
+        self.chain = MonadSusChainIntegration(live_mode=live_mode, clock=lambda: self.tick / FPS)
         self.game_id: int | None = None
 
+        # Replay recording (replay.py): positions, facing and state every tick
+        self.replay_path = replay_path
+        self.replay: ReplayWriter | None = None
+
+        # Broadcast capture (frame_capture.py): each drawn frame, HUD included,
+        # is copied into a shared-memory ring for an encoder in another process
+        self.capture = capture
+
     # ------------------------------------------------------------------
     # Setup
     # ------------------------------------------------------------------
@@ -154,12 +187,12 @@ class AutonomousGame:
         # Set attributes dynamically (Game class sets these externally)
         setattr(self.game, 'player_colour', "Red")
         setattr(self.game, 'gamemode', "Freeplay")
-        self.game.new()                      # builds map, obstacles, bots
+        self.game.new(self.rng)              # builds map, obstacles, bots
 
         # Create camera-target player, mark autonomous
         self.game.player = Player(
             self.game,
-            random.choice(self.game.player_pos),
+            self.rng.choice(self.game.player_pos),
             0, True, "Red",
         )
         self.game.player.autonomous = True
@@ -192,7 +225,7 @@ class AutonomousGame:
         self.all_colours = ["Red"] + [b.bot_colour for b in bot_list]
 
         # Pick random imposter
-        self.imposter_colour = random.choice(self.all_colours)
+        self.imposter_colour = self.rng.choice(self.all_colours)
 
         # Create agents
         for colour in self.all_colours:
@@ -209,14 +242,15 @@ class AutonomousGame:
                     self.agents[colour] = OpenClawAgentController(
                         agent_id=colour,
                         role=role,
-                        personality_type=personality
+                        personality_type=personality,
+                        rng=self.agent_rng(colour),
                     )
                 except ImportError as e:
                     print(f"  [WARN] OpenClaw not available: {e}, using SimpleAgent")
-                    self.agents[colour] = SimpleAgent(agent_id=colour, role=role)
+                    self.agents[colour] = SimpleAgent(agent_id=colour, role=role, rng=self.agent_rng(colour))
             else:
                 # Fallback to simple random agent
-                self.agents[colour] = SimpleAgent(agent_id=colour, role=role)
+                self.agents[colour] = SimpleAgent(agent_id=colour, role=role, rng=self.agent_rng(colour))
             
             self.entities[colour].imposter = (role == "IMPOSTER")
 
@@ -224,9 +258,15 @@ class AutonomousGame:
         self.camera_target_idx = self.all_colours.index(self.imposter_colour)
 
         # Fonts & overlay surface
-        self.hud_font    = pg.font.Font(FONT, 22)
-        self.hud_font_sm = pg.font.Font(FONT, 16)
-        self.hud_font_lg = pg.font.Font(FONT, 42)
+        self.hud_font    = fonts.get_font(FONT, 22)
+        self.hud_font_sm = fonts.get_font(FONT, 16)
+        self.hud_font_lg = fonts.get_font(FONT, 42)
+        self.hud_status = hud.StatusPanel(self.hud_font, self.hud_font_sm)
+        self.hud_roster = hud.Roster(self.hud_font_sm)
+        self.hud_log = hud.EventLog(self.hud_font_sm)
+        map_bg = hud.HudWidget.background(self.HUD_MAP_SIZE, 140)
+        map_bg.blit(pg.transform.smoothscale(self.game.mini_map_img, self.HUD_MAP_SIZE), (0, 0))
+        self.hud_map = MiniMap(map_bg, refresh_ms=MINI_MAP_REFRESH, marker_size=7)
         self.dim_screen  = pg.Surface(self.game.screen.get_size(), pg.SRCALPHA)
         self.dim_screen.fill((0, 0, 0, 180))
 
@@ -237,6 +277,10 @@ class AutonomousGame:
         # Initialize blockchain integration
         self.game_id = self.chain.on_game_start(self.all_colours, self.imposter_colour)
 
+        if self.replay_path:
+            self.replay = ReplayWriter(self.replay_path, self.all_colours, FPS,
+                                       seed=self.seed, imposter=self.imposter_colour)
+
         self._log(f"Match started — {len(self.all_colours)} agents")
         self._log(f"Imposter: {self.imposter_colour}")
 
@@ -245,6 +289,7 @@ class AutonomousGame:
         print(f"{'=' * 60}")
         print(f"  Agents : {', '.join(self.all_colours)}")
         print(f"  Imposter: {self.imposter_colour}")
+        print(f"  Seed    : {self.seed}")
         print(f"  Controls: TAB = cycle camera | 1-9 = pick agent | ESC = quit")
         print(f"{'=' * 60}\n")
 
@@ -252,17 +297,24 @@ class AutonomousGame:
     # Helpers
     # ------------------------------------------------------------------
     
+    def agent_rng(self, colour: str) -> random.Random:
+        """The agent's own random stream, derived from the match seed and its colour."""
+        return random.Random(f"{self.seed}:{colour}")
+
     def _assign_personality(self, colour: str, role: str) -> str:
         """Assign diverse personalities to agents for varied gameplay."""
         if role == "IMPOSTER":
-            return random.choice(["aggressive", "subtle"])
+            return self.rng.choice(["aggressive", "subtle"])
         else:  # CREW
-            return random.choice(["detective", "follower", "balanced"])
+            return self.rng.choice(["detective", "follower", "balanced"])
 
     def _log(self, msg):
         self.event_log.append(msg)
         if len(self.event_log) > 6:
             self.event_log.pop(0)
+        self.event_log_version += 1
+        if self.replay:
+            self.replay.event(self.tick, msg)
         print(f"  [{self.tick // 60:>3}s] {msg}")
 
     def _log_dialogue(self, agent_id, message):
@@ -272,6 +324,20 @@ class AutonomousGame:
         # Blockchain event log
         self.chain.logger.log_speak(agent_id, message)
 
+    def _record_replay(self):
+        frame = []
+        for c in self.all_colours:
+            ent = self.entities[c]
+            frame.append((ent.rect.x, ent.rect.y,
+                          encode_state(getattr(ent, "facing", "DOWN"), getattr(ent, "anim_frame", 0))))
+        self.replay.record(self.tick, frame)
+
+    def close_replay(self):
+        if self.replay:
+            self.replay.close()
+            print(f"  [REPLAY] {self.replay.ticks} ticks written to {self.replay_path}")
+            self.replay = None
+
     def alive_colours(self):
         return [c for c in self.all_colours if self.entities[c].alive_status]
 
@@ -321,6 +387,11 @@ class AutonomousGame:
     # Movement (FR-3)
     # ------------------------------------------------------------------
 
+    def _decide(self, colour):
+        """The agent's action for this tick (timed as the 'agents' phase)."""
+        with self.profiler.phase("agents"):
+            return self.agents[colour].get_action(self._observation(colour))
+
     def _apply_move(self, colour, direction):
         ent = self.entities[colour]
         ent.vel = vec(0, 0)
@@ -347,6 +418,7 @@ class AutonomousGame:
             idx = getattr(ent, attr, 0)
             ent.image = imgs[idx % len(imgs)]
             setattr(ent, attr, (idx + 1) % len(imgs))
+            ent.facing, ent.anim_frame = direction, idx % len(imgs)
 
     # ------------------------------------------------------------------
     # Kill logic (FR-4)
@@ -378,6 +450,7 @@ class AutonomousGame:
                 victim.image = dead_img.convert_alpha()
         
         victim.vel = vec(0, 0)
+        victim.facing = "DEAD"
         self.dead_bodies.append((victim.pos.x, victim.pos.y, victim_c))
         self.kill_cooldown = self.KILL_COOLDOWN
 
@@ -405,7 +478,7 @@ class AutonomousGame:
         
         # Initialize dialogue state (FR-4: shuffled order)
         self.dialogue_order = self.alive_colours()
-        random.shuffle(self.dialogue_order)
+        self.rng.shuffle(self.dialogue_order)
         self.dialogue_messages = []
         self.spoken_agents = set()
         self.current_speaker_idx = 0
@@ -462,6 +535,7 @@ class AutonomousGame:
             self.ejected_colour = ejected
             self.entities[ejected].alive_status = False
             self.entities[ejected].vel = vec(0, 0)
+            self.entities[ejected].facing = None       # off the ship: not in the replay
             imp = self.agents[ejected].role == "IMPOSTER"
             self._log(
                 f"{ejected} was ejected! "
@@ -536,13 +610,17 @@ class AutonomousGame:
     def _handle_events(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
+                self.close_replay()
                 pg.quit()
                 sys.exit()
             if event.type != pg.KEYDOWN:
                 continue
             if event.key == pg.K_ESCAPE:
+                self.close_replay()
                 pg.quit()
                 sys.exit()
+            if event.key == pg.K_F3:
+                self.profiler.visible = not self.profiler.visible
             # Number keys 1-9 to pick camera target
             if pg.K_1 <= event.key <= pg.K_9:
                 idx = event.key - pg.K_1
@@ -574,14 +652,17 @@ class AutonomousGame:
         screen = self.game.screen
         cam = self.game.camera
 
+        self.profiler.start("draw")
         # Camera follows selected entity
         cam.update(self._camera_target())
 
         # Map
-        screen.blit(self.game.map_img, cam.apply_rect(self.game.map_rect))
+        with self.profiler.phase("draw.map"):
+            self.game.map_img.draw(screen, cam)
 
-        # Sprites
-        for sprite in self.game.all_sprites:
+        # Sprites (only those on screen)
+        self.profiler.start("draw.sprites")
+        for sprite in self.game.all_sprites.visible(cam.view_rect()):
             screen.blit(sprite.image, cam.apply(sprite))
 
         # Name tags above each alive agent
@@ -589,11 +670,13 @@ class AutonomousGame:
             ent = self.entities[c]
             if not ent.alive_status:
                 continue
-            tag = self.hud_font_sm.render(c, True, COLOR_MAP.get(c, WHITE))
+            tag = fonts.render(self.hud_font_sm, c, True, COLOR_MAP.get(c, WHITE))
             tag_rect = tag.get_rect(centerx=cam.apply(ent).centerx, bottom=cam.apply(ent).top - 2)
             screen.blit(tag, tag_rect)
+        self.profiler.stop("draw.sprites")
 
         # HUD overlay
+        self.profiler.start("draw.hud")
         self._draw_hud(screen)
 
         # Meeting overlay
@@ -607,63 +690,55 @@ class AutonomousGame:
         # Game-over overlay
         if self.game_over:
             self._draw_game_over(screen)
+        self.profiler.stop("draw.hud")
+        self.profiler.stop("draw")
 
-        pg.display.flip()
+        self._capture_frame(screen)
+        self.profiler.draw(screen, topleft=(10, 145))
+        with self.profiler.phase("flip"):
+            pg.display.flip()
+
+    def _capture_frame(self, screen):
+        # before the profiler overlay: viewers never see the debug panel
+        if self.capture:
+            with self.profiler.phase("capture"):
+                self.capture.write(screen, self.tick)
 
     # ---- HUD ----
 
     def _draw_hud(self, screen):
-        assert self.hud_font and self.hud_font_sm and self.hud_font_lg  # Initialized in setup()
-        alive = self.alive_colours()
-
-        # Status panel (top-left)
-        panel = pg.Surface((360, 125), pg.SRCALPHA)
-        panel.fill((0, 0, 0, 160))
-        screen.blit(panel, (10, 10))
-
-        screen.blit(self.hud_font.render("AUTONOMOUS AGENT MODE", True, (255, 200, 50)), (20, 15))
-
-        screen.blit(self.hud_font_sm.render(
-            f"Alive: {len(alive)}/{len(self.all_colours)}", True, WHITE), (20, 45))
-
-        secs = self.tick // 60
-        screen.blit(self.hud_font_sm.render(
-            f"Time: {secs // 60}:{secs % 60:02d}", True, WHITE), (200, 45))
-
+        assert self.hud_status and self.hud_roster and self.hud_log and self.hud_map  # Initialized in setup()
         target_c = self.all_colours[self.camera_target_idx % len(self.all_colours)]
         role = self.agents[target_c].role
-        clr = (255, 80, 80) if role == "IMPOSTER" else (100, 255, 100)
-        screen.blit(self.hud_font_sm.render(
-            f"Following: {target_c} ({role})", True, clr), (20, 70))
-
-        if role == "IMPOSTER" and self.kill_cooldown > 0:
-            screen.blit(self.hud_font_sm.render(
-                f"Kill CD: {self.kill_cooldown // 60}s", True, (255, 100, 100)), (20, 93))
+        kill_cd = self.kill_cooldown // 60 if role == "IMPOSTER" and self.kill_cooldown > 0 else None
 
-        screen.blit(self.hud_font_sm.render(
-            "TAB=cycle camera  ESC=quit", True, (150, 150, 150)), (20, 110))
+        # Status panel (top-left)
+        screen.blit(self.hud_status.render(len(self.alive_colours()), len(self.all_colours),
+                                           self.tick // 60, target_c, role, kill_cd), (10, 10))
 
         # Agent roster (top-right)
-        roster = pg.Surface((170, 22 * len(self.all_colours) + 10), pg.SRCALPHA)
-        roster.fill((0, 0, 0, 140))
-        screen.blit(roster, (WIDTH - 180, 10))
-        for i, c in enumerate(self.all_colours):
+        rows = []
+        for c in self.all_colours:
             is_alive = self.entities[c].alive_status
-            tc = COLOR_MAP.get(c, WHITE) if is_alive else (80, 80, 80)
             label = c + ("" if is_alive else " [DEAD]")
             if c == self.imposter_colour:
                 label += " *"   # spectator hint
-            screen.blit(self.hud_font_sm.render(label, True, tc), (WIDTH - 175, 15 + i * 22))
+            rows.append((label, COLOR_MAP.get(c, WHITE) if is_alive else (80, 80, 80)))
+        screen.blit(self.hud_roster.render(tuple(rows)), (WIDTH - 180, 10))
+
+        # Mini map (bottom-right): every alive agent plus unreported bodies
+        markers = {c: (self.entities[c].rect.center, COLOR_MAP.get(c, WHITE))
+                   for c in self.all_colours if self.entities[c].alive_status}
+        for bx, by, bc in self.dead_bodies:
+            markers["body:" + bc] = ((bx, by), COLOR_MAP.get(bc, WHITE), CROSS)
+        self.hud_map.sync(markers)
+        self.hud_map.refresh(self.tick * 1000 // FPS)   # simulation time, not wall time
+        screen.blit(self.hud_map.surface, (WIDTH - self.HUD_MAP_SIZE[0] - 10, HEIGHT - self.HUD_MAP_SIZE[1] - 10))
 
         # Event log (bottom)
         if self.event_log:
-            log_h = 20 * min(len(self.event_log), 6) + 10
-            log_bg = pg.Surface((550, log_h), pg.SRCALPHA)
-            log_bg.fill((0, 0, 0, 140))
-            y0 = HEIGHT - log_h - 10
-            screen.blit(log_bg, (10, y0))
-            for i, msg in enumerate(self.event_log[-6:]):
-                screen.blit(self.hud_font_sm.render(msg, True, (220, 220, 220)), (15, y0 + 5 + i * 20))
+            log = self.hud_log.render(self.event_log, key=self.event_log_version)
+            screen.blit(log, (10, HEIGHT - log.get_height() - 10))
 
     # ---- Meeting ----
 
@@ -673,18 +748,18 @@ class AutonomousGame:
 
         if self.meeting_phase == 0:
             # Alert splash
-            t1 = self.hud_font_lg.render("EMERGENCY MEETING!", True, (255, 50, 50))
+            t1 = fonts.render(self.hud_font_lg, "EMERGENCY MEETING!", True, (255, 50, 50))
             screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
-            t2 = self.hud_font.render(f"Called by {self.meeting_trigger_colour}", True, WHITE)
+            t2 = fonts.render(self.hud_font, f"Called by {self.meeting_trigger_colour}", True, WHITE)
             screen.blit(t2, t2.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 55)))
         
         elif self.meeting_phase == 1:
             # Dialogue phase (FR-5: Dialogue Display)
-            t1 = self.hud_font_lg.render("DISCUSSION", True, (100, 200, 255))
+            t1 = fonts.render(self.hud_font_lg, "DISCUSSION", True, (100, 200, 255))
             screen.blit(t1, t1.get_rect(center=(WIDTH // 2, 45)))
             
             remaining = max(0, (self.MEETING_DIALOGUE_TICKS - self.meeting_timer) // 60)
-            t2 = self.hud_font.render(f"Time: {remaining}s", True, (255, 200, 50))
+            t2 = fonts.render(self.hud_font, f"Time: {remaining}s", True, (255, 200, 50))
             screen.blit(t2, t2.get_rect(center=(WIDTH // 2, 85)))
             
             # Show dialogue messages (scrolling chat log)
@@ -694,11 +769,11 @@ class AutonomousGame:
             for agent_c, msg in messages_to_show:
                 clr = COLOR_MAP.get(agent_c, WHITE)
                 # Agent name
-                name_surf = self.hud_font.render(f"[{agent_c}]:", True, clr)
+                name_surf = fonts.render(self.hud_font, f"[{agent_c}]:", True, clr)
                 screen.blit(name_surf, (60, y))
                 # Message text (truncate if too long)
                 display_msg = msg if len(msg) < 45 else msg[:42] + "..."
-                msg_surf = self.hud_font_sm.render(display_msg, True, (220, 220, 220))
+                msg_surf = fonts.render(self.hud_font_sm, display_msg, True, (220, 220, 220))
                 screen.blit(msg_surf, (180, y + 4))
                 y += 32
             
@@ -706,31 +781,31 @@ class AutonomousGame:
             not_spoken = [c for c in self.alive_colours() if c not in self.spoken_agents]
             if not_spoken:
                 waiting_text = f"Waiting: {', '.join(not_spoken[:4])}{'...' if len(not_spoken) > 4 else ''}"
-                wait_surf = self.hud_font_sm.render(waiting_text, True, (150, 150, 150))
+                wait_surf = fonts.render(self.hud_font_sm, waiting_text, True, (150, 150, 150))
                 screen.blit(wait_surf, (60, HEIGHT - 80))
         
         elif self.meeting_phase == 2:
             # Vote screen
-            t1 = self.hud_font_lg.render("VOTING", True, WHITE)
+            t1 = fonts.render(self.hud_font_lg, "VOTING", True, WHITE)
             screen.blit(t1, t1.get_rect(center=(WIDTH // 2, 55)))
             remaining = max(0, (self.MEETING_VOTE_TICKS - self.meeting_timer) // 60)
-            t2 = self.hud_font.render(f"Time: {remaining}s", True, (255, 200, 50))
+            t2 = fonts.render(self.hud_font, f"Time: {remaining}s", True, (255, 200, 50))
             screen.blit(t2, t2.get_rect(center=(WIDTH // 2, 95)))
 
             alive = self.alive_colours()
             y = 135
             for c in alive:
                 clr = COLOR_MAP.get(c, WHITE)
-                screen.blit(self.hud_font.render(c, True, clr), (WIDTH // 4, y))
+                screen.blit(fonts.render(self.hud_font, c, True, clr), (WIDTH // 4, y))
                 if c in self.votes:
                     v = self.votes[c]
                     vs = f"-> {v}" if v else "-> SKIP"
-                    screen.blit(self.hud_font_sm.render(vs, True, (180, 180, 180)), (WIDTH // 2, y + 4))
+                    screen.blit(fonts.render(self.hud_font_sm, vs, True, (180, 180, 180)), (WIDTH // 2, y + 4))
                 else:
-                    screen.blit(self.hud_font_sm.render("thinking...", True, (120, 120, 120)), (WIDTH // 2, y + 4))
+                    screen.blit(fonts.render(self.hud_font_sm, "thinking...", True, (120, 120, 120)), (WIDTH // 2, y + 4))
                 vr = sum(1 for v in self.votes.values() if v == c)
                 if vr:
-                    screen.blit(self.hud_font_sm.render(f"({vr})", True, (255, 100, 100)), (WIDTH * 3 // 4, y + 4))
+                    screen.blit(fonts.render(self.hud_font_sm, f"({vr})", True, (255, 100, 100)), (WIDTH * 3 // 4, y + 4))
                 y += 40
 
     # ---- Eject ----
@@ -739,9 +814,9 @@ class AutonomousGame:
         assert self.hud_font and self.hud_font_lg and self.dim_screen
         screen.blit(self.dim_screen, (0, 0))
         imp = self.agents[self.ejected_colour].role == "IMPOSTER"
-        t1 = self.hud_font_lg.render(f"{self.ejected_colour} was ejected.", True, WHITE)
+        t1 = fonts.render(self.hud_font_lg, f"{self.ejected_colour} was ejected.", True, WHITE)
         screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
-        t2 = self.hud_font.render(
+        t2 = fonts.render(self.hud_font,
             "They were the Imposter!" if imp else "They were NOT the Imposter.",
             True, (255, 80, 80) if imp else (100, 255, 100),
         )
@@ -753,21 +828,21 @@ class AutonomousGame:
         assert self.hud_font and self.hud_font_sm and self.hud_font_lg and self.dim_screen
         screen.blit(self.dim_screen, (0, 0))
         if self.winner == "CREW":
-            t1 = self.hud_font_lg.render("CREW WINS!", True, (60, 200, 255))
+            t1 = fonts.render(self.hud_font_lg, "CREW WINS!", True, (60, 200, 255))
         else:
-            t1 = self.hud_font_lg.render("IMPOSTER WINS!", True, (255, 50, 50))
+            t1 = fonts.render(self.hud_font_lg, "IMPOSTER WINS!", True, (255, 50, 50))
         screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
 
-        t2 = self.hud_font.render(f"Imposter was: {self.imposter_colour}", True, (255, 100, 100))
+        t2 = fonts.render(self.hud_font, f"Imposter was: {self.imposter_colour}", True, (255, 100, 100))
         screen.blit(t2, t2.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 55)))
 
         deaths = len(self.all_colours) - len(self.alive_colours())
         secs = self.tick // 60
-        t3 = self.hud_font_sm.render(
+        t3 = fonts.render(self.hud_font_sm,
             f"Duration: {secs // 60}m {secs % 60:02d}s  |  Deaths: {deaths}", True, (180, 180, 180))
         screen.blit(t3, t3.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 95)))
 
-        t4 = self.hud_font_sm.render("SPACE = new match  |  ESC = quit", True, (150, 150, 150))
+        t4 = fonts.render(self.hud_font_sm, "SPACE = new match  |  ESC = quit", True, (150, 150, 150))
         screen.blit(t4, t4.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 130)))
 
     # ------------------------------------------------------------------
@@ -775,7 +850,7 @@ class AutonomousGame:
     # ------------------------------------------------------------------
 
     def run(self):
-        """Run a full autonomous match. Returns True to restart."""
+        """Run a full autonomous match. Returns True to restart (never when headless)."""
         self.setup()
         clock = pg.time.Clock()
         victory_played = False
@@ -790,15 +865,23 @@ class AutonomousGame:
         print("="*60 + "\n")
 
         while True:
-            dt = clock.tick(FPS) / 1000.0
+            if not self.headless:
+                with self.profiler.phase("idle"):
+                    dt = clock.tick(FPS) / 1000.0
+            if self.fixed_step:
+                dt = 1.0 / FPS
+            self.profiler.frame()
             self.game.dt = dt
 
-            self._handle_events()
+            if not self.headless:
+                with self.profiler.phase("events"):
+                    self._handle_events()
             
             # ---- PRE-GAME TRADING COUNTDOWN ----
             if self.pre_game_trading:
                 self.pre_game_timer += 1
-                self._draw_pre_game_screen()
+                if not self.headless:
+                    self._draw_pre_game_screen()
                 
                 if self.pre_game_timer >= self.PRE_GAME_TRADING_TICKS:
                     self.pre_game_trading = False
@@ -811,6 +894,9 @@ class AutonomousGame:
 
             # ---- GAME OVER: wait for restart ----
             if self.game_over:
+                self.close_replay()
+                if self.headless:
+                    return False
                 if not victory_played:
                     pg.mixer.music.stop()
                     try:
@@ -830,6 +916,8 @@ class AutonomousGame:
                     return True
                 continue
 
+            self.profiler.start("update")
+
             # ---- MEETING PHASE ----
             if self.meeting_active:
                 self.meeting_timer += 1
@@ -844,8 +932,7 @@ class AutonomousGame:
                     # Dialogue phase: agents speak in order (FR-1, FR-4)
                     for c in self.dialogue_order:
                         if c not in self.spoken_agents and self.entities[c].alive_status:
-                            obs = self._observation(c)
-                            act = self.agents[c].get_action(obs)
+                            act = self._decide(c)
                             if act["type"] == "SPEAK":
                                 message = act.get("data", "...")
                                 self.dialogue_messages.append((c, message))
@@ -866,8 +953,7 @@ class AutonomousGame:
                     # Collect votes
                     for c in self.alive_colours():
                         if c not in self.votes:
-                            obs = self._observation(c)
-                            act = self.agents[c].get_action(obs)
+                            act = self._decide(c)
                             if act["type"] == "VOTE":
                                 self.votes[c] = act.get("data")
                     alive = self.alive_colours()
@@ -892,8 +978,9 @@ class AutonomousGame:
 
                 # Agent tick
                 for c in self.alive_colours():
-                    obs = self._observation(c)
-                    act = self.agents[c].get_action(obs)
+                    if not self.entities[c].alive_status:
+                        continue        # killed earlier in this tick: a body does not move
+                    act = self._decide(c)
                     atype = act.get("type", "NONE")
 
                     if atype == "MOVE":
@@ -901,7 +988,7 @@ class AutonomousGame:
                     elif atype == "KILL":
                         target = act.get("data")
                         if not target or not self._try_kill(c, target):
-                            self._apply_move(c, random.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+                            self._apply_move(c, self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
                     else:
                         self.entities[c].vel = vec(0, 0)
 
@@ -917,13 +1004,18 @@ class AutonomousGame:
                         and self.meeting_cooldown <= 0):
                     alive = self.alive_colours()
                     if alive:
-                        self._start_meeting(random.choice(alive))
+                        self._start_meeting(self.rng.choice(alive))
 
                 # Win check
                 self._check_win()
 
+            self.profiler.stop("update")
+            if self.replay:
+                self._record_replay()
+
             # ---- DRAW ----
-            self._draw()
+            if not self.headless:
+                self._draw()
             self.tick += 1
 
             # Safety timeout
@@ -944,13 +1036,13 @@ class AutonomousGame:
         seconds = remaining_seconds % 60
         
         # Title
-        title = self.hud_font_lg.render("PRE-GAME TRADING", True, (100, 200, 255))
+        title = fonts.render(self.hud_font_lg, "PRE-GAME TRADING", True, (100, 200, 255))
         title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 4))
         screen.blit(title, title_rect)
         
         # Countdown timer
         timer_color = (255, 200, 50) if remaining_seconds > 60 else (255, 100, 100)
-        timer_text = self.hud_font_lg.render(f"{minutes}:{seconds:02d}", True, timer_color)
+        timer_text = fonts.render(self.hud_font_lg, f"{minutes}:{seconds:02d}", True, timer_color)
         timer_rect = timer_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         screen.blit(timer_text, timer_rect)
         
@@ -964,19 +1056,20 @@ class AutonomousGame:
         
         y_offset = HEIGHT * 3 // 4
         for line in info_lines:
-            info = self.hud_font.render(line, True, WHITE)
+            info = fonts.render(self.hud_font, line, True, WHITE)
             info_rect = info.get_rect(center=(WIDTH // 2, y_offset))
             screen.blit(info, info_rect)
             y_offset += 35
         
         # Agent list
-        agents_title = self.hud_font_sm.render("Agents in this game:", True, (150, 150, 150))
+        agents_title = fonts.render(self.hud_font_sm, "Agents in this game:", True, (150, 150, 150))
         agents_rect = agents_title.get_rect(center=(WIDTH // 2, HEIGHT - 100))
         screen.blit(agents_title, agents_rect)
         
         agent_text = ", ".join(self.all_colours)
-        agents_display = self.hud_font_sm.render(agent_text, True, (200, 200, 200))
+        agents_display = fonts.render(self.hud_font_sm, agent_text, True, (200, 200, 200))
         agents_display_rect = agents_display.get_rect(center=(WIDTH // 2, HEIGHT - 70))
         screen.blit(agents_display, agents_display_rect)
-        
+
+        self._capture_frame(screen)
         pg.display.flip()
@@ -0,0 +1,193 @@
+"""
+Batch Match Runner for MonadSus autonomous mode.
+
+Plays many headless AutonomousGame matches across a process pool and
+writes the aggregated outcomes as JSON, so agent balance can be judged
+from hundreds of matches instead of by watching them one at a time.
+
+Every match gets its own seed (--seed + match index), so a single
+interesting match can be replayed with --matches 1 --seed N, or watched
+with python main_autonomous.py --seed N. Workers always run in
+simulation mode (never MONAD_LIVE_MODE) and do not write
+game_log_{id}.json files.
+
+Aggregated:
+- winner counts and crew/imposter win rate, timeouts
+- match duration in game seconds (mean / p50 / p95), kills, ejections,
+  meetings per match
+- win rate per agent personality ("simple" for SimpleAgent)
+
+    python batch_runner.py --matches 200 --workers 8 --output batch_results.json
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _init_worker(agent_mode: str):
+    # before pygame is imported: menu.py initialises the mixer at import
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["MONAD_LIVE_MODE"] = "0"
+    os.environ["AGENT_MODE"] = agent_mode
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import autonomous_game  # noqa: F401  (asset loading, once per worker)
+
+
+def run_match(seed: int, verbose: bool = False) -> dict:
+    """Play one headless match with this seed and summarise it."""
+    from autonomous_game import AutonomousGame
+    from settings import FPS
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        game = AutonomousGame(headless=True, seed=seed)
+        game.chain.export_log = False
+        game.run()
+
+    counts = {}
+    for event in game.chain.logger.events:
+        counts[event.event_type] = counts.get(event.event_type, 0) + 1
+    agents = {}
+    for colour, agent in game.agents.items():
+        won = (agent.role == "IMPOSTER") == (game.winner == "IMPOSTER")
+        agents[colour] = {
+            "role": agent.role,
+            "personality": getattr(agent, "personality_type", "simple"),
+            "won": won,
+            "alive": game.entities[colour].alive_status,
+        }
+    return {
+        "seed": seed,
+        "winner": game.winner,
+        "imposter": game.imposter_colour,
+        "timeout": game.tick >= game.MAX_GAME_TICKS,
+        "ticks": game.tick,
+        "duration_s": round(game.tick / FPS, 2),
+        "wall_s": round(time.perf_counter() - start, 3),
+        "kills": counts.get("KILL", 0),
+        "ejections": counts.get("EJECT", 0),
+        "meetings": counts.get("MEETING_START", 0),
+        "agents": agents,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, -(-q * len(values) // 100) - 1))]
+
+
+def summarise(matches: list[dict]) -> dict:
+    done = [m for m in matches if "error" not in m]
+    n = len(done)
+    winners = {}
+    personalities = {}
+    for m in done:
+        winners[m["winner"]] = winners.get(m["winner"], 0) + 1
+        for agent in m["agents"].values():
+            stats = personalities.setdefault(agent["personality"], {"games": 0, "wins": 0})
+            stats["games"] += 1
+            stats["wins"] += agent["won"]
+    for stats in personalities.values():
+        stats["win_rate"] = round(stats["wins"] / stats["games"], 4)
+
+    def mean(key):
+        return round(sum(m[key] for m in done) / n, 3) if n else 0.0
+
+    durations = [m["duration_s"] for m in done]
+    return {
+        "matches": n,
+        "errors": len(matches) - n,
+        "winners": winners,
+        "crew_win_rate": round(winners.get("CREW", 0) / n, 4) if n else 0.0,
+        "imposter_win_rate": round(winners.get("IMPOSTER", 0) / n, 4) if n else 0.0,
+        "timeouts": sum(m["timeout"] for m in done),
+        "duration_s": {"mean": mean("duration_s"), "p50": _percentile(durations, 50),
+                       "p95": _percentile(durations, 95)},
+        "kills_per_match": mean("kills"),
+        "ejections_per_match": mean("ejections"),
+        "meetings_per_match": mean("meetings"),
+        "personalities": dict(sorted(personalities.items())),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+def run(args) -> dict:
+    seeds = [args.seed + i for i in range(args.matches)]
+    workers = args.workers or os.cpu_count() or 1
+    matches = {}
+    start = time.perf_counter()
+    # spawn: a clean interpreter per worker, as on Windows, never a forked pygame
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(args.agent_mode,)) as pool:
+        futures = {pool.submit(run_match, seed, args.verbose): seed for seed in seeds}
+        for done, future in enumerate(as_completed(futures), 1):
+            seed = futures[future]
+            try:
+                matches[seed] = future.result()
+            except Exception as e:
+                matches[seed] = {"seed": seed, "error": repr(e)}
+                print(f"  [BATCH] match seed={seed} failed: {e!r}")
+            else:
+                m = matches[seed]
+                print(f"  [BATCH] {done}/{len(seeds)} seed={seed} {m['winner']} "
+                      f"in {m['duration_s']:.0f}s, {m['kills']} kills, {m['ejections']} ejections")
+
+    ordered = [matches[seed] for seed in seeds]
+    return {
+        "config": {"matches": args.matches, "seed": args.seed, "workers": workers,
+                   "agent_mode": args.agent_mode},
+        "wall_s": round(time.perf_counter() - start, 2),
+        "summary": summarise(ordered),
+        "matches": ordered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MonadSus headless batch runner")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=0, help="processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match; match i uses seed + i")
+    parser.add_argument("--agent-mode", default="simple", choices=["simple", "openclaw"])
+    parser.add_argument("--verbose", action="store_true", help="show each match's console output")
+    parser.add_argument("--output", default="batch_results.json")
+    args = parser.parse_args()
+
+    results = run(args)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    s = results["summary"]
+    print(f"  [BATCH] {s['matches']} matches in {results['wall_s']:.1f}s ({s['errors']} errors)")
+    print(f"  [BATCH] crew {s['crew_win_rate']:.1%} / imposter {s['imposter_win_rate']:.1%}, "
+          f"{s['timeouts']} timeouts, mean {s['duration_s']['mean']:.0f}s")
+    print(f"  [BATCH] per match: {s['kills_per_match']} kills, {s['ejections_per_match']} ejections, "
+          f"{s['meetings_per_match']} meetings")
+    for name, p in s["personalities"].items():
+        print(f"  [BATCH] {name:<10} {p['win_rate']:.1%} of {p['games']}")
+    print(f"  [BATCH] results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ import json
 import os
 import time
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Optional, Any, Callable
 from enum import Enum
 
 # Load .env file if present
@@ -356,19 +356,21 @@ class EventLogger:
     - Market settlement verification
     """
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
         self.events: list[GameEvent] = []
-        self.game_start_time: float = 0.0
+        self.game_start_time: Optional[float] = None
+        # seconds since some origin; a tick counter makes the log reproducible
+        self.clock = clock or time.time
 
     def start_game(self):
         """Mark game start time."""
-        self.game_start_time = time.time()
+        self.game_start_time = self.clock()
         self.events = []
         self.log("GAME_START", None, {})
 
     def log(self, event_type: str, agent_id: Optional[str], data: dict):
         """Log an event."""
-        t = time.time() - self.game_start_time if self.game_start_time else 0.0
+        t = self.clock() - self.game_start_time if self.game_start_time is not None else 0.0
         event = GameEvent(timestamp=t, event_type=event_type, agent_id=agent_id, data=data)
         self.events.append(event)
         return event
@@ -730,9 +732,11 @@ class MonadSusChainIntegration:
         chain.on_game_end(winner, imposter_id, alive_agents)
     """
 
-    def __init__(self, live_mode: bool = False):
+    def __init__(self, live_mode: bool = False, export_log: bool = True,
+                 clock: Optional[Callable[[], float]] = None):
         self.connector = BlockchainConnector(live_mode=live_mode)
-        self.logger = EventLogger()
+        self.logger = EventLogger(clock)
+        self.export_log = export_log    # write game_log_{id}.json at game end
         
         # Import tokenization module
         try:
@@ -866,10 +870,11 @@ class MonadSusChainIntegration:
             self.tokenization.unlock_trading(self.game_id)
 
         # Export event log
-        export_path = f"game_log_{self.game_id}.json"
-        with open(export_path, "w") as f:
-            f.write(self.logger.export_json())
-        print(f"  [CHAIN] Event log exported: {export_path}")
+        if self.export_log:
+            export_path = f"game_log_{self.game_id}.json"
+            with open(export_path, "w") as f:
+                f.write(self.logger.export_json())
+            print(f"  [CHAIN] Event log exported: {export_path}")
 
         return final_hash
 
@@ -1,6 +1,8 @@
 import pygame as pg
 import pygame.font
 
+import fonts
+
 from settings import *
 from settings import *
 
@@ -37,11 +39,11 @@ class Board:
             self.intro_help.append(pygame.image.load('Assets/Images/help/'+'help'+str(i+1)+'.png'))
         self.intro_credits = pg.image.load("Assets/Images/credits/credits.png")
         
-        self.menu_font = pg.font.Font(FONT, 35)
-        self.bonus_font = pg.font.Font(FONT, 30)
-        self.title_font = pg.font.Font(FONT, 90)
-        self.game_over_font = pg.font.Font(FONT, 120)
-        self.game_left_font = pg.font.Font(FONT, 75)
+        self.menu_font = fonts.get_font(FONT, 35)
+        self.bonus_font = fonts.get_font(FONT, 30)
+        self.title_font = fonts.get_font(FONT, 90)
+        self.game_over_font = fonts.get_font(FONT, 120)
+        self.game_left_font = fonts.get_font(FONT, 75)
 
     # Draw Main Menu - Intro Menu
     def draw_menu(self, *args):
@@ -137,7 +139,7 @@ class Board:
         self.surface.blit(self.intro_entername, (self.width / 3.9, self.height * 0.05), (0, 0, self.width, self.height))
         self.intro_input = pg.transform.smoothscale(self.intro_input, (int(self.width / 3), int(self.height * 0.2)))
         self.surface.blit(self.intro_input, (self.width / 3.0, self.height * 0.4), (0, 0, self.width, self.height))
-        text = self.menu_font.render("{}".format(word), True, MENU_FONT_COLOR)
+        text = fonts.render(self.menu_font, "{}".format(word), True, MENU_FONT_COLOR)
         rect = text.get_rect()
         rect.center = x, y
         pg.display.update()
@@ -150,7 +152,7 @@ class Board:
         self.surface.blit(self.intro_enteraddress, (self.width / 3.9, self.height * 0.05), (0, 0, self.width, self.height))
         self.intro_input = pg.transform.smoothscale(self.intro_input, (int(self.width / 3), int(self.height * 0.2)))
         self.surface.blit(self.intro_input, (self.width / 3.0, self.height * 0.4), (0, 0, self.width, self.height))
-        text = self.menu_font.render("{}".format(word), True, MENU_FONT_COLOR)
+        text = fonts.render(self.menu_font, "{}".format(word), True, MENU_FONT_COLOR)
         rect = text.get_rect()
         rect.center = x, y
         pg.display.update()
@@ -172,16 +174,16 @@ class Board:
         self.draw_text(self.surface, "Paused", self.width / 2, self.height / 2, self.title_font)
 
     def draw_bots_left(self, left: int, text_size):
-        self.bots_left_font = pg.font.Font(FONT, text_size)
+        self.bots_left_font = fonts.get_font(FONT, text_size)
         if self.game.gamemode == "Freeplay":
             self.draw_text(self.surface, "Bots Alive: {}".format(left), 60, 25, self.bots_left_font)
         elif self.game.gamemode == "Multiplayer":
             self.draw_text(self.surface, "PLYR Alive: {}".format(left), 60 , 25, self.bots_left_font)
 
     def draw_player_name(self, player_name, text_color, text_size):
-        self.player_name_font = pg.font.Font(FONT, text_size)
-        text_surface = self.player_name_font.render(player_name + " - Imposter", True, text_color)
-        text_surface2 = self.player_name_font.render(player_name+ " - Crewmate", True, text_color)
+        self.player_name_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(self.player_name_font, player_name + " - Imposter", True, text_color)
+        text_surface2 = fonts.render(self.player_name_font, player_name+ " - Crewmate", True, text_color)
         if self.game.player.imposter:
             return text_surface
         else:
@@ -191,28 +193,28 @@ class Board:
         self.draw_text(self.surface, p + " was ejected", self.width/2, self.height/2, self.bonus_font)
 
     def draw_light_timer_text(self, left: int, text_color, text_size):
-        timer_font = pg.font.Font(FONT, text_size)
-        text_surface = timer_font.render("{} ".format(left), True, text_color)
+        timer_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(timer_font, "{} ".format(left), True, text_color)
         return text_surface
 
     def draw_kill_timer_text(self, left: int, text_color, text_size):
-        timer_font = pg.font.Font(FONT, text_size)
-        text_surface = timer_font.render("{} ".format(left), True, text_color)
+        timer_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(timer_font, "{} ".format(left), True, text_color)
         return text_surface
 
     def draw_reactor_timer_imposter_text(self, left: int, text_color, text_size):
-        timer_font = pg.font.Font(FONT, text_size)
-        text_surface = timer_font.render("{} ".format(left), True, text_color)
+        timer_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(timer_font, "{} ".format(left), True, text_color)
         return text_surface
 
     def draw_reactor_timer_text(self, left: int, text_color, text_size):
-        timer_font = pg.font.Font(FONT, text_size)
-        text_surface = timer_font.render("Reactor Meltdown in: {} ".format(left) + " secs", True, text_color)
+        timer_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(timer_font, "Reactor Meltdown in: {} ".format(left) + " secs", True, text_color)
         return text_surface
 
     def draw_meeting_timer_text(self, left: int, text_color, text_size):
-        timer_font = pg.font.Font(FONT, text_size)
-        text_surface = timer_font.render("Voting Ends in: {} ".format(left), True, text_color)
+        timer_font = fonts.get_font(FONT, text_size)
+        text_surface = fonts.render(timer_font, "Voting Ends in: {} ".format(left), True, text_color)
         return text_surface
 
     @staticmethod
@@ -227,7 +229,7 @@ class Board:
 
     def draw_text(surface, text, x, y, font):
         if text is not None:
-            text = font.render(text, True, MENU_FONT_COLOR)
+            text = fonts.render(font, text, True, MENU_FONT_COLOR)
             rect = text.get_rect()
             rect.center = x, y
             surface.blit(text, rect)
@@ -0,0 +1,76 @@
+"""
+Font Registry and Text Cache for MonadSus.
+
+pg.font.Font parses the font file every time it is constructed, and
+Font.render rasterizes every glyph on every call. Both used to happen
+inside the frame loop (HUD lines, timers, name tags, buttons). This
+module keeps:
+- one Font per (file, size) for the whole process (get_font/get_sysfont)
+- an LRU of rendered text surfaces keyed by (font, text, antialias,
+  colour, background), so a line that did not change since the last frame
+  is a dictionary lookup
+
+Surfaces returned by render() are shared: blit them, never draw on them.
+"""
+
+from collections import OrderedDict
+
+import pygame as pg
+
+
+# ---------------------------------------------------------------------------
+# Font Registry
+# ---------------------------------------------------------------------------
+
+_fonts = {}
+
+
+def get_font(name, size: int) -> pg.font.Font:
+    """The shared Font for a font file (None = pygame's default) at size."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pg.font.Font(name, size)
+    return font
+
+
+def get_sysfont(name: str, size: int, bold: bool = False, italic: bool = False) -> pg.font.Font:
+    key = ("sys", name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pg.font.SysFont(name, size, bold, italic)
+    return font
+
+
+# ---------------------------------------------------------------------------
+# Text Cache
+# ---------------------------------------------------------------------------
+
+TEXT_CACHE_SIZE = 512
+
+_texts = OrderedDict()
+stats = {"hits": 0, "misses": 0}
+
+
+def render(font: pg.font.Font, text: str, antialias, colour, background=None) -> pg.Surface:
+    """font.render(text, antialias, colour, background), cached."""
+    key = (font, text, bool(antialias), tuple(colour), tuple(background) if background is not None else None)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        stats["hits"] += 1
+        return surface
+    stats["misses"] += 1
+    surface = _texts[key] = font.render(text, antialias, colour, background)
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surface
+
+
+def render_text(name, size: int, text: str, antialias, colour, background=None) -> pg.Surface:
+    """render() with the registry font for (name, size)."""
+    return render(get_font(name, size), text, antialias, colour, background)
+
+
+def clear():
+    _texts.clear()
@@ -0,0 +1,360 @@
+"""
+Shared-Memory Frame Capture for MonadSus.
+
+For broadcasting a match, AutonomousGame(capture=FrameRingWriter(...))
+copies every rendered frame into a ring of slots in a named
+multiprocessing.shared_memory block. An encoder or streamer in another
+process attaches with FrameRingReader and takes frames at its own pace.
+
+- the copy is one memcpy from the screen's pixel buffer (the surface
+  buffer protocol) into the slot: no tostring(), no intermediate bytes
+- the game never waits for the consumer: when every slot still holds an
+  unread frame, the new frame is dropped and counted instead
+- one writer, one reader. write_seq / read_seq in the header are the
+  only shared state; the writer only fills slots the reader has released,
+  so a frame is never overwritten while it is being read
+
+A consumer that only wants the newest frame (a live stream) calls
+acquire(latest=True), which skips and frees every older frame.
+
+Only the writer owns the block: readers attach without registering it
+with their resource tracker, so a reader exiting never unlinks the ring
+and the writer's own registration (which cleans up after a crashed game)
+is left intact.
+
+    python main_autonomous.py --capture monadsus
+    python frame_capture.py watch monadsus      # prints fps / drops
+    python frame_capture.py selftest            # spawned reader + clean close
+"""
+
+import argparse
+import multiprocessing
+import struct
+import subprocess
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import pygame as pg
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+#
+# header : magic(4s) version(u16) slots(u16) format(4s) width(u32) height(u32)
+#          pitch(u32) frame_bytes(u32) write_seq(u64) read_seq(u64) dropped(u64)
+# slots  : per slot seq(u64) tick(u64) time(f64), then frame_bytes of pixels
+#
+# write_seq: frames published so far (slot = seq % slots)
+# read_seq : frames released by the reader
+
+MAGIC = b"MSFC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH4sIIIIQQQ")
+SLOT = struct.Struct("<QQd")
+SEQ = struct.Struct("<Q")
+WRITE_SEQ_AT = 28          # byte offsets of the counters in HEADER
+READ_SEQ_AT = 36
+DROPPED_AT = 44
+
+DEFAULT_NAME = "monadsus_frames"
+_OWNED = set()             # rings created (and registered) by a writer in this process
+DEFAULT_SLOTS = 4
+
+# 32-bit surface masks (R, G, B) -> pg.image.frombuffer format of the bytes
+FORMATS = {(0xFF0000, 0x00FF00, 0x0000FF): b"BGRA",
+           (0x0000FF, 0x00FF00, 0xFF0000): b"RGBX"}
+
+
+class Frame:
+    """One captured frame; pixels is a view into shared memory until release()."""
+
+    __slots__ = ("seq", "tick", "time", "width", "height", "pitch", "format", "pixels")
+
+    def __init__(self, seq, tick, time, width, height, pitch, format, pixels):
+        self.seq = seq
+        self.tick = tick
+        self.time = time
+        self.width = width
+        self.height = height
+        self.pitch = pitch
+        self.format = format
+        self.pixels = pixels
+
+    def surface(self) -> pg.Surface:
+        """A Surface over the shared pixels (no copy): use it before release().
+
+        The fourth byte is the screen's unused padding, so the surface's
+        alpha is meaningless: scale / encode it (JPEG ignores alpha) or
+        take an opaque copy().
+        """
+        # rows are packed (the writer's pitch is always width * 4), so no pitch
+        # argument: pygame 2.6's frombuffer frees the caller's buffer when given one
+        return pg.image.frombuffer(self.pixels, (self.width, self.height), self.format.decode())
+
+    def copy(self) -> pg.Surface:
+        """An opaque Surface holding a copy of the frame (safe after release())."""
+        surface = pg.Surface((self.width, self.height))
+        surface.blit(self.surface(), (0, 0), special_flags=pg.BLEND_RGB_ADD)
+        return surface
+
+
+# ---------------------------------------------------------------------------
+# Writer (game side)
+# ---------------------------------------------------------------------------
+
+class FrameRingWriter:
+    """Creates the shared ring for frames of size (width, height) and fills it."""
+
+    def __init__(self, size, name: str = DEFAULT_NAME, slots: int = DEFAULT_SLOTS):
+        self.width, self.height = size
+        self.pitch = self.width * 4
+        self.frame_bytes = self.pitch * self.height
+        self.slots = slots
+        self.slot_size = SLOT.size + self.frame_bytes
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True,
+                                                  size=HEADER.size + slots * self.slot_size)
+        except FileExistsError:
+            # left behind by a crashed game: take it over
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name, create=True,
+                                                  size=HEADER.size + slots * self.slot_size)
+        self.name = self.shm.name
+        _OWNED.add(self.name)
+        self.format = None
+        self.written = 0
+        self.dropped = 0
+        self._write_header(b"\0\0\0\0")
+
+    def _write_header(self, fmt):
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, self.slots, fmt, self.width, self.height,
+                         self.pitch, self.frame_bytes, self.written, 0, self.dropped)
+
+    def write(self, surface: pg.Surface, tick: int = 0) -> bool:
+        """Copy surface into the next free slot; False if the frame was dropped."""
+        if self.shm is None:
+            return False
+        buf = self.shm.buf
+        read_seq, = SEQ.unpack_from(buf, READ_SEQ_AT)
+        if self.written - read_seq >= self.slots:
+            self.dropped += 1
+            SEQ.pack_into(buf, DROPPED_AT, self.dropped)
+            return False
+
+        if (surface.get_size() != (self.width, self.height) or surface.get_bytesize() != 4
+                or surface.get_pitch() != self.pitch
+                or surface.get_masks()[:3] not in FORMATS):
+            # not the screen layout the ring was made for: one conversion copy
+            surface = pg.transform.scale(surface, (self.width, self.height)).convert(32, 0)
+        if self.format is None:
+            self.format = FORMATS[surface.get_masks()[:3]]
+            self._write_header(self.format)
+
+        offset = HEADER.size + (self.written % self.slots) * self.slot_size
+        SLOT.pack_into(buf, offset, self.written, tick, time.time())
+        start = offset + SLOT.size
+        pixels = surface.get_buffer()          # locks the surface until released
+        try:
+            buf[start:start + self.frame_bytes] = memoryview(pixels)
+        finally:
+            del pixels
+        self.written += 1
+        SEQ.pack_into(buf, WRITE_SEQ_AT, self.written)    # publish last
+        return True
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            _OWNED.discard(self.name)
+
+
+# ---------------------------------------------------------------------------
+# Reader (consumer side)
+# ---------------------------------------------------------------------------
+
+def attach(name: str, shared_tracker=None) -> shared_memory.SharedMemory:
+    """Open an existing ring without taking ownership of it.
+
+    Python 3.13+ attaches untracked. Before that, attaching registers the
+    block with the resource tracker, which would unlink it when this
+    process exits; the registration is dropped again unless this process
+    shares the writer's tracker (shared_tracker; by default, the writer's
+    own process and any multiprocessing child, such as main_autonomous'
+    --stream server). There the writer registered the name already, and
+    unregistering it would remove the writer's entry instead.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    shm = shared_memory.SharedMemory(name)
+    if shared_tracker is None:
+        shared_tracker = name in _OWNED or multiprocessing.parent_process() is not None
+    if not shared_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def ring_written(name: str = DEFAULT_NAME, shared_tracker=None):
+    """Frames published so far by the ring currently called name; None if there is none."""
+    try:
+        shm = attach(name, shared_tracker)
+    except FileNotFoundError:
+        return None
+    try:
+        if HEADER.unpack_from(shm.buf)[:2] != (MAGIC, VERSION):
+            return None
+        return SEQ.unpack_from(shm.buf, WRITE_SEQ_AT)[0]
+    finally:
+        shm.close()
+
+
+class FrameRingReader:
+    """Attaches to a ring made by FrameRingWriter in another process."""
+
+    def __init__(self, name: str = DEFAULT_NAME, shared_tracker=None):
+        self.shm = attach(name, shared_tracker)
+        magic, version, self.slots, _, self.width, self.height, self.pitch, self.frame_bytes, \
+            _, _, _ = HEADER.unpack_from(self.shm.buf)
+        if magic != MAGIC or version != VERSION:
+            self.shm.close()
+            raise ValueError(f"{name}: not a MonadSus frame ring")
+        self.slot_size = SLOT.size + self.frame_bytes
+        self._held = None
+
+    @property
+    def format(self) -> bytes:
+        return HEADER.unpack_from(self.shm.buf)[3]
+
+    def stats(self):
+        """(frames written, frames released, frames dropped by the writer)."""
+        buf = self.shm.buf
+        return (SEQ.unpack_from(buf, WRITE_SEQ_AT)[0], SEQ.unpack_from(buf, READ_SEQ_AT)[0],
+                SEQ.unpack_from(buf, DROPPED_AT)[0])
+
+    def acquire(self, latest: bool = False):
+        """The next unread frame (or the newest with latest=True); None if there is none."""
+        if self._held is not None:
+            self.release()
+        buf = self.shm.buf
+        write_seq, = SEQ.unpack_from(buf, WRITE_SEQ_AT)
+        read_seq, = SEQ.unpack_from(buf, READ_SEQ_AT)
+        if read_seq >= write_seq:
+            return None
+        if latest and write_seq - read_seq > 1:
+            read_seq = write_seq - 1
+            SEQ.pack_into(buf, READ_SEQ_AT, read_seq)     # frees the skipped slots
+        offset = HEADER.size + (read_seq % self.slots) * self.slot_size
+        seq, tick, stamp = SLOT.unpack_from(buf, offset)
+        start = offset + SLOT.size
+        self._held = Frame(seq, tick, stamp, self.width, self.height, self.pitch, self.format,
+                           buf[start:start + self.frame_bytes])
+        return self._held
+
+    def release(self):
+        """Hand the acquired frame's slot back to the writer (drop its surfaces first)."""
+        if self._held is not None:
+            self._held.pixels.release()
+            SEQ.pack_into(self.shm.buf, READ_SEQ_AT, self._held.seq + 1)
+            self._held = None
+
+    def close(self):
+        if self.shm is not None:
+            self.release()
+            self.shm.close()
+            self.shm = None
+
+
+# ---------------------------------------------------------------------------
+# Self-check
+# ---------------------------------------------------------------------------
+
+def _read_one(name, ticks):
+    reader = FrameRingReader(name)
+    frame = reader.acquire()
+    ticks.put(frame.tick if frame else None)
+    reader.close()
+
+
+def _selftest_run():
+    # the writer side: one frame, a spawned reader (like --stream), then close
+    name = f"monadsus_selftest_{multiprocessing.current_process().pid}"
+    writer = FrameRingWriter((64, 32), name=name)
+    try:
+        writer.write(pg.Surface((64, 32)), 7)
+        ctx = multiprocessing.get_context("spawn")
+        ticks = ctx.Queue()
+        child = ctx.Process(target=_read_one, args=(name, ticks))
+        child.start()
+        tick = ticks.get(timeout=30)
+        child.join()
+        assert child.exitcode == 0 and tick == 7, (child.exitcode, tick)
+        assert ring_written(name) == 1
+    finally:
+        writer.close()
+    assert ring_written(name) is None
+
+
+def selftest():
+    """Run _selftest_run in a fresh interpreter and check its tracker stayed quiet.
+
+    The resource tracker reports a bad unregister or a leaked block on
+    stderr when the writer's process exits, so the run has to finish
+    before its output can be checked.
+    """
+    result = subprocess.run([sys.executable, __file__, "_selftest-run"],
+                            capture_output=True, text=True, timeout=120)
+    problems = [line for line in result.stderr.splitlines()
+                if "KeyError" in line or "leaked" in line or "Error" in line]
+    assert result.returncode == 0 and not problems, result.stderr
+    print("  [CAPTURE] selftest ok: spawned reader attached, writer closed cleanly")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a MonadSus frame capture ring.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_watch = sub.add_parser("watch", help="consume frames and print the rate")
+    p_watch.add_argument("name", nargs="?", default=DEFAULT_NAME)
+    p_watch.add_argument("--save", metavar="PNG", help="save the newest frame here every second")
+    sub.add_parser("selftest", help="check a spawned reader leaves the writer's cleanup intact")
+    sub.add_parser("_selftest-run")
+    args = parser.parse_args()
+
+    if args.command == "selftest":
+        selftest()
+        sys.exit()
+    if args.command == "_selftest-run":
+        _selftest_run()
+        sys.exit()
+
+    reader = FrameRingReader(args.name)
+    print(f"  [CAPTURE] {args.name}: {reader.width}x{reader.height}, {reader.slots} slots")
+    received, last = 0, time.perf_counter()
+    try:
+        while True:
+            frame = reader.acquire(latest=True)
+            if frame is None:
+                time.sleep(0.002)
+                continue
+            received += 1
+            now = time.perf_counter()
+            if now - last >= 1.0:
+                if args.save:
+                    pg.image.save(frame.copy(), args.save)
+                written, _, dropped = reader.stats()
+                print(f"  [CAPTURE] {received / (now - last):5.1f} fps received, tick {frame.tick}, "
+                      f"{written} written, {dropped} dropped by the game")
+                received, last = 0, now
+            reader.release()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
@@ -20,6 +20,12 @@ from pygame.locals import *
 import pickle
 import select
 import socket
+import snapshot_codec
+import fonts
+from minimap import MiniMap, RING
+from profiler import FrameProfiler
+from atlas import convert_atlases
+import asset_cache
 
 BUFFERSIZE = 8192
 
@@ -29,12 +35,15 @@ class Game:
         pg.init()
         # pg.mixer.init()
         self.screen = pg.display.set_mode((WIDTH, HEIGHT))
+        convert_atlases(PLAYER_ATLASES)      # player sprites in the display format
         self.board = Board(WIDTH, HEIGHT, self)
         self.tasks = Task(self)
         #self.mini_game = MiniGame(self)
         self.gamefuctions = GameFunctions(self)
         pg.display.set_caption(TITLE)
         self.clock = pg.time.Clock()
+        # per-phase frame timings; F3 shows the p50/p95/p99 overlay
+        self.profiler = FrameProfiler(budget_ms=1000 / FPS)
         # pg.key.set_repeat(100, 100)
         self.missions_done = 0  # Access this variable, increment everytime a mission is completed
         # root directory is game_folder
@@ -110,13 +119,14 @@ class Game:
         self.bot_colours = ["Black", "Blue", "Brown", "Green", "Orange", "Pink", "Purple", "Red", "White", "Yellow"]
 
         # Mini Map-----
-        # 57292 = width of main map image, 3168 = height of main map image
-        self.mini_map = pg.Surface([5792 / 15, 3168 / 15], pg.SRCALPHA, 32).convert_alpha()
-        self.mini_map = pg.transform.scale(self.mini_map, (int(3 * (5792 / 15)), int(3 * (3168 / 15)))).convert_alpha()
         self.mini_map_img = pg.image.load(path.join(self.map_folder, 'mini_map.png')).convert_alpha()
         # 57292 = width of main map image, 3168 = height of main map image
         self.mini_map_img = pg.transform.smoothscale(self.mini_map_img,
                                                      (int(3 * (5792 / 15)), int(3 * (3168 / 15)))).convert_alpha()
+        # player square + active sabotage sites, redrawn only where they move
+        self.mini_map = MiniMap(self.mini_map_img, refresh_ms=MINI_MAP_REFRESH)
+        # admin/security monitor: every alive player
+        self.monitor_map = MiniMap(self.mini_map_img, refresh_ms=MINI_MAP_REFRESH)
         # Admin Room Mini Map
         self.admin_mini_map = pg.Surface([5792 / 15, 3168 / 15], pg.SRCALPHA, 32).convert_alpha()
         self.admin_mini_map = pg.transform.scale(self.admin_mini_map,
@@ -269,7 +279,8 @@ class Game:
 
         # Load tiled map from specified directory
         self.map = TiledMap(path.join(self.map_folder, 'map.tmx'))
-        self.map_img = self.map.make_map()
+        # rendered lazily in chunks around the camera instead of one map-sized Surface
+        self.map_img = ChunkedMap(self.map)
         # make make outer rectangle that will display on screen
         self.map_rect = self.map_img.get_rect()
 
@@ -336,74 +347,69 @@ class Game:
 
         """ TASK & ITEM IMAGES & PLAYER PROPERTIES LOADING - CLOSE HERE"""
         # Some task and Items Images and player properties
-        self.kill_icon = pg.image.load("Assets/Images/UI/kill_icon.png").convert_alpha()
-        self.kill_icon_dim = pg.image.load("Assets/Images/UI/kill_icon_dim.png").convert_alpha()
-        self.sabotage_icon = pg.image.load("Assets/Images/UI/sabotage_icon.png").convert_alpha()
-        self.sabotage_icon_dim = pg.image.load("Assets/Images/UI/sabotage_icon_dim.png").convert_alpha()
-        self.emergency_icon = pg.image.load("Assets/Images/UI/emergency_icon.png").convert_alpha()
-        self.emergency_icon = pg.transform.smoothscale(self.emergency_icon, (95, 81)).convert_alpha()
-        self.emergency_icon_dim = pg.image.load("Assets/Images/UI/emergency_icon_dim.png").convert_alpha()
-        self.emergency_icon_dim = pg.transform.smoothscale(self.emergency_icon_dim, (95, 81)).convert_alpha()
-        self.light_bulb_icon = pg.image.load("Assets/Images/UI/light_bulb_icon.png").convert_alpha()
-        self.light_bulb_icon = pg.transform.smoothscale(self.light_bulb_icon, (75, 90)).convert_alpha()
-        self.light_bulb_icon_dim = pg.image.load("Assets/Images/UI/light_bulb_icon_dim.png").convert_alpha()
-        self.light_bulb_icon_dim = pg.transform.smoothscale(self.light_bulb_icon_dim, (75, 90)).convert_alpha()
-
-        self.invsible_player_image = pg.image.load("Assets/Images/Player/invisble3.png").convert_alpha()
-        self.invsible_player_image = pygame.transform.scale(self.invsible_player_image, (64, 86)).convert_alpha()
-        self.imposter_among_us_img = pygame.image.load('Assets/Images/Menu/imposteramongus.png').convert_alpha()
+        self.kill_icon = asset_cache.load("Assets/Images/UI/kill_icon.png")
+        self.kill_icon_dim = asset_cache.load("Assets/Images/UI/kill_icon_dim.png")
+        self.sabotage_icon = asset_cache.load("Assets/Images/UI/sabotage_icon.png")
+        self.sabotage_icon_dim = asset_cache.load("Assets/Images/UI/sabotage_icon_dim.png")
+        self.emergency_icon = asset_cache.load("Assets/Images/UI/emergency_icon.png", (95, 81))
+        self.emergency_icon_dim = asset_cache.load("Assets/Images/UI/emergency_icon_dim.png", (95, 81))
+        self.light_bulb_icon = asset_cache.load("Assets/Images/UI/light_bulb_icon.png", (75, 90))
+        self.light_bulb_icon_dim = asset_cache.load("Assets/Images/UI/light_bulb_icon_dim.png", (75, 90))
+
+        self.invsible_player_image = asset_cache.load("Assets/Images/Player/invisble3.png", (64, 86), smooth=False)
+        self.imposter_among_us_img = asset_cache.load('Assets/Images/Menu/imposteramongus.png')
         self.kill_victim_anim_img = []
         for i in range(1, 19):
-            self.kill_victim_anim_img.append(pygame.image.load('Assets/Images/Alerts/' + 'kill' + str(i) + '.png').convert_alpha())
-        self.cafe_comp_img = pygame.image.load(
-            'Assets/Images/Tasks/Become Imposter/cafe_computer_base.png').convert_alpha()
-        self.cafe_comp_check_img = pygame.image.load('Assets/Images/Tasks/Become Imposter/check.png').convert_alpha()
-        self.chat_img = pygame.image.load('Assets/Images/Meeting/chat.png').convert_alpha()
-        self.vote_img = pygame.image.load('Assets/Images/Meeting/e_vote_base.png').convert_alpha()
-        self.vote_tick_img = pygame.image.load('Assets/Images/Meeting/select_vote.png').convert_alpha()
-        self.chat_img_dead = pygame.image.load('Assets/Images/Meeting/chat_dead.png').convert_alpha()
-        self.vote_img_dead = pygame.image.load('Assets/Images/Meeting/e_vote_base_dead.png').convert_alpha()
-        self.eject_screen_img = pygame.image.load('Assets/Images/Alerts/eject.png').convert_alpha()
-        self.navigation_screen_img = pygame.image.load(
-            'Assets/Images/Tasks/Stabilize Steering/stabilizer_base.png').convert_alpha()
-        self.full_garbage_screen_img = pygame.image.load(
-            'Assets/Images/Tasks/Empty Garbage/garbage_base_full.png').convert_alpha()
-        self.empty_garbage_screen_img = pygame.image.load(
-            'Assets/Images/Tasks/Empty Garbage/garbage_base_empty.png').convert_alpha()
-        self.reboot_wifi_screen_img = pygame.image.load(
-            'Assets/Images/Tasks/Reboot Wifi/panel_wifi_bg.png').convert_alpha()
-        self.wifi_on_img = pygame.image.load('Assets/Images/Tasks/Reboot Wifi/wifi_on.png').convert_alpha()
-        self.wifi_liver_down_img = pygame.image.load(
-            'Assets/Images/Tasks/Reboot Wifi/panel_wifi-lever.png').convert_alpha()
-        self.electricity_wire_img = pygame.image.load(
-            'Assets/Images/Tasks/Fix Wiring/electricity_wire_base1.png').convert_alpha()
-        self.electricity_wire_red_img = pygame.image.load('Assets/Images/Tasks/Fix Wiring/red_wire.png').convert_alpha()
-        self.electricity_wire_blue_img = pygame.image.load(
-            'Assets/Images/Tasks/Fix Wiring/blue_wire.png').convert_alpha()
-        self.electricity_wire_yellow_img = pygame.image.load(
-            'Assets/Images/Tasks/Fix Wiring/yellow_wire.png').convert_alpha()
-        self.electricity_wire_pink_img = pygame.image.load(
-            'Assets/Images/Tasks/Fix Wiring/pink_wire.png').convert_alpha()
-        self.divert_power_to_reactor_window_img = pygame.image.load(
-            'Assets/Images/Tasks/Divert Power/electricity_Divert_Base.png').convert_alpha()
-        self.divert_power_to_reactor_liverUp_window_img = pygame.image.load(
-            'Assets/Images/Tasks/Divert Power/electricity_divert_btn.png').convert_alpha()
-        self.power_diverted_to_reactor_window_img = pygame.image.load(
-            'Assets/Images/Tasks/Divert Power/electricity_Divert_Base2.png').convert_alpha()
-        self.align_engine_output_window_img = pygame.image.load(
-            'Assets/Images/Tasks/Align Engine Output/engineAlign_base.png').convert_alpha()
-        self.align_engine_output_window2_img = pygame.image.load(
-            'Assets/Images/Tasks/Align Engine Output/engineAlign_base2.png').convert_alpha()
-        self.align_engine_output_window3_img = pygame.image.load(
-            'Assets/Images/Tasks/Align Engine Output/engineAlign_base3.png').convert_alpha()
-        self.align_engine_output_window4_img = pygame.image.load(
-            'Assets/Images/Tasks/Align Engine Output/engineAlign_base4.png').convert_alpha()
-        self.align_engine_liver_img = pygame.image.load(
-            'Assets/Images/Tasks/Align Engine Output/engine_liver.png').convert_alpha()
-        self.gas_can_img = pygame.image.load(
-            'Assets/Images/Tasks/Fuel Engines/gas_can.png').convert_alpha()
-        self.fuel_engine_window_img = pygame.image.load(
-            'Assets/Images/Tasks/Fuel Engines/fuel_engines_base.png').convert_alpha()
+            self.kill_victim_anim_img.append(asset_cache.load('Assets/Images/Alerts/' + 'kill' + str(i) + '.png'))
+        self.cafe_comp_img = asset_cache.load(
+            'Assets/Images/Tasks/Become Imposter/cafe_computer_base.png')
+        self.cafe_comp_check_img = asset_cache.load('Assets/Images/Tasks/Become Imposter/check.png')
+        self.chat_img = asset_cache.load('Assets/Images/Meeting/chat.png')
+        self.vote_img = asset_cache.load('Assets/Images/Meeting/e_vote_base.png')
+        self.vote_tick_img = asset_cache.load('Assets/Images/Meeting/select_vote.png')
+        self.chat_img_dead = asset_cache.load('Assets/Images/Meeting/chat_dead.png')
+        self.vote_img_dead = asset_cache.load('Assets/Images/Meeting/e_vote_base_dead.png')
+        self.eject_screen_img = asset_cache.load('Assets/Images/Alerts/eject.png')
+        self.navigation_screen_img = asset_cache.load(
+            'Assets/Images/Tasks/Stabilize Steering/stabilizer_base.png')
+        self.full_garbage_screen_img = asset_cache.load(
+            'Assets/Images/Tasks/Empty Garbage/garbage_base_full.png')
+        self.empty_garbage_screen_img = asset_cache.load(
+            'Assets/Images/Tasks/Empty Garbage/garbage_base_empty.png')
+        self.reboot_wifi_screen_img = asset_cache.load(
+            'Assets/Images/Tasks/Reboot Wifi/panel_wifi_bg.png')
+        self.wifi_on_img = asset_cache.load('Assets/Images/Tasks/Reboot Wifi/wifi_on.png')
+        self.wifi_liver_down_img = asset_cache.load(
+            'Assets/Images/Tasks/Reboot Wifi/panel_wifi-lever.png')
+        self.electricity_wire_img = asset_cache.load(
+            'Assets/Images/Tasks/Fix Wiring/electricity_wire_base1.png')
+        self.electricity_wire_red_img = asset_cache.load('Assets/Images/Tasks/Fix Wiring/red_wire.png')
+        self.electricity_wire_blue_img = asset_cache.load(
+            'Assets/Images/Tasks/Fix Wiring/blue_wire.png')
+        self.electricity_wire_yellow_img = asset_cache.load(
+            'Assets/Images/Tasks/Fix Wiring/yellow_wire.png')
+        self.electricity_wire_pink_img = asset_cache.load(
+            'Assets/Images/Tasks/Fix Wiring/pink_wire.png')
+        self.divert_power_to_reactor_window_img = asset_cache.load(
+            'Assets/Images/Tasks/Divert Power/electricity_Divert_Base.png')
+        self.divert_power_to_reactor_liverUp_window_img = asset_cache.load(
+            'Assets/Images/Tasks/Divert Power/electricity_divert_btn.png')
+        self.power_diverted_to_reactor_window_img = asset_cache.load(
+            'Assets/Images/Tasks/Divert Power/electricity_Divert_Base2.png')
+        self.align_engine_output_window_img = asset_cache.load(
+            'Assets/Images/Tasks/Align Engine Output/engineAlign_base.png')
+        self.align_engine_output_window2_img = asset_cache.load(
+            'Assets/Images/Tasks/Align Engine Output/engineAlign_base2.png')
+        self.align_engine_output_window3_img = asset_cache.load(
+            'Assets/Images/Tasks/Align Engine Output/engineAlign_base3.png')
+        self.align_engine_output_window4_img = asset_cache.load(
+            'Assets/Images/Tasks/Align Engine Output/engineAlign_base4.png')
+        self.align_engine_liver_img = asset_cache.load(
+            'Assets/Images/Tasks/Align Engine Output/engine_liver.png')
+        self.gas_can_img = asset_cache.load(
+            'Assets/Images/Tasks/Fuel Engines/gas_can.png')
+        self.fuel_engine_window_img = asset_cache.load(
+            'Assets/Images/Tasks/Fuel Engines/fuel_engines_base.png')
         self.fuel_engine_filled_black_bg = pg.Surface((340, 495))
         self.fuel_engine_filled_black_bg.fill((0, 0, 0))
         """ TASK & ITEM IMAGES & PLAYER PROPERTIES LOADING - CLOSE HERE"""
@@ -541,15 +547,13 @@ class Game:
         self.font = FONT
 
         # Light Effects__________________________
-        self.fog = pg.Surface((WIDTH, HEIGHT))
-        self.fog.fill(NIGHT_COLOR)
-        self.light_mask = pg.image.load(path.join(self.Environment_folder, LIGHT_MASK)).convert_alpha()
-        self.light_mask = pg.transform.scale(self.light_mask, LIGHT_RADIUS)  # LIGHT_RADIUS = (500, 500)
-        self.fog_reactor = pg.Surface((WIDTH, HEIGHT))
-        self.fog_reactor.fill(NIGHT_COLOR_REACTOR)
-        self.light_mask_reactor = pg.image.load(path.join(self.Environment_folder, LIGHT_MASK_REACTOR)).convert_alpha()
-        self.light_mask_reactor = pg.transform.scale(self.light_mask_reactor,
-                                                     LIGHT_RADIUS_REACTOR).convert_alpha()  # LIGHT_RADIUS = (500, 500)
+        # composited fog surfaces, built once per (mode, light radius) by fog_layers()
+        self.fog_cache = {}
+        # scaled once and kept in .asset_cache/ (asset_cache.py); LIGHT_RADIUS = (500, 500)
+        self.light_mask = asset_cache.load(path.join(self.Environment_folder, LIGHT_MASK),
+                                           LIGHT_RADIUS, smooth=False)
+        self.light_mask_reactor = asset_cache.load(path.join(self.Environment_folder, LIGHT_MASK_REACTOR),
+                                                   LIGHT_RADIUS_REACTOR, smooth=False)
 
         # Make rectangle so that we can easily placed them anywhere on screen
         # We only make rectangle of the image that we load into light_mask
@@ -557,37 +561,28 @@ class Game:
         self.light_rect = self.light_mask.get_rect()
         # Round circle of light when light is red
         self.light_rect_reactor = self.light_mask_reactor.get_rect()
-        # special flags = pygame flags to draw pixels on other pixels
-        self.screen.blit(self.fog, (0, 0), special_flags=pg.BLEND_MULT)
-        self.screen.blit(self.fog_reactor, (0, 0), special_flags=pg.BLEND_MULT)
 
         # ITEMS LOADING___________________________
         self.item_images = {}
+        # final size of each item's image (48x48 unless listed), scaled once and cached
+        item_sizes = {'vent': (64, 48), 'emerg_btn': (250, 250)}
         for item in ITEM_IMAGES:
-            self.item_images[item] = pg.image.load(path.join(self.items_img_folder, ITEM_IMAGES[item])).convert_alpha()
-            # scale up all item's images that store in dictionary
-            self.item_images[item] = pg.transform.scale(self.item_images[item], (48, 48))
-            if item == 'vent':
-                self.item_images[item] = pg.transform.scale(self.item_images[item], (64, 48))
-            if item == 'emerg_btn':
-                self.item_images[item] = pg.transform.scale(self.item_images[item], (250, 250))
+            self.item_images[item] = asset_cache.load(path.join(self.items_img_folder, ITEM_IMAGES[item]),
+                                                      item_sizes.get(item, (48, 48)), smooth=False)
 
         # CLEAR ASTEROID TASK LOADING -----------------------------------------
         # Asteroid images loading
         self.asteroid_images = []
         for image in CLEAR_ASTEROIDS_IMAGES:
-            self.asteroid_images.append(pg.image.load(image).convert_alpha())
+            self.asteroid_images.append(asset_cache.load(image))
 
         self.screen_width = 700
         self.screen_height = 600
 
         # Player image
-        self.starship_image = pg.image.load("Assets/Images/Tasks/Clear Asteroids/starship.png").convert_alpha()
-        self.starship_image = pg.transform.smoothscale(self.starship_image, (96, 96)).convert_alpha()
-        self.starship_image2 = pg.image.load("Assets/Images/Tasks/Clear Asteroids/starship2.png").convert_alpha()
-        self.starship_image2 = pg.transform.smoothscale(self.starship_image2, (96, 96)).convert_alpha()
-        self.starship_image3 = pg.image.load("Assets/Images/Tasks/Clear Asteroids/starship3.png").convert_alpha()
-        self.starship_image3 = pg.transform.smoothscale(self.starship_image3, (96, 96)).convert_alpha()
+        self.starship_image = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/starship.png", (96, 96))
+        self.starship_image2 = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/starship2.png", (96, 96))
+        self.starship_image3 = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/starship3.png", (96, 96))
         self.starship_image_alignment = "middle"
         self.starship_posX = 370
         self.starship_posY = 550
@@ -615,7 +610,7 @@ class Game:
         # Bullet
         # ready - you cant see the bullet on the screen
         # fire - the bullet moves towards enemy
-        self.bullet_image = pg.image.load("Assets/Images/Tasks/Clear Asteroids/laser.png").convert_alpha()
+        self.bullet_image = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/laser.png")
         self.bulletX = 0
         self.bulletY = 550
         # self.bulletX_change = 20
@@ -623,7 +618,7 @@ class Game:
         self.bullet_state = "ready"
 
         # Background image
-        self.clear_asteroid_background = pg.image.load("Assets/Images/Tasks/Clear Asteroids/space3.png").convert_alpha()
+        self.clear_asteroid_background = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/space3.png")
 
         self.bgX = 0
         self.bgY = 0
@@ -636,13 +631,12 @@ class Game:
         self.collision_sound = mixer.Sound("Assets/Sounds/Clear Asteroids/explosion2.mp3")
 
         # Score Board
-        self.score_box_img = pg.image.load("Assets/Images/Tasks/Clear Asteroids/score_box.png").convert_alpha()
-        self.score_box_img = pg.transform.smoothscale(self.score_box_img, (250, 60)).convert_alpha()
+        self.score_box_img = asset_cache.load("Assets/Images/Tasks/Clear Asteroids/score_box.png", (250, 60))
         self.score_value = 30
-        self.font = pg.font.Font("Assets/fonts/Hunger Games.ttf", 24)
+        self.font = fonts.get_font("Assets/fonts/Hunger Games.ttf", 24)
 
         # Game Over Text
-        self.game_over_font = pg.font.Font("Assets/fonts/Hunger Games.ttf", 64)
+        self.game_over_font = fonts.get_font("Assets/fonts/Hunger Games.ttf", 64)
         # CLEAR ASTEROID TASK LOADING -------------------------------------------
 
 
@@ -672,17 +666,18 @@ class Game:
 
     # THIS METHOD CREATES ALL OBJECTS, INSTANCES & VARIABLES
     # create sprites/ objects/ walls/ camera = all sprites
-    def new(self):
+    def new(self, rng=None):
         # initialize all variables and do all the setup for a new game
-        self.all_sprites = pg.sprite.LayeredUpdates()
+        # rng: random.Random for the bot colour draw (default: the shared random module)
+        rng = rng if rng is not None else random
+        # layered like before, plus a spatial grid so draw() only visits on-screen sprites
+        self.all_sprites = SpatialLayeredUpdates()
         # self.all_sprites = pg.sprite.Group()
         self.walls = pg.sprite.Group()
         self.items = pg.sprite.Group()
         self.bots = pg.sprite.Group()
         self.players_server = pg.sprite.Group()
 
-        # mini map player position indicator
-        self.player_map_square = pg.Surface([3 * 5, 3 * 5], pg.SRCALPHA, 32)
 
 
         bot_colours_temp = self.bot_colours
@@ -715,43 +710,43 @@ class Game:
                 Obstacle(self, tile_object.x, tile_object.y, tile_object.width, tile_object.height)
 
             if tile_object.name == 'bot1':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot1 = Bot(self, tile_object.x, tile_object.y, "Left", "bot1", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot2':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot2 = Bot(self, tile_object.x, tile_object.y, "Right", "bot2", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot3':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot3 = Bot(self, tile_object.x, tile_object.y, "Down", "bot3", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot4':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot4 = Bot(self, tile_object.x, tile_object.y, "Down", "bot4", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot5':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot5 = Bot(self, tile_object.x, tile_object.y, "Right", "bot5", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot6':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot6 = Bot(self, tile_object.x, tile_object.y, "Right", "bot6", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot7':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot7 = Bot(self, tile_object.x, tile_object.y, "Up", "bot7", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot8':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot8 = Bot(self, tile_object.x, tile_object.y, "Down", "bot8", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot9':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot9 = Bot(self, tile_object.x, tile_object.y, "Right", "bot9", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
             if tile_object.name == 'bot10':
-                bot_colours_temp_current = random.choice(bot_colours_temp)
+                bot_colours_temp_current = rng.choice(bot_colours_temp)
                 self.bot10 = Bot(self, tile_object.x, tile_object.y, "Up", "bot10", bot_colours_temp_current)
                 bot_colours_temp.remove(bot_colours_temp_current)
 
@@ -772,8 +767,7 @@ class Game:
     # CLEAR ASTEROIDS FUNCTIONS
     def show_score(self, x, y):
         self.screen.blit(self.score_box_img, (x, y))
-        GAME_FONT = pg.font.Font(FONT, 20)
-        self.score = GAME_FONT.render("Asteroids Left: " + str(self.score_value), True, BLACK)
+        self.score = fonts.render_text(FONT, 20, "Asteroids Left: " + str(self.score_value), True, BLACK)
         self.screen.blit(self.score, (x+30, y+10))
 
     def display_starship(self, x, y, alignment):
@@ -950,8 +944,7 @@ class Game:
         self.name_block = pg.Surface((20, 7))
         width = int(self.player.rect.width)
         self.health_bar = pg.Rect(0, 0, width, 7)
-        font = pg.font.Font(FONT, 14)
-        textsurface = font.render("tango", False, BLACK)
+        textsurface = fonts.render_text(FONT, 14, "tango", False, BLACK)
         # rect = text.get_rect()
         pg.draw.rect(self.player.image, WHITE, self.health_bar)
         # pg.draw.rect(text, WHITE, rect)
@@ -959,10 +952,10 @@ class Game:
 
 
     def draw_text(self, text, font_name, size, color, x, y, align="topleft"):
-        font = pg.font.Font(font_name, size)
-        text_surface = font.render(text, True, color)
+        text_surface = fonts.render_text(font_name, size, text, True, color)
         text_rect = text_surface.get_rect(**{align: (x, y)})
-        self.map_img.blit(text_surface, text_rect)
+        # x, y are map coordinates; the map itself is never drawn on
+        self.screen.blit(text_surface, self.camera.apply_rect(text_rect))
 
     def display_imposter_among_us(self):
         self.imposter_among_us_img = pg.transform.smoothscale(self.imposter_among_us_img, (WIDTH, HEIGHT))
@@ -998,11 +991,16 @@ class Game:
         self.time_left = 20
 
         while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000
-            self.events()
+            with self.profiler.phase("idle"):
+                self.dt = self.clock.tick(FPS) / 1000
+            self.profiler.frame()
+            with self.profiler.phase("events"):
+                self.events()
             if self.paused == False:
-                self.update()
-            self.draw()
+                with self.profiler.phase("update"):
+                    self.update()
+            with self.profiler.phase("draw"):
+                self.draw()
 
             self.killcooldown = pygame.time.get_ticks()
             self.sabotagecooldown = pygame.time.get_ticks()
@@ -1099,11 +1097,16 @@ class Game:
 
         self.playing = True
         while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000
-            self.events()
+            with self.profiler.phase("idle"):
+                self.dt = self.clock.tick(FPS) / 1000
+            self.profiler.frame()
+            with self.profiler.phase("events"):
+                self.events()
             if self.paused == False:
-                self.update()
-            self.draw()
+                with self.profiler.phase("update"):
+                    self.update()
+            with self.profiler.phase("draw"):
+                self.draw()
 
             self.killcooldown = pygame.time.get_ticks()
             self.sabotagecooldown = pygame.time.get_ticks()
@@ -1119,6 +1122,7 @@ class Game:
             self.player.tasks_completed = self.missions_done
 
             # server shit
+            self.profiler.start("net")
             ins, outs, ex = select.select([s], [], [], 0)
             for inm in ins:
                 # receiving data from server and storing in gameEvent
@@ -1139,6 +1143,8 @@ class Game:
                     gameEvent.pop(0)
                     # iterating gameEvent
                     for p in gameEvent:
+                        # restore the full entry from its quantized motion record
+                        p = snapshot_codec.unpack_entry(p)
                         # case1, when local player is connected and needs to be appended to the dictionary
                         # check if player is not already in the dictionary, and if the player id created dynamically 
                         # previously in gameEvent 'id update' matches with the id received right now
@@ -1403,6 +1409,7 @@ class Game:
                s.send(pickle.dumps(ge))
             except Exception:
                print("very exception")
+            self.profiler.stop("net")
 
             # check for game end condition
             if len(self.Players) > 1:
@@ -1756,13 +1763,27 @@ class Game:
 
     # Change player position
     def update_mini_map(self):
-        self.mini_map.blit(self.mini_map_img, (0, 0))
-        # mini map player position indicator
-        self.player_map_square.fill(self.player.player_colour)
-        """self.mini_map.blit(player_map_square, (2*self.player.rect.x / 13, 2*self.player.rect.y / 13))"""
-        self.mini_map.blit(self.player_map_square,
-                           (int(3 * (self.player.rect.x / 15)), int(3 * (self.player.rect.y / 15))))
+        self.mini_map.set_marker("player", self.player.rect.center, self.player.player_colour)
+        # where to go to fix an active sabotage
+        for key, site, active in (("lights", LIGHTS_FIX_POS, self.night), ("reactor", REACTOR_FIX_POS, self.night_reactor)):
+            if active:
+                self.mini_map.set_marker(key, site, RED, RING, 27)
+            else:
+                self.mini_map.remove_marker(key)
+        self.mini_map.refresh()
 
+        if self.view_admin_security_monitor_window_status:
+            markers = {"player": (self.player.rect.center, self.player.player_colour)}
+            if self.gamemode == "Freeplay":
+                for b in self.bots:
+                    if b.alive_status == True:
+                        markers[b.bot_colour] = (b.rect.center, b.bot_colour)
+            if self.gamemode == "Multiplayer":
+                for key, p in self.Players.items():
+                    if p.got_reported == False:
+                        markers[key] = ((p.pos.x, p.pos.y), YELLOW)
+            self.monitor_map.sync(markers)
+            self.monitor_map.refresh()
 
 
     def draw_grid(self):
@@ -1772,18 +1793,46 @@ class Game:
             pg.draw.line(self.screen, LIGHTGREY, (0, y), (WIDTH, y))
 
     # THIS METHOD DRAWS BLACK FOG ON SCREEN
+    def fog_layers(self, mode, light_mask=None):
+        """(fog, light patch) for a fog mode, composited once per (mode, light radius).
+
+        fog is a full-screen surface of the fog colour; the patch is the fog
+        colour with the light mask already blended in, so drawing the fog is
+        only BLEND_MULT blits of surfaces that never change.
+        """
+        key = (mode, light_mask.get_size() if light_mask else None)
+        layers = self.fog_cache.get(key)
+        if layers is None:
+            colour = NIGHT_COLOR_REACTOR if mode == "reactor" else NIGHT_COLOR
+            fog = pg.Surface((WIDTH, HEIGHT))
+            fog.fill(colour)
+            patch = None
+            if light_mask:
+                patch = pg.Surface(light_mask.get_size())
+                patch.fill(colour)
+                patch.blit(light_mask, (0, 0))
+            layers = self.fog_cache[key] = (fog, patch)
+        return layers
+
     def render_fog(self):
-        # Draw the light mask (gradient) onto fog image
-        self.fog.fill(NIGHT_COLOR)
+        # The light patch goes around the player, plain fog everywhere else
+        fog, patch = self.fog_layers("night", self.light_mask)
         self.light_rect.center = self.camera.apply(self.player).center
-        self.fog.blit(self.light_mask, self.light_rect)
-        self.screen.blit(self.fog, (0, 0), special_flags=pg.BLEND_MULT)
+        self.screen.blit(patch, self.light_rect, special_flags=pg.BLEND_MULT)
+        light = self.light_rect
+        screen_rect = self.screen.get_rect()
+        for border in (pg.Rect(0, 0, WIDTH, light.top), pg.Rect(0, light.bottom, WIDTH, HEIGHT - light.bottom),
+                       pg.Rect(0, light.top, light.left, light.height),
+                       pg.Rect(light.right, light.top, WIDTH - light.right, light.height)):
+            border = border.clip(screen_rect)
+            if border.width > 0 and border.height > 0:
+                self.screen.blit(fog, border, border, special_flags=pg.BLEND_MULT)
 
     # THIS METHOD DRAWS BLACK FOG ON SCREEN
     def render_fog_reactor(self):
-        # Draw the light mask (gradient) onto fog image
-        self.fog_reactor.fill(NIGHT_COLOR_REACTOR)
-        self.screen.blit(self.fog_reactor, (0, 0), special_flags=pg.BLEND_MULT)
+        # Red tint over the whole screen, no light around the player
+        fog, _ = self.fog_layers("reactor")
+        self.screen.blit(fog, (0, 0), special_flags=pg.BLEND_MULT)
 
     # THIS METHOD DRAWS ALL WHAT WE SEE ON SCREEN
     def draw(self):
@@ -1792,13 +1841,19 @@ class Game:
         # self.screen.fill(BGCOLOR)
 
         """ Player Camera is loaded 1st"""
-        self.screen.blit(self.map_img, self.camera.apply_rect(self.map_rect))
+        self.profiler.start("draw.map")
+        self.map_img.draw(self.screen, self.camera)
+        # task objects sit on the map, under the sprites
+        self.gamefuctions.update_glow_objects()
+        self.gamefuctions.draw_glow_objects(self.screen, self.camera)
         # self.draw_grid()
+        self.profiler.stop("draw.map")
 
         """ Sprites / Players / objects/ Items are loaded 2nd """
         # draw all sprites/sprite group on screen
         # Draw rectangle along all sprites/ tiles/ walls/ objects to debug
-        for sprite in self.all_sprites:
+        self.profiler.start("draw.sprites")
+        for sprite in self.all_sprites.visible(self.camera.view_rect()):
             self.screen.blit(sprite.image, self.camera.apply(sprite))
             # if debug button is ON (shows rectangle borders on sprite)
             if self.draw_debug:
@@ -1813,12 +1868,17 @@ class Game:
                 for y in range(0, HEIGHT, TILESIZE):
                     pg.draw.line(self.screen, LIGHTGREY, (0, y), (WIDTH, y))
 
+        self.profiler.stop("draw.sprites")
+
         """ Fog is loaded 3rd """
         # Light Effect - Night Mode
+        self.profiler.start("draw.fog")
         if self.night:
             self.render_fog()
         if self.night_reactor:
             self.render_fog_reactor()
+        self.profiler.stop("draw.fog")
+        self.profiler.start("draw.hud")
 
         # If reactor is turned on by some crew mate in either game mode then
         # hide and reset the reactor_meltdown_timer, which displayed when imposter sabotages
@@ -2038,9 +2098,6 @@ class Game:
         self.gamefuctions.load_ambient_sounds()
         # AMBIENT SOUND CODE CLOSES HERE -------------------------------------------------------------
 
-        # GLOWING OBJECT CODE STARTS HERE ------------------------------------------------------------
-        self.gamefuctions.load_glow_objects()
-        # GLOWING OBJECT CODE CLOSES HERE--------------------------------------------------------
 
 
 
@@ -2312,12 +2369,11 @@ class Game:
             self.display_gas_can_picked()
 
         # IF player has not picked up gas can then show text
-        GAME_FONT = pygame.font.Font(FONT, 34)
         if self.gas_can_not_picked_text_visible_status:
             self.screen.blit(self.fuel_engine_filled_black_bg, (WIDTH / 3 - 45, 70))
             self.display_fuel_engine_window()
             self.screen.blit(self.dim_screen, (0, 0))
-            self.text = GAME_FONT.render(" Find a Gas Can Nearby", True, WHITE)
+            self.text = fonts.render_text(FONT, 34, " Find a Gas Can Nearby", True, WHITE)
             self.screen.blit(self.text, (450, HEIGHT/2 - 30))
             self.fuel_engine_close_btn2.draw_Image(self.screen)
 
@@ -2527,22 +2583,8 @@ class Game:
         """ Admin and Securitu Room Mini Map is loaded 2nd"""
         if self.view_admin_security_monitor_window_status and self.isdoingTask:
             self.screen.blit(self.dim_screen, (0, 0))
-            self.screen.blit(self.mini_map, (25, 30))
+            self.screen.blit(self.monitor_map.surface, (25, 30))
             self.view_security_monitor_close_btn.draw_Image(self.screen)
-            if self.gamemode == "Freeplay":
-                if self.bot_count > 0:
-                    for b in self.bots:
-                        if b.alive_status == True:
-                            self.player_map_square.fill(b.bot_colour)
-                            self.screen.blit(self.player_map_square,
-                                             (int(3 * (b.rect.x / 15)) + 25, int(3 * (b.rect.y / 15)) + 30))
-            if self.gamemode == "Multiplayer":
-                if len(self.Players) > 0:
-                    for p in self.Players.values():
-                        if p.got_reported == False:
-                            self.player_map_square.fill(YELLOW)
-                            self.screen.blit(self.player_map_square,
-                                             (int(3 * (p.pos.x / 15)) + 25, int(3 * (p.pos.y / 15)) + 30))
 
         # View Admin and Security Room Monitor Task trigger
         keys = pg.key.get_pressed()
@@ -2565,7 +2607,7 @@ class Game:
         if self.mini_map_button_status:
             # Mini map is loaded on board surface not screen at specific location on button press
             self.screen.blit(self.dim_screen, (0, 0))
-            self.board.draw_adds(self.board.surface, 25, 30, self.mini_map)
+            self.board.draw_adds(self.board.surface, 25, 30, self.mini_map.surface)
             # self.board.draw_adds(self.board.surface, WIDTH - 340, HEIGHT - 160, self.mini_map)
 
         """ Missions_box is loaded 5th"""
@@ -2601,8 +2643,11 @@ class Game:
                 self.kill_victim_anim_index += 1
                 self.timer_start = pygame.time.get_ticks()
             self.display_kill_victim_anim()  # this layer is beneath the screen
+        self.profiler.stop("draw.hud")
 
-        pg.display.flip()
+        self.profiler.draw(self.screen, topright=(WIDTH - 10, 10))
+        with self.profiler.phase("flip"):
+            pg.display.flip()
 
     def events(self):
         # catch all events here
@@ -2658,11 +2703,14 @@ class Game:
                 # if key is H and game is not paused
                 if event.key == pg.K_h and not self.paused:
                     self.draw_debug = not self.draw_debug
+                # F3 toggles the frame profiler overlay
+                if event.key == pg.K_F3:
+                    self.profiler.visible = not self.profiler.visible
                 # Create a toggle key for night fog switch
                 # if key is ctrl and game is not paused
                 if (event.key == pg.K_LCTRL or event.key == pg.K_RCTRL) and not self.paused and self.emerg_meeting_button_status == 0:
 
-                    c = pygame.Vector2(2472, 1721)
+                    c = pygame.Vector2(LIGHTS_FIX_POS)
                     d = pygame.Vector2(self.player.pos.x, self.player.pos.y)
                     if (self.sabotagecooldown - self.sabotagecooldown_start) > 15000 and self.night == False and self.night_reactor == False and self.player.imposter == True:
                         self.night = True
@@ -2691,7 +2739,7 @@ class Game:
                         self.effect_sounds['imposter_kill_cooldown_sound'].play()
 
                 if (event.key == pg.K_LSHIFT or event.key == pg.K_RSHIFT) and not self.paused and self.emerg_meeting_button_status == 0:
-                    c = pygame.Vector2(889, 999)
+                    c = pygame.Vector2(REACTOR_FIX_POS)
                     d = pygame.Vector2(self.player.pos.x, self.player.pos.y)
 
                     if (self.sabotagecooldown - self.sabotagecooldown_start) > 15000 and self.night_reactor == False and self.night == False and self.player.imposter == True:
@@ -3163,78 +3211,78 @@ class Game:
         progress_bar = pg.Rect(x, y, progress_width, height)
         pg.draw.rect(screen_surface, color, progress_bar)
 
-        taskbar_font = pg.font.Font(FONT, 14)
+        taskbar_font = fonts.get_font(FONT, 14)
         if missions_done >= 5:
             # if mission completed is 4 or greater than 4 then font color is Black
-            text_surface = taskbar_font.render("Total Tasks Completed", True, BLACK)
+            text_surface = fonts.render(taskbar_font, "Total Tasks Completed", True, BLACK)
         else:
             # if mission completed is less than 4 then font color is White
-            text_surface = taskbar_font.render("Total Tasks Completed", True, WHITE)
+            text_surface = fonts.render(taskbar_font, "Total Tasks Completed", True, WHITE)
         self.screen.blit(text_surface, (90, 17))
 
         # 4th parameter is the thickness of border of rectangle
         pg.draw.rect(screen_surface, WHITE, outline_rect, 2)
 
     def draw_missions_box(self):
-        self.GAME_FONT = pygame.font.Font(FONT, 18)
+        self.GAME_FONT = fonts.get_font(FONT, 18)
         self.mission_box = pg.Surface((415, 235)).convert_alpha()
         self.mission_box.fill((0, 0, 0, 96))
         self.screen.blit(self.mission_box, (10, 45))
         if not self.night:
-            self.text = self.GAME_FONT.render(self.tasks.turn_on_the_lights_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.turn_on_the_lights_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 50))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.turn_on_the_lights_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.turn_on_the_lights_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 50))
         if self.reboot_wifi_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.reboot_the_wifi_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.reboot_the_wifi_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 75))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.reboot_the_wifi_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.reboot_the_wifi_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 75))
         if self.garbage_liver_Up_sel_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.empty_the_garbage_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.empty_the_garbage_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 100))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.empty_the_garbage_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.empty_the_garbage_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 100))
         if self.stabilize_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.stabilize_nav_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.stabilize_nav_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 125))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.stabilize_nav_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.stabilize_nav_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 125))
         if self.electricity_wire_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.fix_electircity_wires_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.fix_electircity_wires_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 150))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.fix_electircity_wires_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.fix_electircity_wires_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 150))
         if self.divert_power_to_reactor_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.divert_power_to_reactor_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.divert_power_to_reactor_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 175))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.divert_power_to_reactor_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.divert_power_to_reactor_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 175))
         if self.align_engine_output_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.align_engine_output_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.align_engine_output_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 200))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.align_engine_output_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.align_engine_output_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 200))
 
         if self.fuel_engine_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.fuel_engine_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.fuel_engine_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 225))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.fuel_engine_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.fuel_engine_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 225))
 
         if self.clear_asteroid_task_play_count != 1:
-            self.text = self.GAME_FONT.render(self.tasks.clear_asteroids_task_title, True, GREEN)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.clear_asteroids_task_title, True, GREEN)
             self.screen.blit(self.text, (20, 250))
         else:
-            self.text = self.GAME_FONT.render(self.tasks.clear_asteroids_task_title, True, WHITE)
+            self.text = fonts.render(self.GAME_FONT, self.tasks.clear_asteroids_task_title, True, WHITE)
             self.screen.blit(self.text, (20, 250))
 
 
@@ -3259,9 +3307,9 @@ class Game:
         pg.draw.rect(screen_surface, color, progress_bar)
 
         # progress bar text
-        taskbar_font = pg.font.Font(FONT, 14)
-        text_surface = taskbar_font.render("K I L L   A L L   B O T S", True, WHITE)
-        text_surface2 = taskbar_font.render("K I L L   A L L   P L A Y E R S", True, WHITE)
+        taskbar_font = fonts.get_font(FONT, 14)
+        text_surface = fonts.render(taskbar_font, "K I L L   A L L   B O T S", True, WHITE)
+        text_surface2 = fonts.render(taskbar_font, "K I L L   A L L   P L A Y E R S", True, WHITE)
         if self.gamemode == "Freeplay":
             self.screen.blit(text_surface, (140, 17))
         else:
@@ -3271,7 +3319,7 @@ class Game:
         pg.draw.rect(screen_surface, WHITE, outline_rect, 2)
 
     def draw_missions_box_imposter(self):
-        self.GAME_FONT = pygame.font.SysFont('Arial', 24)
+        self.GAME_FONT = fonts.get_sysfont('Arial', 24)
         self.mission_box = pg.Surface((412, 140)).convert_alpha()
         self.mission_box.fill((0, 0, 0, 96))
         self.screen.blit(self.mission_box, (10, 45))
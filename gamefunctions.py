@@ -23,6 +23,7 @@ class GameFunctions:
 
         # Load all images that will be used for glowing objects
         self.load_image_data()
+        self.glow_objects = self.create_glow_objects()
 
     # This function load all images that will be used for glowing objects
     def load_image_data(self):
@@ -245,163 +246,123 @@ class GameFunctions:
             self.game.ambient_sounds['weapons'].fadeout(1500)
             self.weapons_room_sound_play_check = True
 
-    def load_glow_objects(self):
-        """YES"""
-        """Cafeteria Computer Glow object"""
-        c = pygame.Vector2(3060, 385)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        # if player is in range of object to glow, and game mod is freeplay only then, that object will glow
-        if d.distance_to(c) <= 400 and self.game.gamemode == "Freeplay":
-            self.game.map_img.blit(self.cafeteria_comp_highlighted_img, (3062, 387))
-        else:
-            self.game.map_img.blit(self.cafeteria_comp_img, (3062, 387))
-        """YES"""
-
-        """YES"""
-        """Emergency Meeting Glow object"""
-        c = pygame.Vector2(3284, 669)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if d.distance_to(c) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.emergency_button_highlighted_img, (3284, 669))
-        else:
-            self.game.map_img.blit(self.emergency_button_img, (3284, 669))
-        """YES"""
-
-        """Task - Clear Asteroid Glow object"""
-        c = pygame.Vector2(4513, 450)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if d.distance_to(c) <= DETECT_RADIUS and self.game.clear_asteroid_task_play_count == 1:
-            self.game.map_img.blit(self.nav_highlighted_img, (4513, 452))
-        else:
-            self.game.map_img.blit(self.nav_img, (4513, 452))
-
-        """Task - Turn On Reactor Glow object"""
-        c = pygame.Vector2(889, 999)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-
-        if self.game.night_reactor == True:
-            self.Turn_On_Reactor_is_available = True
-        else:
-            self.Turn_On_Reactor_is_available = False
-
-        if c.distance_to(d) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.reactor_highlight_btn_img, (889, 996))
-        else:
-            self.game.map_img.blit(self.reactor_btn_img, (889, 996))
-
-        """Task - Turn On Lower Engine Glow object"""
-        c = pygame.Vector2(1127, 2318)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if c.distance_to(d) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.lower_highlight_engine_img, (1127, 2318))
-        else:
-            self.game.map_img.blit(self.lower_engine_img, (1127, 2318))
-
-        """Task - Align Engine Output Glow object"""
-        c = pygame.Vector2(1117, 837)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if c.distance_to(d) <= DETECT_RADIUS and self.game.align_engine_output_task_play_count == 1:
-            self.game.map_img.blit(self.upper_engine_highlight_img, (1117, 837))
-        else:
-            self.game.map_img.blit(self.upper_engine_img, (1117, 837))
-
-        """Task - Stabilize Navigation Glow object"""
-        self.stabilize_steering_button_status = True
-        c = pygame.Vector2(5610, 1290)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if c.distance_to(d) <= DETECT_RADIUS and self.game.stabilize_task_play_count == 1:
-            self.game.map_img.blit(self.navigation_highlight_img, (5610, 1290))
-        else:
-            self.game.map_img.blit(self.navigation_img, (5610, 1290))
-        if self.game.stabilize_task_play_count !=1:
-            self.game.map_img.blit(self.navigation_img, (5610, 1290))
-
-
-        """Task - Turn On Generator Glow object"""
-        if self.game.night == True:
-            self.turn_on_generator_is_available = True
-        else:
-            self.turn_on_generator_is_available = False
-
-        c = pygame.Vector2(2472, 1721)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if c.distance_to(d) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.generator_highlight_btn_img, (2472, 1721))
-        else:
-            self.game.map_img.blit(self.generator_btn_img, (2472, 1721))
-
-        """Task - Admin Control Buttons Glow object"""
-        c = pygame.Vector2(3817, 1806)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        e = pygame.Vector2(4070, 1804)
-        if c.distance_to(d) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.admin_control_highlight_btn1_img, (3815, 1804))
-        else:
-            self.game.map_img.blit(self.admin_control_btn1_img, (3815, 1804))
-        if e.distance_to(d) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.admin_control_highlight_btn2_img, (4068, 1803))
-        else:
-            self.game.map_img.blit(self.admin_control_btn2_img, (4068, 1803))
-
-        """Task - Empty the Garbage Glow object"""
-        c = pygame.Vector2(3940, 321)
-        d = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if c.distance_to(d) <= DETECT_RADIUS and self.game.empty_garbage_task_play_count == 1:
-            self.game.map_img.blit(self.garbage_liver_highlight_img, (3940, 321))
-        else:
-            self.game.map_img.blit(self.garbage_liver_img, (3940, 321))
-
-        """Task - Reboot Wifi Glow object"""
-        x = pygame.Vector2(3700, 1554)
-        y = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if x.distance_to(y) <= DETECT_RADIUS and self.game.reboot_wifi_task_play_count == 1:
-            self.game.map_img.blit(self.wifi_highlight_img, (3700, 1554))
-        else:
-            self.game.map_img.blit(self.wifi_img, (3699, 1553))
-        if self.game.reboot_wifi_task_play_count !=1:
-            self.game.map_img.blit(self.wifi_connected_img, (3699, 1553))
-
-        """Task - Fix Electricity Wires Glow object"""
-        x = pygame.Vector2(3166, 1846)
-        y = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if x.distance_to(y) <= DETECT_RADIUS and self.game.electricity_wire_task_play_count == 1:
-            self.game.map_img.blit(self.electricity_wire_switch_highlight_img, (3166, 1846))
-        else:
-            self.game.map_img.blit(self.electricity_wire_switch_img, (3166, 1846))
-        if self.game.electricity_wire_task_play_count !=1:
-            self.game.map_img.blit(self.electricity_wire_switch_connected_img, (3166, 1846))
-
-        """View Security Room Monitor Glow object"""
-        sec_rm = pygame.Vector2(1756, 1056)
-        plyrposs = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if sec_rm.distance_to(plyrposs) <= VIEW_SECURITY_MONITOR_RADIUS:
-            self.game.map_img.blit(self.view_security_monitor_highlight_img, (1756, 1062))
-        else:
-            self.game.map_img.blit(self.view_security_monitor_img, (1756, 1056))
-
-        """Divert Power to Reactor Glow object"""
-        pwr_rec_rm = pygame.Vector2(1031, 1216)
-        plyrposs = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if pwr_rec_rm.distance_to(plyrposs) <= DETECT_RADIUS:
-            self.game.map_img.blit(self.divert_power_to_reactor_highlight_img, (1031, 1213))
-        else:
-            self.game.map_img.blit(self.divert_power_to_reactor_img, (1031, 1213))
-        if self.game.divert_power_to_reactor_task_play_count !=1:
-            self.game.map_img.blit(self.divert_power_to_reactor_diverted_img, (1031, 1213))
-
-        """Task - Storage Gas Can Glow object"""
-        x = pygame.Vector2(3056, 2443)
-        y = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if x.distance_to(y) <= DETECT_RADIUS and self.game.fuel_engine_task_play_count == 1:
-            self.game.map_img.blit(self.gas_can_highlight_img, (3056, 2443))
-        else:
-            self.game.map_img.blit(self.gas_can_img, (3056, 2443))
-
-        """Task - Fuel Engine Glow object"""
-        x = pygame.Vector2(1226, 2300)
-        y = pygame.Vector2(self.game.player.pos.x, self.game.player.pos.y)
-        if x.distance_to(y) <= DETECT_RADIUS and self.game.fuel_engine_task_play_count ==1:
-            self.game.map_img.blit(self.fuel_engine_hoze_highlight_img, (1226, 2300))
-        else:
-            self.game.map_img.blit(self.fuel_engine_hoze_img, (1226, 2300))
-
+    # Glow objects: the task objects drawn over the map, highlighted when the player is in range.
+    # Each one is composited on its own surface that is rebuilt only when its state flips,
+    # so the map itself is never drawn on.
+    def create_glow_objects(self):
+        g = self.game
+        return [
+            # Cafeteria computer only glows in freeplay
+            GlowObject((3060, 385), 400, (self.cafeteria_comp_img, (3062, 387)),
+                       (self.cafeteria_comp_highlighted_img, (3062, 387)),
+                       active=lambda: g.gamemode == "Freeplay"),
+            GlowObject((3284, 669), DETECT_RADIUS, (self.emergency_button_img, (3284, 669)),
+                       (self.emergency_button_highlighted_img, (3284, 669))),
+            # Task - Clear Asteroid
+            GlowObject((4513, 450), DETECT_RADIUS, (self.nav_img, (4513, 452)),
+                       (self.nav_highlighted_img, (4513, 452)),
+                       active=lambda: g.clear_asteroid_task_play_count == 1),
+            # Task - Turn On Reactor
+            GlowObject((889, 999), DETECT_RADIUS, (self.reactor_btn_img, (889, 996)),
+                       (self.reactor_highlight_btn_img, (889, 996))),
+            # Task - Turn On Lower Engine
+            GlowObject((1127, 2318), DETECT_RADIUS, (self.lower_engine_img, (1127, 2318)),
+                       (self.lower_highlight_engine_img, (1127, 2318))),
+            # Task - Align Engine Output
+            GlowObject((1117, 837), DETECT_RADIUS, (self.upper_engine_img, (1117, 837)),
+                       (self.upper_engine_highlight_img, (1117, 837)),
+                       active=lambda: g.align_engine_output_task_play_count == 1),
+            # Task - Stabilize Navigation
+            GlowObject((5610, 1290), DETECT_RADIUS, (self.navigation_img, (5610, 1290)),
+                       (self.navigation_highlight_img, (5610, 1290)),
+                       active=lambda: g.stabilize_task_play_count == 1),
+            # Task - Turn On Generator
+            GlowObject((2472, 1721), DETECT_RADIUS, (self.generator_btn_img, (2472, 1721)),
+                       (self.generator_highlight_btn_img, (2472, 1721))),
+            # Task - Admin Control Buttons
+            GlowObject((3817, 1806), DETECT_RADIUS, (self.admin_control_btn1_img, (3815, 1804)),
+                       (self.admin_control_highlight_btn1_img, (3815, 1804))),
+            GlowObject((4070, 1804), DETECT_RADIUS, (self.admin_control_btn2_img, (4068, 1803)),
+                       (self.admin_control_highlight_btn2_img, (4068, 1803))),
+            # Task - Empty the Garbage
+            GlowObject((3940, 321), DETECT_RADIUS, (self.garbage_liver_img, (3940, 321)),
+                       (self.garbage_liver_highlight_img, (3940, 321)),
+                       active=lambda: g.empty_garbage_task_play_count == 1),
+            # Task - Reboot Wifi
+            GlowObject((3700, 1554), DETECT_RADIUS, (self.wifi_img, (3699, 1553)),
+                       (self.wifi_highlight_img, (3700, 1554)),
+                       active=lambda: g.reboot_wifi_task_play_count == 1,
+                       done=(self.wifi_connected_img, (3699, 1553)),
+                       finished=lambda: g.reboot_wifi_task_play_count != 1),
+            # Task - Fix Electricity Wires
+            GlowObject((3166, 1846), DETECT_RADIUS, (self.electricity_wire_switch_img, (3166, 1846)),
+                       (self.electricity_wire_switch_highlight_img, (3166, 1846)),
+                       active=lambda: g.electricity_wire_task_play_count == 1,
+                       done=(self.electricity_wire_switch_connected_img, (3166, 1846)),
+                       finished=lambda: g.electricity_wire_task_play_count != 1),
+            # View Security Room Monitor
+            GlowObject((1756, 1056), VIEW_SECURITY_MONITOR_RADIUS, (self.view_security_monitor_img, (1756, 1056)),
+                       (self.view_security_monitor_highlight_img, (1756, 1062))),
+            # Divert Power to Reactor
+            GlowObject((1031, 1216), DETECT_RADIUS, (self.divert_power_to_reactor_img, (1031, 1213)),
+                       (self.divert_power_to_reactor_highlight_img, (1031, 1213)),
+                       done=(self.divert_power_to_reactor_diverted_img, (1031, 1213)),
+                       finished=lambda: g.divert_power_to_reactor_task_play_count != 1),
+            # Task - Storage Gas Can
+            GlowObject((3056, 2443), DETECT_RADIUS, (self.gas_can_img, (3056, 2443)),
+                       (self.gas_can_highlight_img, (3056, 2443)),
+                       active=lambda: g.fuel_engine_task_play_count == 1),
+            # Task - Fuel Engine
+            GlowObject((1226, 2300), DETECT_RADIUS, (self.fuel_engine_hoze_img, (1226, 2300)),
+                       (self.fuel_engine_hoze_highlight_img, (1226, 2300)),
+                       active=lambda: g.fuel_engine_task_play_count == 1),
+        ]
+
+    def update_glow_objects(self):
+        x, y = self.game.player.pos.x, self.game.player.pos.y
+        for glow_object in self.glow_objects:
+            glow_object.update(x, y)
+
+    def draw_glow_objects(self, screen, camera):
+        view = camera.view_rect(screen.get_size())
+        for glow_object in self.glow_objects:
+            if glow_object.image is not None and glow_object.rect.colliderect(view):
+                screen.blit(glow_object.image, camera.apply_rect(glow_object.rect))
+
+
+class GlowObject:
+    """One interactive object on the map and the image for its current state.
+
+    State is (highlighted, finished): highlighted while the player is within
+    radius of center and active() holds, finished adds the `done` image on
+    top. The composited image is only rebuilt when the state changes.
+    """
+
+    def __init__(self, center, radius, normal, highlight, active=None, done=None, finished=None):
+        self.center = center
+        self.radius_sq = radius * radius
+        self.normal = normal
+        self.highlight = highlight
+        self.done = done
+        self.active = active
+        self.finished = finished
+        layers = [normal, highlight] + ([done] if done else [])
+        self.rect = pg.Rect(layers[0][1], layers[0][0].get_size()).unionall(
+            [pg.Rect(pos, img.get_size()) for img, pos in layers[1:]])
+        self.state = None
+        self.image = None   # built on the first update()
+
+    def update(self, x, y):
+        highlighted = ((x - self.center[0]) ** 2 + (y - self.center[1]) ** 2 <= self.radius_sq
+                       and (self.active is None or self.active()))
+        finished = self.done is not None and self.finished()
+        if (highlighted, finished) != self.state:
+            self.state = (highlighted, finished)
+            self.redraw()
+
+    def redraw(self):
+        highlighted, finished = self.state
+        layers = [self.highlight if highlighted else self.normal] + ([self.done] if finished else [])
+        self.image = pg.Surface(self.rect.size, pg.SRCALPHA)
+        for img, pos in layers:
+            self.image.blit(img, (pos[0] - self.rect.x, pos[1] - self.rect.y))
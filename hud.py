@@ -0,0 +1,100 @@
+"""
+Retained-mode HUD widgets for the autonomous spectator view.
+
+Each widget owns one pre-composited surface (translucent background plus
+text) and rebuilds it only when its inputs change: the status panel once
+a second or when the followed agent changes, the roster when someone
+dies or the camera target changes, the event log when a line is logged.
+A frame is one blit per widget.
+"""
+
+import pygame as pg
+
+import fonts
+from settings import WHITE
+
+
+class HudWidget:
+    """A cached surface that is rebuilt only when render() gets new inputs."""
+
+    def __init__(self):
+        self.key = None
+        self.surface = None
+        self.rebuilds = 0
+
+    def render(self, *inputs, key=None):
+        """The widget surface for these inputs; key (default: the inputs) decides staleness."""
+        key = inputs if key is None else key
+        if self.surface is None or key != self.key:
+            self.key = key
+            self.surface = self.build(*inputs)
+            self.rebuilds += 1
+        return self.surface
+
+    def build(self, *inputs) -> pg.Surface:
+        raise NotImplementedError
+
+    @staticmethod
+    def background(size, alpha):
+        surface = pg.Surface(size, pg.SRCALPHA)
+        surface.fill((0, 0, 0, alpha))
+        return surface
+
+
+class StatusPanel(HudWidget):
+    """Mode banner, alive count, match time, followed agent and kill cooldown."""
+
+    SIZE = (360, 125)
+
+    def __init__(self, font, font_sm):
+        super().__init__()
+        self.font = font
+        self.font_sm = font_sm
+
+    def build(self, alive, total, secs, target, role, kill_cd):
+        panel = self.background(self.SIZE, 160)
+        panel.blit(fonts.render(self.font, "AUTONOMOUS AGENT MODE", True, (255, 200, 50)), (10, 5))
+        panel.blit(fonts.render(self.font_sm, f"Alive: {alive}/{total}", True, WHITE), (10, 35))
+        panel.blit(fonts.render(self.font_sm, f"Time: {secs // 60}:{secs % 60:02d}", True, WHITE), (190, 35))
+        clr = (255, 80, 80) if role == "IMPOSTER" else (100, 255, 100)
+        panel.blit(fonts.render(self.font_sm, f"Following: {target} ({role})", True, clr), (10, 60))
+        if kill_cd is not None:
+            panel.blit(fonts.render(self.font_sm, f"Kill CD: {kill_cd}s", True, (255, 100, 100)), (10, 83))
+        panel.blit(fonts.render(self.font_sm, "TAB=cycle camera  ESC=quit", True, (150, 150, 150)), (10, 100))
+        return panel
+
+
+class Roster(HudWidget):
+    """One line per agent: (label, colour) rows."""
+
+    WIDTH = 170
+    ROW = 22
+
+    def __init__(self, font_sm):
+        super().__init__()
+        self.font_sm = font_sm
+
+    def build(self, rows):
+        roster = self.background((self.WIDTH, self.ROW * len(rows) + 10), 140)
+        for i, (label, colour) in enumerate(rows):
+            roster.blit(fonts.render(self.font_sm, label, True, colour), (5, 5 + i * self.ROW))
+        return roster
+
+
+class EventLog(HudWidget):
+    """The last few log lines; rebuilt when the log's version counter moves."""
+
+    WIDTH = 550
+    ROW = 20
+    LINES = 6
+
+    def __init__(self, font_sm):
+        super().__init__()
+        self.font_sm = font_sm
+
+    def build(self, messages):
+        messages = messages[-self.LINES:]
+        log_bg = self.background((self.WIDTH, self.ROW * len(messages) + 10), 140)
+        for i, msg in enumerate(messages):
+            log_bg.blit(fonts.render(self.font_sm, msg, True, (220, 220, 220)), (5, 5 + i * self.ROW))
+        return log_bg
@@ -8,6 +8,11 @@ Every character you see is an autonomous agent.
 
 Usage:
     python main_autonomous.py
+    python main_autonomous.py --headless   # no window, no frame cap; one match, then exit
+    python main_autonomous.py --seed 42    # reproduce a match (fixed 1/FPS step)
+    python main_autonomous.py --record match.msr   # then: python replay.py view match.msr
+    python main_autonomous.py --capture            # frames to shared memory (frame_capture.py)
+    python main_autonomous.py --stream 8080        # + MJPEG at http://localhost:8080/
 
 Controls (spectator):
     TAB   — cycle camera between alive agents
@@ -16,20 +21,82 @@ Controls (spectator):
     SPACE — restart (on game-over screen)
 """
 
-from autonomous_game import AutonomousGame
+import argparse
+import os
+import time
 
 
 def main():
+    parser = argparse.ArgumentParser(description="MonadSus autonomous agent simulation")
+    parser.add_argument("--headless", action="store_true",
+                        help="run one match without a window or frame cap and exit")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="match seed; the same seed replays the same match (implies a fixed time step)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="write a replay of the match to PATH (a restart overwrites it)")
+    parser.add_argument("--capture", metavar="NAME", nargs="?", const="monadsus_frames",
+                        default=os.environ.get("MONAD_CAPTURE") or None,
+                        help="copy every drawn frame into the shared-memory ring NAME "
+                             "(default monadsus_frames; env MONAD_CAPTURE)")
+    parser.add_argument("--stream", metavar="PORT", type=int, nargs="?", const=8080, default=None,
+                        help="serve the view as MJPEG over HTTP on PORT (default 8080; implies --capture)")
+    parser.add_argument("--stream-fps", type=float, default=15)
+    parser.add_argument("--stream-size", metavar="WxH", default=None, help="stream resolution (default: the game's)")
+    args = parser.parse_args()
+    if args.stream and not args.capture:
+        args.capture = "monadsus_frames"
+
+    if args.headless:
+        # before pygame is imported: menu.py initialises the mixer at import
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from autonomous_game import AutonomousGame
+
     print("\n" + "=" * 60)
     print("  MonadSus — Autonomous Agent Simulation")
     print("  Every player is an AI agent. No humans are playing.")
     print("=" * 60 + "\n")
 
-    while True:
-        game = AutonomousGame()
-        restart = game.run()
-        if not restart:
-            break
+    if args.headless:
+        if args.capture:
+            print("[HEADLESS] nothing is drawn headless: --capture / --stream ignored")
+        game = AutonomousGame(headless=True, seed=args.seed, replay_path=args.record)
+        start = time.perf_counter()
+        game.run()
+        print(f"[HEADLESS] {game.winner} won after {game.tick} ticks "
+              f"({game.tick * game.game.dt:.0f}s game time) in {time.perf_counter() - start:.1f}s")
+        return
+
+    capture = None
+    if args.capture:
+        from frame_capture import FrameRingWriter
+        from settings import WIDTH, HEIGHT
+        capture = FrameRingWriter((WIDTH, HEIGHT), name=args.capture)
+        print(f"[CAPTURE] frames -> shared memory '{capture.name}' "
+              f"({WIDTH}x{HEIGHT}, {capture.slots} slots)")
+    stream = None
+    if args.stream and capture:
+        # its own process: JPEG encoding never competes with the game tick
+        import multiprocessing
+        import spectator_stream
+        size = spectator_stream.parse_size(args.stream_size) if args.stream_size else None
+        stream = multiprocessing.get_context("spawn").Process(
+            target=spectator_stream.serve, args=(capture.name, args.stream, args.stream_fps, size),
+            daemon=True)
+        stream.start()
+    try:
+        while True:
+            game = AutonomousGame(seed=args.seed, fixed_step=args.seed is not None,
+                                  replay_path=args.record, capture=capture)
+            restart = game.run()
+            if not restart:
+                break
+    finally:
+        if capture:
+            print(f"[CAPTURE] {capture.written} frames captured, {capture.dropped} dropped")
+            capture.close()
+        if stream:
+            stream.terminate()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""
+Incremental Mini-Map for MonadSus.
+
+The mini-map used to be rebuilt every frame: the whole background image
+blitted again, then one square for the local player. MiniMap keeps the
+composited surface between frames and only touches what moved:
+- markers are keyed (a player colour, a body, a sabotage site) and set
+  in world coordinates; setting a marker to where it already is is free
+- refresh() restores the background under each dirty rect (old and new
+  marker positions) and redraws just the markers that overlap it, clipped
+  to that rect so neighbours are not painted over
+- refresh() runs at most once per refresh_ms, whatever the frame rate;
+  the caller can pass its own clock (simulation ms) instead of wall time
+
+Blit MiniMap.surface wherever the old mini-map surface was blitted.
+"""
+
+import pygame as pg
+
+# Marker shapes
+SQUARE = "square"     # players
+CROSS = "cross"       # dead bodies
+RING = "ring"         # sabotage sites
+
+# Size of the full map image the markers are given in (pixels)
+WORLD_SIZE = (5792, 3168)
+
+
+class Marker:
+    __slots__ = ("rect", "colour", "shape")
+
+    def __init__(self, rect, colour, shape):
+        self.rect = rect
+        self.colour = colour
+        self.shape = shape
+
+    def __eq__(self, other):
+        return (isinstance(other, Marker) and self.rect == other.rect
+                and self.colour == other.colour and self.shape == other.shape)
+
+    def draw(self, surface):
+        r = self.rect
+        if self.shape == SQUARE:
+            # fill() slides a rect hanging off the top/left edge back on: clip it first
+            surface.fill(self.colour, r.clip(surface.get_rect()))
+        elif self.shape == CROSS:
+            # thick lines spill past their end points: keep the strokes inside rect
+            width = max(2, r.width // 5)
+            r = r.inflate(-width, -width)
+            pg.draw.line(surface, self.colour, r.topleft, (r.right - 1, r.bottom - 1), width)
+            pg.draw.line(surface, self.colour, (r.left, r.bottom - 1), (r.right - 1, r.top), width)
+        elif self.shape == RING:
+            pg.draw.circle(surface, self.colour, r.center, r.width // 2, max(2, r.width // 6))
+
+
+class MiniMap:
+    """A background image plus keyed markers, redrawn only where they change."""
+
+    def __init__(self, background: pg.Surface, world_size=WORLD_SIZE,
+                 refresh_ms: int = 100, marker_size: int = 15):
+        self.background = background
+        self.surface = background.copy()
+        self.sx = background.get_width() / world_size[0]
+        self.sy = background.get_height() / world_size[1]
+        self.refresh_ms = refresh_ms
+        self.marker_size = marker_size
+        self.markers = {}          # key -> Marker, in draw order
+        self.pending = {}          # key -> Marker, or None to remove
+        self.last_refresh = None
+        self.redraws = 0           # dirty rects repainted so far
+
+    def marker_rect(self, pos, size=None) -> pg.Rect:
+        size = size or self.marker_size
+        rect = pg.Rect(0, 0, size, size)
+        rect.center = (int(pos[0] * self.sx), int(pos[1] * self.sy))
+        return rect
+
+    # ---- markers ----
+
+    def set_marker(self, key, pos, colour, shape=SQUARE, size=None):
+        """Place marker key at world position pos (applied on the next refresh)."""
+        marker = Marker(self.marker_rect(pos, size), pg.Color(colour), shape)
+        current = self.pending[key] if key in self.pending else self.markers.get(key)
+        if marker != current:
+            self.pending[key] = marker
+
+    def remove_marker(self, key):
+        if key in self.markers or self.pending.get(key) is not None:
+            self.pending[key] = None
+
+    def sync(self, markers):
+        """Make the marker set exactly markers: {key: (pos, colour[, shape])}."""
+        for key in list(self.markers) + list(self.pending):
+            if key not in markers:
+                self.remove_marker(key)
+        for key, spec in markers.items():
+            self.set_marker(key, *spec)
+
+    # ---- drawing ----
+
+    def refresh(self, now=None, force=False):
+        """Repaint the dirty regions if refresh_ms has passed; returns the rects repainted."""
+        if now is None:
+            now = pg.time.get_ticks()
+        if not force and self.last_refresh is not None and now - self.last_refresh < self.refresh_ms:
+            return []
+        self.last_refresh = now
+        if not self.pending:
+            return []
+
+        dirty = []
+        for key, marker in self.pending.items():
+            old = self.markers.get(key)
+            if marker is None:
+                self.markers.pop(key, None)
+            else:
+                self.markers[key] = marker      # an existing key keeps its draw order
+            for rect in (old and old.rect, marker and marker.rect):
+                if rect is None:
+                    continue
+                # moves are usually a few pixels: repaint old+new as one rect
+                hit = rect.collidelist(dirty)
+                if hit == -1:
+                    dirty.append(rect.copy())
+                else:
+                    dirty[hit].union_ip(rect)
+        self.pending.clear()
+
+        surface = self.surface
+        bounds = surface.get_rect()
+        for rect in dirty:
+            # an area rect hanging off the surface would shift the background blit
+            rect = rect.clip(bounds)
+            if not rect:
+                continue
+            surface.set_clip(rect)
+            surface.fill((0, 0, 0, 0))          # the background may be translucent
+            surface.blit(self.background, rect, rect)
+            for marker in self.markers.values():
+                if marker.rect.colliderect(rect):
+                    marker.draw(surface)
+        surface.set_clip(None)
+        self.redraws += len(dirty)
+        return dirty
+
+    def clear(self):
+        """Drop every marker and restore the plain background."""
+        self.markers.clear()
+        self.pending.clear()
+        self.surface.fill((0, 0, 0, 0))
+        self.surface.blit(self.background, (0, 0))
+        self.last_refresh = None
@@ -0,0 +1,364 @@
+"""
+Network Session Journal for MonadSus.
+
+Records the raw traffic of the multiplayer server (server.py) into a compact,
+timestamped binary file and re-drives it later:
+- replay-server: reopens every recorded client connection against a live
+  server and re-sends its inbound messages with the original timing.
+- replay-client: stands in for the server on the game port and feeds a
+  connecting client the recorded outbound snapshots.
+
+Both replays run at recorded speed (--speed 1), scaled, or as fast as
+possible (--speed 0), which makes a journal usable both for reproducing
+desyncs and for benchmarking protocol changes against real traffic.
+
+Usage:
+    SERVER_JOURNAL=session.msj python server.py
+    python netjournal.py info session.msj
+    python netjournal.py replay-server session.msj --host 127.0.0.1 --speed 0
+    python netjournal.py replay-client session.msj --speed 1
+"""
+
+import argparse
+import pickle
+import selectors
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+
+# ---------------------------------------------------------------------------
+# File Format
+# ---------------------------------------------------------------------------
+#
+# header : magic(4s) version(u16) wall-clock start(f64)
+# record : delta_us(u32) kind(u8) conn_id(u32) length(u32) payload(length)
+#
+# delta_us is the time since the previous record; conn_id is the player id
+# the server assigned to the connection (BROADCAST for snapshots that went
+# to every client).
+
+MAGIC = b"MSNJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHd")
+RECORD = struct.Struct("<IBII")
+
+INBOUND = 0    # client -> server message
+OUTBOUND = 1   # server -> client message (snapshots, id updates)
+ACCEPT = 2     # new connection; payload is the 'id update' sent to it
+CLOSE = 3      # connection closed by the client
+
+KIND_NAMES = {INBOUND: "inbound", OUTBOUND: "outbound", ACCEPT: "accept", CLOSE: "close"}
+
+BROADCAST = 0
+GAME_PORT = 4321
+BUFFERSIZE = 8192
+
+
+@dataclass
+class JournalRecord:
+    t: float          # seconds since the journal started
+    kind: int
+    conn_id: int
+    payload: bytes
+
+
+# ---------------------------------------------------------------------------
+# Writer / Reader
+# ---------------------------------------------------------------------------
+
+class JournalWriter:
+    """Appends records to a journal file. Flushes at most once per interval."""
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._fh = open(path, "wb")
+        self._fh.write(HEADER.pack(MAGIC, VERSION, time.time()))
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self._written_us = 0
+        self.records = 0
+
+    def record(self, kind: int, conn_id: int, payload: bytes = b""):
+        if self._fh is None:
+            return
+        now = time.monotonic()
+        # Deltas are computed against the accumulated total so rounding to
+        # whole microseconds never drifts over a long session.
+        elapsed_us = int((now - self._start) * 1_000_000)
+        delta = min(max(elapsed_us - self._written_us, 0), 0xFFFFFFFF)
+        self._written_us += delta
+        self._fh.write(RECORD.pack(delta, kind, conn_id, len(payload)))
+        self._fh.write(payload)
+        self.records += 1
+        if now - self._last_flush >= self.flush_interval:
+            self._fh.flush()
+            self._last_flush = now
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class JournalReader:
+    """Iterates over the records of a journal file.
+
+    A truncated trailing record (server killed mid-write) ends iteration
+    instead of raising.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            head = fh.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise ValueError(f"{path}: not a session journal (too short)")
+        magic, version, started = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a session journal (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported journal version {version}")
+        self.started = started
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        t_us = 0
+        with open(self.path, "rb") as fh:
+            fh.seek(HEADER.size)
+            while True:
+                head = fh.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    return
+                delta, kind, conn_id, length = RECORD.unpack(head)
+                payload = fh.read(length)
+                if len(payload) < length:
+                    return
+                t_us += delta
+                yield JournalRecord(t_us / 1_000_000, kind, conn_id, payload)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class _Pacer:
+    """Waits until a record's timestamp comes due; speed <= 0 never waits.
+
+    While waiting it services `sel` so replayed sockets keep draining
+    whatever the other side sends back.
+    """
+
+    def __init__(self, speed: float, sel: selectors.BaseSelector, on_readable):
+        self.speed = speed
+        self.sel = sel
+        self.on_readable = on_readable
+        self.t0 = time.monotonic()
+
+    def wait_until(self, t: float):
+        due = self.t0 + t / self.speed if self.speed > 0 else 0.0
+        while True:
+            timeout = max(due - time.monotonic(), 0.0)
+            self.poll(timeout)
+            if timeout <= 0:
+                return
+
+    def poll(self, timeout: float = 0.0):
+        if not self.sel.get_map():
+            if timeout > 0:
+                time.sleep(timeout)
+            return
+        for key, _ in self.sel.select(timeout):
+            self.on_readable(key.fileobj)
+
+
+def _remap_ids(payload: bytes, id_map: Dict[int, int]) -> bytes:
+    """Rewrite recorded player ids in a 'position update' to the live ones."""
+    try:
+        arr = pickle.loads(payload)
+    except Exception:
+        return payload
+    if not isinstance(arr, list) or len(arr) < 23 or arr[0] != 'position update':
+        return payload
+    for idx in (1, 15, 22):  # player_id, victim_id, victim_id_report
+        if arr[idx] in id_map:
+            arr[idx] = id_map[arr[idx]]
+    return pickle.dumps(arr)
+
+
+def replay_server(path: str, host: str, port: int = GAME_PORT, speed: float = 1.0) -> dict:
+    """Re-drive a live server with the inbound traffic of a journal."""
+    sel = selectors.DefaultSelector()
+    socks: Dict[int, socket.socket] = {}
+    id_map: Dict[int, int] = {}
+    stats = {"sent_msgs": 0, "sent_bytes": 0, "recv_bytes": 0, "connections": 0}
+
+    def on_readable(sock):
+        try:
+            data = sock.recv(BUFFERSIZE)
+        except OSError:
+            data = b""
+        if data:
+            stats["recv_bytes"] += len(data)
+        else:
+            sel.unregister(sock)
+
+    def connect(conn_id: int):
+        sock = socket.create_connection((host, port))
+        reply = sock.recv(BUFFERSIZE)
+        stats["recv_bytes"] += len(reply)
+        try:
+            msg = pickle.loads(reply)
+            if msg[0] == 'id update':
+                id_map[conn_id] = msg[1]
+        except Exception:
+            pass
+        sel.register(sock, selectors.EVENT_READ)
+        socks[conn_id] = sock
+        stats["connections"] += 1
+
+    pacer = _Pacer(speed, sel, on_readable)
+    start = time.monotonic()
+    for rec in JournalReader(path):
+        if rec.kind not in (INBOUND, ACCEPT, CLOSE):
+            continue
+        pacer.wait_until(rec.t)
+        if rec.kind == ACCEPT:
+            connect(rec.conn_id)
+        elif rec.kind == INBOUND:
+            if rec.conn_id not in socks:
+                connect(rec.conn_id)
+            data = _remap_ids(rec.payload, id_map)
+            socks[rec.conn_id].sendall(data)
+            stats["sent_msgs"] += 1
+            stats["sent_bytes"] += len(data)
+        elif rec.kind == CLOSE and rec.conn_id in socks:
+            sock = socks.pop(rec.conn_id)
+            try:
+                sel.unregister(sock)
+            except KeyError:
+                pass
+            sock.close()
+    pacer.poll(0.1)
+    for sock in socks.values():
+        sock.close()
+    stats["elapsed"] = time.monotonic() - start
+    return stats
+
+
+def replay_client(path: str, port: int = GAME_PORT, speed: float = 1.0,
+                  as_player: Optional[int] = None) -> dict:
+    """Serve the recorded outbound traffic to the first client that connects.
+
+    The client is handed the 'id update' of `as_player` (default: the first
+    recorded connection) so it sees the session from that player's seat.
+    """
+    records = list(JournalReader(path))
+    accepts = [r for r in records if r.kind == ACCEPT]
+    seat = as_player if as_player is not None else (accepts[0].conn_id if accepts else None)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('', port))
+    listener.listen(1)
+    print(f"  [JOURNAL] Waiting for a client on port {port}...")
+    conn, addr = listener.accept()
+    listener.close()
+    print(f"  [JOURNAL] Client connected from {addr[0]}:{addr[1]}")
+
+    sel = selectors.DefaultSelector()
+    stats = {"sent_msgs": 0, "sent_bytes": 0, "recv_bytes": 0}
+
+    def on_readable(sock):
+        try:
+            data = sock.recv(BUFFERSIZE)
+        except OSError:
+            data = b""
+        if data:
+            stats["recv_bytes"] += len(data)
+        else:
+            sel.unregister(sock)
+
+    sel.register(conn, selectors.EVENT_READ)
+    pacer = _Pacer(speed, sel, on_readable)
+    start = time.monotonic()
+    for rec in records:
+        if rec.kind == ACCEPT and rec.conn_id == seat:
+            data = rec.payload
+        elif rec.kind == OUTBOUND and rec.conn_id in (BROADCAST, seat):
+            data = rec.payload
+        else:
+            continue
+        pacer.wait_until(rec.t)
+        try:
+            conn.sendall(data)
+        except OSError:
+            break
+        stats["sent_msgs"] += 1
+        stats["sent_bytes"] += len(data)
+    conn.close()
+    stats["elapsed"] = time.monotonic() - start
+    return stats
+
+
+def summarize(path: str) -> dict:
+    """Per-kind message/byte counts and the duration of a journal."""
+    reader = JournalReader(path)
+    counts = {name: [0, 0] for name in KIND_NAMES.values()}
+    conns = set()
+    duration = 0.0
+    for rec in reader:
+        entry = counts.setdefault(KIND_NAMES.get(rec.kind, str(rec.kind)), [0, 0])
+        entry[0] += 1
+        entry[1] += len(rec.payload)
+        if rec.conn_id != BROADCAST:
+            conns.add(rec.conn_id)
+        duration = rec.t
+    return {"started": reader.started, "duration": duration,
+            "connections": len(conns), "kinds": counts}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _print_stats(stats: dict):
+    elapsed = max(stats["elapsed"], 1e-9)
+    print(f"  [JOURNAL] {stats['sent_msgs']} msgs / {stats['sent_bytes']} bytes sent, "
+          f"{stats['recv_bytes']} bytes received in {elapsed:.2f}s "
+          f"({stats['sent_msgs'] / elapsed:.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or replay a server session journal.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_info = sub.add_parser("info", help="summarize a journal")
+    p_info.add_argument("journal")
+
+    p_srv = sub.add_parser("replay-server", help="re-send recorded client traffic to a server")
+    p_srv.add_argument("journal")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--port", type=int, default=GAME_PORT)
+    p_srv.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 0 = as fast as possible")
+
+    p_cli = sub.add_parser("replay-client", help="serve recorded snapshots to a client")
+    p_cli.add_argument("journal")
+    p_cli.add_argument("--port", type=int, default=GAME_PORT)
+    p_cli.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 0 = as fast as possible")
+    p_cli.add_argument("--as-player", type=int, default=None, help="recorded player id to replay as")
+
+    args = parser.parse_args()
+    if args.command == "info":
+        info = summarize(args.journal)
+        print(f"  [JOURNAL] {args.journal}: {info['duration']:.2f}s, "
+              f"{info['connections']} connections, started "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['started']))}")
+        for name, (count, size) in info["kinds"].items():
+            print(f"    {name:<9} {count:>8} msgs {size:>12} bytes")
+    elif args.command == "replay-server":
+        _print_stats(replay_server(args.journal, args.host, args.port, args.speed))
+    else:
+        _print_stats(replay_client(args.journal, args.port, args.speed, args.as_player))
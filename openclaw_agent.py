@@ -42,10 +42,13 @@ class OpenClawAgentController(AgentController):
     - Natural language dialogue generation
     """
     
-    def __init__(self, agent_id: str, role: str = "CREW", personality_type: str = "balanced"):
+    def __init__(self, agent_id: str, role: str = "CREW", personality_type: str = "balanced",
+                 rng: Optional[random.Random] = None):
         self.agent_id = agent_id
         self.role = role
         self.personality_type = personality_type
+        # random.Random stream for the fallback heuristics (default: the shared random module)
+        self.rng = rng if rng is not None else random
         
         # LLM configuration
         self.llm_provider = os.environ.get("LLM_PROVIDER", "openai")
@@ -136,7 +139,7 @@ class OpenClawAgentController(AgentController):
         
         # Cache action
         self.last_action = action
-        self.action_cooldown = random.randint(5, 15)  # Wait 5-15 ticks
+        self.action_cooldown = self.rng.randint(5, 15)  # Wait 5-15 ticks
         
         return action
     
@@ -169,12 +172,12 @@ class OpenClawAgentController(AgentController):
         # Fallback: Simple heuristics
         if self.role == "IMPOSTER" and observation.get("can_kill"):
             nearby = observation.get("nearby_agents", [])
-            if nearby and random.random() > 0.5:
-                target = random.choice(nearby)
+            if nearby and self.rng.random() > 0.5:
+                target = self.rng.choice(nearby)
                 return {"type": "KILL", "data": target["agent"]}
         
         # Random movement
-        return {"type": "MOVE", "data": random.choice(["UP", "DOWN", "LEFT", "RIGHT"])}
+        return {"type": "MOVE", "data": self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])}
     
     def _get_dialogue_action(self, observation: Dict[str, Any]) -> Dict[str, str]:
         """Generate dialogue during meeting."""
@@ -196,11 +199,11 @@ class OpenClawAgentController(AgentController):
             return {"type": "SPEAK", "data": "I don't know who it is..."}
         
         if self.role == "IMPOSTER":
-            target = random.choice(alive)
+            target = self.rng.choice(alive)
             return {"type": "SPEAK", "data": f"I think {target} is suspicious!"}
         else:
-            if random.random() > 0.5:
-                target = random.choice(alive)
+            if self.rng.random() > 0.5:
+                target = self.rng.choice(alive)
                 return {"type": "SPEAK", "data": f"I saw {target} acting weird."}
             else:
                 return {"type": "SPEAK", "data": "Not sure, maybe we should skip."}
@@ -221,8 +224,8 @@ class OpenClawAgentController(AgentController):
         
         # Fallback: Random vote or skip
         alive = observation.get("alive_agents", [])
-        if alive and random.random() > 0.3:
-            target = random.choice(alive)
+        if alive and self.rng.random() > 0.3:
+            target = self.rng.choice(alive)
             return {"type": "VOTE", "data": target}
         else:
             return {"type": "VOTE", "data": None}  # Skip
@@ -0,0 +1,170 @@
+"""
+Per-Phase Frame Profiler for MonadSus.
+
+The window caption FPS says a frame was slow, not why. FrameProfiler
+times named phases of every frame (events, update, agent decisions,
+network I/O, draw split into map / sprites / fog / HUD, flip) and keeps
+the last `window` frames of each, so the overlay can show rolling
+p50/p95/p99 per phase against the 16.6 ms budget.
+
+Usage in a main loop:
+
+    with prof.phase("idle"):
+        dt = clock.tick(FPS)
+    prof.frame()                      # closes the previous frame
+    with prof.phase("events"):
+        ...
+    prof.start("net") ... prof.stop("net")    # for long blocks
+
+A phase may run several times in one frame (one agent decision per
+agent); its times are summed. Phases that did not run in a frame count
+as 0 ms for that frame. "frame" is the busy time: wall time between two
+frame() calls minus "idle" (the clock.tick sleep).
+"""
+
+from collections import deque
+from time import perf_counter
+
+import pygame as pg
+
+import fonts
+
+# Overlay rows, in this order; any other phase is listed after them
+PHASES = ["frame", "events", "update", "agents", "net",
+          "draw", "draw.map", "draw.sprites", "draw.fog", "draw.hud", "capture", "flip"]
+
+OVERLAY_REFRESH = 0.25     # seconds between overlay redraws
+OVERLAY_FONT = (None, 18)                  # pygame's default font
+OVERLAY_WIDTH = 260
+OVERLAY_COLUMNS = (145, 200, 255)          # right edges of p50 / p95 / p99
+
+
+class _Phase:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.start(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler.stop(self.name)
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings (ms) with a percentile overlay."""
+
+    def __init__(self, window: int = 300, budget_ms: float = 1000 / 60):
+        self.window = window
+        self.budget_ms = budget_ms
+        self.visible = False                 # overlay toggle (F3)
+        self.samples = {}                    # phase -> deque of ms, one per frame
+        self._current = {}                   # phase -> ms so far this frame
+        self._open = {}                      # phase -> perf_counter() at start
+        self._frame_start = None
+        self._overlay = None
+        self._overlay_time = 0.0
+
+    # ---- timing ----
+
+    def start(self, name):
+        self._open[name] = perf_counter()
+
+    def stop(self, name):
+        t0 = self._open.pop(name, None)
+        if t0 is not None:
+            self._current[name] = self._current.get(name, 0.0) + (perf_counter() - t0) * 1000
+
+    def phase(self, name) -> _Phase:
+        """Context manager timing the block as phase name."""
+        return _Phase(self, name)
+
+    def frame(self):
+        """Close the running frame (if any) and start the next."""
+        now = perf_counter()
+        if self._frame_start is not None:
+            current = self._current
+            current["frame"] = (now - self._frame_start) * 1000 - current.get("idle", 0.0)
+            for name in current:
+                if name not in self.samples:
+                    self.samples[name] = deque(maxlen=self.window)
+            for name, samples in self.samples.items():
+                samples.append(current.get(name, 0.0))
+        self._current = {}
+        self._frame_start = now
+
+    # ---- statistics ----
+
+    def percentiles(self, name, qs=(50, 95, 99)):
+        """Nearest-rank percentiles of phase name over the window (ms)."""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return tuple(0.0 for _ in qs)
+        n = len(samples)
+        return tuple(samples[min(n - 1, max(0, -(-q * n // 100) - 1))] for q in qs)
+
+    def report(self):
+        """{phase: (p50, p95, p99)} for every phase seen, overlay order first."""
+        names = [n for n in PHASES if n in self.samples]
+        names += [n for n in self.samples if n not in PHASES and n != "idle"]
+        return {name: self.percentiles(name) for name in names}
+
+    def reset(self):
+        self.samples.clear()
+        self._current = {}
+        self._open.clear()
+        self._frame_start = None
+        self._overlay = None
+
+    # ---- overlay ----
+
+    def build_overlay(self, font) -> pg.Surface:
+        # plain font.render: these numbers change every refresh and would
+        # only churn the shared text cache
+        row_h = font.get_linesize()
+        rows = self.report()
+        panel = pg.Surface((OVERLAY_WIDTH, row_h * (len(rows) + 1) + 10), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        header = ("phase (ms)", "p50", "p95", "p99")
+        for i, (name, values) in enumerate([(header[0], header[1:])] + list(rows.items())):
+            y = 5 + i * row_h
+            colour = (200, 200, 200)
+            if i:
+                # bar: p95 as a share of the frame budget
+                share = min(1.0, values[1] / self.budget_ms)
+                bar = (255, 80, 80) if values[1] > self.budget_ms else (255, 200, 50) if share > 0.5 else (100, 255, 100)
+                pg.draw.rect(panel, bar + (110,), (0, y + 1, max(1, int(OVERLAY_WIDTH * share)), row_h - 2))
+                colour = (255, 255, 255)
+                values = [f"{v:.2f}" for v in values]
+            panel.blit(font.render(name, True, colour), (5, y))
+            for x, value in zip(OVERLAY_COLUMNS, values):
+                text = font.render(value, True, colour)
+                panel.blit(text, text.get_rect(topright=(x, y)))
+        return panel
+
+    def draw(self, screen, **anchor):
+        """Blit the overlay (if visible); anchor is a Rect keyword, default topleft=(10, 10)."""
+        if not self.visible:
+            return
+        now = perf_counter()
+        if self._overlay is None or now - self._overlay_time >= OVERLAY_REFRESH:
+            self._overlay = self.build_overlay(fonts.get_font(*OVERLAY_FONT))
+            self._overlay_time = now
+        screen.blit(self._overlay, self._overlay.get_rect(**(anchor or {"topleft": (10, 10)})))
+
+
+if __name__ == "__main__":
+    import random
+
+    prof = FrameProfiler(window=100)
+    for _ in range(101):
+        prof.frame()
+        with prof.phase("update"):
+            pass
+        prof._current["draw"] = random.uniform(1, 2)
+    assert len(prof.samples["draw"]) == 100 and len(prof.samples["update"]) == 100
+    p50, p95, p99 = prof.percentiles("draw")
+    assert 1 <= p50 <= p95 <= p99 <= 2, (p50, p95, p99)
+    print("profiler self-check ok:", prof.report())
@@ -0,0 +1,451 @@
+"""
+Match Replay Recording and Viewer for MonadSus autonomous mode.
+
+EventLogger keeps the story of a match (kills, votes, ejections); a replay
+keeps the picture. AutonomousGame(replay_path=...) records every tick:
+each agent's position, facing / animation frame and state, plus the HUD
+log lines, so the match can be rewatched, scrubbed and fast-forwarded
+without re-running agents or physics.
+
+Positions use snapshot_codec's 13.3 fixed point and its facing/frame
+byte. Ticks are stored in blocks of KEYFRAME_INTERVAL ticks; inside a
+block each value is a column (all ticks of agent 0's x, then its y, ...)
+that starts with the absolute value (the keyframe) followed by
+zigzag-varint deltas. An agent standing still costs one byte per value
+per tick, and seeking only ever decodes one block.
+
+Usage:
+    python main_autonomous.py --headless --seed 42 --record match.msr
+    python replay.py info match.msr
+    python replay.py view match.msr --speed 4
+
+Viewer keys: SPACE pause, LEFT/RIGHT seek 5 s (SHIFT: 30 s), UP/DOWN
+speed x2 / /2, TAB / 1-9 follow an agent, HOME restart, ESC quit; click
+the timeline to jump.
+"""
+
+import argparse
+import bisect
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import snapshot_codec
+from snapshot_codec import (FACING_DEAD, FACING_DOWN, FACING_LEFT, FACING_NONE, FACING_RIGHT,
+                            FACING_UP, FRAME_BITS, FRAME_MASK)
+
+
+# ---------------------------------------------------------------------------
+# File Format
+# ---------------------------------------------------------------------------
+#
+# header  : magic(4s) version(u16) fps(u16) seed(u64) keyframe_interval(u16)
+#           agents(u8) imposter(u8, 0xFF = none), then per agent: len(u8) name
+# block   : first_tick(u32) length(u32) payload(length)
+#   payload: n_ticks, n_events, events (tick offset, len, utf-8) ...,
+#            then per agent the x, y and anim columns (all varints)
+# index   : per block first_tick(u32) n_ticks(u32) offset(u64)
+# trailer : index_offset(u64) blocks(u32) magic(4s)
+#
+# A file whose trailer is missing (recorder killed) is still readable:
+# the reader walks the blocks from the start instead.
+
+MAGIC = b"MSRP"
+INDEX_MAGIC = b"MSRX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQHBB")
+BLOCK = struct.Struct("<II")
+INDEX = struct.Struct("<IIQ")
+TRAILER = struct.Struct("<QI4s")
+
+KEYFRAME_INTERVAL = 300     # ticks per block (5 s at 60 FPS)
+NO_IMPOSTER = 0xFF
+
+# Agent facing as recorded by AutonomousGame; None = not drawn (ejected)
+FACINGS = {"LEFT": FACING_LEFT, "RIGHT": FACING_RIGHT, "UP": FACING_UP, "DOWN": FACING_DOWN,
+           "DEAD": FACING_DEAD, None: FACING_NONE}
+FACING_NAMES = {v: k for k, v in FACINGS.items()}
+
+
+def encode_state(facing: Optional[str], frame: int = 0) -> int:
+    """One byte: snapshot_codec facing in the high bits, animation frame in the low."""
+    return (FACINGS[facing] << FRAME_BITS) | (frame & FRAME_MASK)
+
+
+def decode_state(anim: int) -> Tuple[Optional[str], int]:
+    return FACING_NAMES.get(anim >> FRAME_BITS), anim & FRAME_MASK
+
+
+# ---------------------------------------------------------------------------
+# Varints
+# ---------------------------------------------------------------------------
+
+def _put_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(z: int) -> int:
+    return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class ReplayWriter:
+    """Records one frame per tick; writes a block every keyframe_interval ticks."""
+
+    def __init__(self, path: str, agents: List[str], fps: int, seed: int = 0,
+                 imposter: Optional[str] = None, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.path = path
+        self.agents = list(agents)
+        self.keyframe_interval = keyframe_interval
+        self._fh = open(path, "wb")
+        imp = self.agents.index(imposter) if imposter in self.agents else NO_IMPOSTER
+        self._fh.write(HEADER.pack(MAGIC, VERSION, fps, seed & 0xFFFFFFFFFFFFFFFF,
+                                   keyframe_interval, len(self.agents), imp))
+        for name in self.agents:
+            raw = name.encode()
+            self._fh.write(bytes([len(raw)]) + raw)
+        self._index = []
+        self._first_tick = None
+        self._columns = [[] for _ in range(3 * len(self.agents))]
+        self._events = []
+        self._last = None                    # (tick, frame) last recorded
+        self.ticks = 0
+
+    def record(self, tick: int, frame: List[Tuple[float, float, int]]):
+        """frame: (x, y, state byte) per agent, in header order."""
+        if self._fh is None:
+            return
+        if self._first_tick is not None and tick != self._first_tick + len(self._columns[0]):
+            self._flush()                    # ticks skipped: start a new block
+        if self._first_tick is None:
+            self._first_tick = tick
+        columns = self._columns
+        for i, (x, y, anim) in enumerate(frame):
+            qx, qy = snapshot_codec.quantize_position(x, y)
+            columns[3 * i].append(qx)
+            columns[3 * i + 1].append(qy)
+            columns[3 * i + 2].append(anim)
+        self._last = (tick, frame)
+        self.ticks += 1
+        if len(columns[0]) >= self.keyframe_interval:
+            self._flush()
+
+    def event(self, tick: int, text: str):
+        if self._fh is not None:
+            self._events.append((tick, text))
+
+    def _flush(self):
+        if self._first_tick is None:
+            return
+        first, n = self._first_tick, len(self._columns[0])
+        out = bytearray()
+        _put_varint(out, n)
+        _put_varint(out, len(self._events))
+        for tick, text in self._events:
+            raw = text.encode()
+            _put_varint(out, max(tick - first, 0))
+            _put_varint(out, len(raw))
+            out += raw
+        for column in self._columns:
+            prev = column[0]
+            _put_varint(out, prev)
+            for value in column[1:]:
+                _put_varint(out, _zigzag(value - prev))
+                prev = value
+        self._index.append((first, n, self._fh.tell()))
+        self._fh.write(BLOCK.pack(first, len(out)))
+        self._fh.write(out)
+        self._first_tick = None
+        self._columns = [[] for _ in self._columns]
+        self._events = []
+
+    def close(self):
+        if self._fh is None:
+            return
+        if self._events and self._first_tick is None and self._last is not None:
+            # log lines after the last full block: carry the last frame one tick
+            self.record(self._last[0] + 1, self._last[1])
+        self._flush()
+        index_offset = self._fh.tell()
+        for entry in self._index:
+            self._fh.write(INDEX.pack(*entry))
+        self._fh.write(TRAILER.pack(index_offset, len(self._index), INDEX_MAGIC))
+        self._fh.close()
+        self._fh = None
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+class ReplayReader:
+    """Random access to a replay: frame(tick), log(tick)."""
+
+    CACHE_BLOCKS = 4
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._load(fh.read())
+
+    def _load(self, data: bytes):
+        if len(data) < HEADER.size:
+            raise ValueError(f"{self.path}: not a replay (too short)")
+        magic, version, fps, seed, interval, n, imp = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a replay (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: unsupported replay version {version}")
+        self.data = data
+        self.fps, self.seed, self.keyframe_interval = fps, seed, interval
+        pos = HEADER.size
+        self.agents = []
+        for _ in range(n):
+            size = data[pos]
+            self.agents.append(data[pos + 1:pos + 1 + size].decode())
+            pos += 1 + size
+        self.imposter = self.agents[imp] if imp != NO_IMPOSTER else None
+
+        # blocks: (first_tick, n_ticks, offset of the block header)
+        self.blocks = []
+        index_offset, count, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size) \
+            if len(data) >= pos + TRAILER.size else (0, 0, b"")
+        if magic == INDEX_MAGIC:
+            for i in range(count):
+                self.blocks.append(INDEX.unpack_from(data, index_offset + i * INDEX.size))
+        else:
+            while pos + BLOCK.size <= len(data):
+                first, length = BLOCK.unpack_from(data, pos)
+                if pos + BLOCK.size + length > len(data):
+                    break                     # truncated block
+                n_ticks, _ = _get_varint(data, pos + BLOCK.size)
+                self.blocks.append((first, n_ticks, pos))
+                pos += BLOCK.size + length
+        self._starts = [b[0] for b in self.blocks]
+        self.first_tick = self.blocks[0][0] if self.blocks else 0
+        self.last_tick = self.blocks[-1][0] + self.blocks[-1][1] - 1 if self.blocks else 0
+        self._cache: Dict[int, tuple] = {}
+
+        # log lines of every block, for the HUD
+        self.events = []
+        for i in range(len(self.blocks)):
+            self.events.extend(self._decode_events(i)[0])
+        self._event_ticks = [t for t, _ in self.events]
+
+    def _decode_events(self, i: int):
+        first, _, offset = self.blocks[i]
+        pos = offset + BLOCK.size
+        data = self.data
+        n_ticks, pos = _get_varint(data, pos)
+        n_events, pos = _get_varint(data, pos)
+        events = []
+        for _ in range(n_events):
+            dt, pos = _get_varint(data, pos)
+            size, pos = _get_varint(data, pos)
+            events.append((first + dt, data[pos:pos + size].decode()))
+            pos += size
+        return events, n_ticks, pos
+
+    def _decode(self, i: int):
+        """Block i as (frames, first_tick): frames[k] = [(qx, qy, anim)] per agent."""
+        cached = self._cache.get(i)
+        if cached is not None:
+            return cached
+        _, n_ticks, pos = self._decode_events(i)
+        data = self.data
+        columns = []
+        for _ in range(3 * len(self.agents)):
+            value, pos = _get_varint(data, pos)
+            column = [value]
+            for _ in range(n_ticks - 1):
+                z, pos = _get_varint(data, pos)
+                value += _unzigzag(z)
+                column.append(value)
+            columns.append(column)
+        frames = [[(columns[3 * a][k], columns[3 * a + 1][k], columns[3 * a + 2][k])
+                   for a in range(len(self.agents))] for k in range(n_ticks)]
+        if len(self._cache) >= self.CACHE_BLOCKS:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[i] = (frames, self.blocks[i][0])
+        return self._cache[i]
+
+    def frame(self, tick: int) -> List[Tuple[float, float, Optional[str], int]]:
+        """(x, y, facing, frame) per agent at tick (clamped to the recording)."""
+        if not self.blocks:
+            return []
+        tick = min(max(tick, self.first_tick), self.last_tick)
+        i = max(bisect.bisect_right(self._starts, tick) - 1, 0)
+        frames, first = self._decode(i)
+        k = min(tick - first, len(frames) - 1)
+        out = []
+        for qx, qy, anim in frames[k]:
+            x, y = snapshot_codec.dequantize_position(qx, qy)
+            out.append((x, y) + decode_state(anim))
+        return out
+
+    def log(self, tick: int, lines: int = 6) -> Tuple[int, List[str]]:
+        """(number of log lines so far, the last `lines` of them) at tick."""
+        n = bisect.bisect_right(self._event_ticks, tick)
+        return n, [text for _, text in self.events[max(0, n - lines):n]]
+
+
+def summarize(path: str) -> dict:
+    reader = ReplayReader(path)
+    ticks = reader.last_tick - reader.first_tick + 1 if reader.blocks else 0
+    return {"agents": reader.agents, "imposter": reader.imposter, "seed": reader.seed,
+            "fps": reader.fps, "ticks": ticks, "blocks": len(reader.blocks),
+            "events": len(reader.events), "bytes": len(reader.data)}
+
+
+# ---------------------------------------------------------------------------
+# Viewer
+# ---------------------------------------------------------------------------
+
+def view(path: str, speed: float = 1.0):
+    from os import path as osp
+    import pygame as pg
+    import fonts
+    import hud
+    from autonomous_game import COLOR_MAP, build_color_sprites
+    from settings import FONT, WHITE, WIDTH, HEIGHT
+    from tilemap import Camera, ChunkedMap, TiledMap
+
+    reader = ReplayReader(path)
+    if not reader.blocks:
+        print(f"  [REPLAY] {path}: no ticks recorded")
+        return
+    pg.init()
+    screen = pg.display.set_mode((WIDTH, HEIGHT))
+    pg.display.set_caption(f"MonadSus replay — {osp.basename(path)}")
+    clock = pg.time.Clock()
+    tiled = TiledMap(osp.join(osp.dirname(osp.abspath(__file__)), "Assets/Maps/map.tmx"))
+    world = ChunkedMap(tiled)
+    camera = Camera(tiled.width, tiled.height)
+    sprites = {c: {k: [img.convert_alpha() for img in (v if isinstance(v, list) else [v])]
+                   for k, v in images.items()}
+               for c, images in build_color_sprites().items()}
+    font = fonts.get_font(FONT, 16)
+    log_widget = hud.EventLog(font)
+
+    position = float(reader.first_tick)
+    paused = False
+    follow = reader.agents.index(reader.imposter) if reader.imposter else 0
+    timeline = pg.Rect(10, HEIGHT - 22, WIDTH - 20, 12)
+    span = max(reader.last_tick - reader.first_tick, 1)
+    anchor = pg.sprite.Sprite()              # Camera.update() follows a sprite's rect
+    anchor.rect = pg.Rect(0, 0, 0, 0)
+
+    while True:
+        dt = clock.tick(60) / 1000.0
+        for event in pg.event.get():
+            if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                pg.quit()
+                return
+            if event.type == pg.MOUSEBUTTONDOWN and timeline.collidepoint(event.pos):
+                position = reader.first_tick + (event.pos[0] - timeline.x) / timeline.width * span
+            if event.type != pg.KEYDOWN:
+                continue
+            step = reader.fps * (30 if event.mod & pg.KMOD_SHIFT else 5)
+            if event.key == pg.K_SPACE:
+                paused = not paused
+            elif event.key == pg.K_RIGHT:
+                position += step
+            elif event.key == pg.K_LEFT:
+                position -= step
+            elif event.key == pg.K_UP:
+                speed = min(speed * 2, 64.0)
+            elif event.key == pg.K_DOWN:
+                speed = max(speed / 2, 0.125)
+            elif event.key == pg.K_HOME:
+                position = reader.first_tick
+            elif event.key == pg.K_TAB:
+                follow = (follow + 1) % len(reader.agents)
+            elif pg.K_1 <= event.key <= pg.K_9 and event.key - pg.K_1 < len(reader.agents):
+                follow = event.key - pg.K_1
+
+        if not paused:
+            position += speed * reader.fps * dt
+        position = min(max(position, reader.first_tick), reader.last_tick)
+        tick = int(position)
+        frame = reader.frame(tick)
+
+        x, y = frame[follow][:2]
+        anchor.rect.topleft = (int(x), int(y))
+        camera.update(anchor)
+        world.draw(screen, camera)
+        # bodies under the living
+        for layer in ("DEAD", "ALIVE"):
+            for colour, (ex, ey, facing, anim) in zip(reader.agents, frame):
+                if facing is None or (facing == "DEAD") != (layer == "DEAD"):
+                    continue
+                images = sprites[colour]["dead" if facing == "DEAD" else facing.lower()]
+                image = images[anim % len(images)]
+                rect = camera.apply_rect(image.get_rect(topleft=(int(ex), int(ey))))
+                screen.blit(image, rect)
+                if facing != "DEAD":
+                    tag = fonts.render(font, colour, True, COLOR_MAP.get(colour, WHITE))
+                    screen.blit(tag, tag.get_rect(centerx=rect.centerx, bottom=rect.top - 2))
+
+        # HUD: clock, speed, followed agent, log, timeline
+        secs = (tick - reader.first_tick) // reader.fps
+        status = (f"REPLAY  {secs // 60}:{secs % 60:02d}  tick {tick}/{reader.last_tick}  "
+                  f"x{speed:g}{'  PAUSED' if paused else ''}  following {reader.agents[follow]}")
+        screen.blit(fonts.render(font, status, True, (255, 200, 50)), (10, 10))
+        count, lines = reader.log(tick)
+        if lines:
+            log = log_widget.render(lines, key=count)
+            screen.blit(log, (10, timeline.top - log.get_height() - 8))
+        pg.draw.rect(screen, (60, 60, 60), timeline)
+        done = timeline.copy()
+        done.width = int(timeline.width * (tick - reader.first_tick) / span)
+        pg.draw.rect(screen, (255, 200, 50), done)
+        for t, _ in reader.events:
+            mx = timeline.x + int(timeline.width * (t - reader.first_tick) / span)
+            pg.draw.line(screen, WHITE, (mx, timeline.top), (mx, timeline.bottom - 1))
+        pg.display.flip()
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or watch a recorded autonomous match.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_info = sub.add_parser("info", help="summarize a replay")
+    p_info.add_argument("replay")
+
+    p_view = sub.add_parser("view", help="watch a replay")
+    p_view.add_argument("replay")
+    p_view.add_argument("--speed", type=float, default=1.0, help="initial playback speed")
+
+    args = parser.parse_args()
+    if args.command == "info":
+        info = summarize(args.replay)
+        print(f"  [REPLAY] {args.replay}: {info['ticks']} ticks ({info['ticks'] / max(info['fps'], 1):.0f}s), "
+              f"{info['blocks']} blocks, {info['events']} log lines, {info['bytes']} bytes "
+              f"({info['bytes'] / max(info['ticks'], 1):.1f} B/tick), seed {info['seed']}")
+        print(f"  [REPLAY] agents: {', '.join(info['agents'])}; imposter: {info['imposter']}")
+    else:
+        view(args.replay, args.speed)
@@ -3,12 +3,28 @@ import asyncore
 import random
 import pickle
 import time
+import os
+import atexit
+
+import netjournal
+import snapshot_codec
 
 BUFFERSIZE = 8192
+GAME_PORT = 4321
+FEED_PORT = 4323   # read-only 'player locations' feed for observers (server_voice.py)
+FEED_BACKLOG = 1 << 20   # bytes queued for an observer before it is dropped (it reconnects)
 
 print("Server Address: " + socket.gethostbyname(socket.gethostname()))
 
 outgoing = []
+observers = []   # FeedConnection per observer; never in outgoing
+
+# Optional session journal (see netjournal.py): SERVER_JOURNAL=session.msj
+journal = None
+if os.environ.get("SERVER_JOURNAL"):
+  journal = netjournal.JournalWriter(os.environ["SERVER_JOURNAL"])
+  atexit.register(journal.close)
+  print("Recording session journal to " + journal.path)
 
 class Minion:
   def __init__(self, player_id):
@@ -96,24 +112,31 @@ def updateWorld(message):
   minionmap[player_id].eject_sync = eject_sync
   minionmap[player_id].eject_img = eject_img
 
+  update = ['player locations']
+
+  for key, value in minionmap.items():
+    update.append(snapshot_codec.pack_entry([value.player_id, value.x, value.y, value.alive_status, value.sync_img, value.sync_img_index, value.left_img_index, value.right_img_index, value.up_img_index, value.down_img_index, value.player_colour, value.tasks_completed, value.sabotagelights_sync, value.sabotagereactor_sync, value.victim_id, value.imposter, value.emergency_sync, value.voted, value.got_votes, value.emergency_meeting_img_sync, value.emergency_meeting_img_sync_report, value.victim_id_report, value.got_reported, value.eject_sync, value.eject_img]))
+
+  data = pickle.dumps(update)
+  if journal:
+    journal.record(netjournal.OUTBOUND, netjournal.BROADCAST, data)
+
   remove = []
 
   for i in outgoing:
-    update = ['player locations']
-
-    for key, value in minionmap.items():
-      update.append([value.player_id, value.x, value.y, value.alive_status, value.sync_img, value.sync_img_index, value.left_img_index, value.right_img_index, value.up_img_index, value.down_img_index, value.player_colour, value.tasks_completed, value.sabotagelights_sync, value.sabotagereactor_sync, value.victim_id, value.imposter, value.emergency_sync, value.voted, value.got_votes, value.emergency_meeting_img_sync, value.emergency_meeting_img_sync_report, value.victim_id_report, value.got_reported, value.eject_sync, value.eject_img])
-    
     try:
-      i.send(pickle.dumps(update))
+      i.send(data)
     except Exception:
       remove.append(i)
       continue
     
     print ('sent update data')
 
-    for r in remove:
-      outgoing.remove(r)
+  for r in remove:
+    outgoing.remove(r)
+
+  for observer in list(observers):
+    observer.broadcast(data)
 
 class MainServer(asyncore.dispatcher):
   def __init__(self, port):
@@ -128,15 +151,63 @@ class MainServer(asyncore.dispatcher):
     player_id = random.randint(1000, 1000000)
     playerminion = Minion(player_id)
     minionmap[player_id] = playerminion
-    conn.send(pickle.dumps(['id update', player_id]))
-    SecondaryServer(conn)
+    id_update = pickle.dumps(['id update', player_id])
+    if journal:
+      journal.record(netjournal.ACCEPT, player_id, id_update)
+    conn.send(id_update)
+    SecondaryServer(conn, player_id)
 
 class SecondaryServer(asyncore.dispatcher_with_send):
+  def __init__(self, sock, player_id):
+    asyncore.dispatcher_with_send.__init__(self, sock)
+    self.player_id = player_id
   def handle_read(self):
     recievedData = self.recv(BUFFERSIZE)
     if recievedData:
+      if journal:
+        journal.record(netjournal.INBOUND, self.player_id, recievedData)
       updateWorld(recievedData)
-    else: self.close()
+    else:
+      if journal:
+        journal.record(netjournal.CLOSE, self.player_id)
+      self.close()
+
+class FeedServer(asyncore.dispatcher):
+  # Observers get every broadcast but are not players: no Minion, no id,
+  # not journaled, so snapshots and journals only ever carry real players
+  def __init__(self, port):
+    asyncore.dispatcher.__init__(self)
+    self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+    self.bind(('', port))
+    self.listen(10)
+  def handle_accept(self):
+    conn, addr = self.accept()
+    print ('Observer address:' + addr[0] + " " + str(addr[1]))
+    observers.append(FeedConnection(conn))
+
+class FeedConnection(asyncore.dispatcher_with_send):
+  # Snapshots are buffered and written as the socket accepts them, so a slow
+  # observer still gets whole back-to-back pickles. Any failure closes the
+  # connection: the observer sees EOF and reconnects instead of silently
+  # missing every later snapshot.
+  def broadcast(self, data):
+    if len(self.out_buffer) > FEED_BACKLOG:
+      print ('Observer too slow, dropping it')
+      self.handle_close()
+      return
+    try:
+      self.send(data)
+    except Exception:
+      self.handle_close()
+  def handle_read(self):
+    # observers have nothing to say; EOF means they left
+    if not self.recv(BUFFERSIZE):
+      self.handle_close()
+  def handle_close(self):
+    if self in observers:
+      observers.remove(self)
+    self.close()
 
-MainServer(4321)
+MainServer(GAME_PORT)
+FeedServer(FEED_PORT)
 asyncore.loop()
\ No newline at end of file
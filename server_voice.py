@@ -1,53 +1,329 @@
 #!/usr/bin/python3
 
+import io
+import os
+import pickle
+import secrets
+import selectors
 import socket
-import threading
+import struct
+import time
+from collections import deque
 
-class Server:
-    def __init__(self):
-            self.ip = socket.gethostbyname(socket.gethostname())
-            while 1:
-                try:
-                    #self.port = int(input('Enter port number to run on --> '))
-                    self.port = 4322
-                    self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    self.s.bind((self.ip, self.port))
+import snapshot_codec
+import voice_codec
+import voice_transport
+import voice_vad
+from voice_mixer import VoiceMixer, ProximityGains
+
+GAME_FEED_PORT = 4323   # server.py's read-only observer feed
+VOICE_PORT = 4322
+RECONNECT_DELAY = 5.0
+MAX_QUEUED_FRAMES = 10   # control frames held for a stalled client before dropping
+
+
+class Connection:
+    """One voice client session.
 
-                    break
-                except:
-                    print("Couldn't bind to that port")
+    The TCP socket carries control frames and defines the session's
+    lifetime; audio goes both ways over UDP to the address the client's
+    packets come from (udp_addr), matched by the session token.
+    """
+
+    def __init__(self, sock, addr, token):
+        self.sock = sock
+        self.addr = addr
+        self.token = token
+        self.udp_addr = None
+        self.out_seq = 0
+        self.silent_ticks = 0    # mix ticks since this listener last heard anyone
+        self.frames = voice_codec.FrameReader()
+        self.decoders = voice_codec.DecoderBank()
+        self.encoder = None
+        self.outgoing = deque()
+        self.offset = 0          # bytes of outgoing[0] already sent
+        self.writing = False     # registered for EVENT_WRITE
+        self.dropped = 0
+
+    def queue(self, data):
+        self.outgoing.append(data)
+        # a stalled client loses its oldest whole frame, never the one
+        # already half-way out
+        while len(self.outgoing) > MAX_QUEUED_FRAMES:
+            del self.outgoing[1 if self.offset else 0]
+            self.dropped += 1
+
+    def flush(self):
+        """Send what the socket accepts; True once the queue is empty."""
+        while self.outgoing:
+            head = self.outgoing[0]
+            try:
+                self.offset += self.sock.send(head[self.offset:])
+            except BlockingIOError:
+                return False
+            if self.offset < len(head):
+                return False
+            self.outgoing.popleft()
+            self.offset = 0
+        return True
+
+
+class GameFeed:
+    """Passive subscription to the game server's 'player locations'.
+
+    Uses the game server's observer feed port rather than the player
+    port, so the voice server never appears as a player in snapshots.
+    Connects without blocking, reassembles back-to-back pickled snapshots
+    and reconnects after RECONNECT_DELAY whenever the game server is gone.
+    """
+
+    def __init__(self, address, on_snapshot, on_lost):
+        self.address = address
+        self.on_snapshot = on_snapshot
+        self.on_lost = on_lost
+        self.sock = None
+        self.connected = False
+        self.buffer = b''
+        self.retry_at = 0.0
+
+    def start(self, sel):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setblocking(False)
+        self.sock.connect_ex((self.address, GAME_FEED_PORT))
+        self.connected = False
+        self.buffer = b''
+        sel.register(self.sock, selectors.EVENT_WRITE, lambda mask: self.service(sel, mask))
+
+    def stop(self, sel):
+        if self.sock is not None:
+            sel.unregister(self.sock)
+            self.sock.close()
+            self.sock = None
+        if self.connected:
+            self.on_lost()
+        self.connected = False
+        self.retry_at = time.monotonic() + RECONNECT_DELAY
+
+    def service(self, sel, mask):
+        if not self.connected:
+            if self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                self.stop(sel)
+                return
+            self.connected = True
+            sel.modify(self.sock, selectors.EVENT_READ, lambda mask: self.service(sel, mask))
+            print('Following game server at ' + self.address)
+            return
+        try:
+            data = self.sock.recv(8192)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self.stop(sel)
+            return
+        # snapshots are back-to-back pickles; keep any partial tail
+        self.buffer += data
+        stream = io.BytesIO(self.buffer)
+        while True:
+            start = stream.tell()
+            try:
+                message = pickle.load(stream)
+            except Exception:
+                stream.seek(start)
+                break
+            if message and message[0] == 'player locations':
+                self.on_snapshot(message[1:])
+        self.buffer = self.buffer[stream.tell():]
+        if len(self.buffer) > 65536:
+            self.buffer = b''
 
-            self.connections = []
-            self.accept_connections()
 
-    def accept_connections(self):
+class Server:
+    def __init__(self, ip=None, port=VOICE_PORT, game_server=None):
+        self.ip = ip or socket.gethostbyname(socket.gethostname())
+        self.port = port
+        self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.s.bind((self.ip, self.port))
         self.s.listen(100)
+        self.s.setblocking(False)
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind((self.ip, self.port))
+        self.udp.setblocking(False)
+
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(self.s, selectors.EVENT_READ, self.accept_connection)
+        self.sel.register(self.udp, selectors.EVENT_READ, self.handle_datagrams)
+        self.connections = {}
+        self.sessions = {}
+        # speakers are mixed server-side; every listener gets one stream
+        self.mixer = VoiceMixer()
+        # per-listener distance gains from the game server's snapshots
+        self.proximity = ProximityGains()
+        self.feed = GameFeed(game_server or os.environ.get("GAME_SERVER_ADDRESS", self.ip),
+                             self.apply_snapshot, lambda: self.proximity.update({}, False))
 
         print('Running on IP: '+self.ip)
         print('Running on port: '+str(self.port))
-        
+
+    # -- event loop ---------------------------------------------------------
+
+    def serve_forever(self):
+        # one mixed frame per listener every FRAME_MS; socket events are
+        # handled in between and nothing ever blocks
+        interval = voice_codec.FRAME_MS / 1000
+        next_tick = time.monotonic() + interval
         while True:
+            now = time.monotonic()
+            if self.feed.sock is None and now >= self.feed.retry_at:
+                self.feed.start(self.sel)
+            for key, mask in self.sel.select(max(next_tick - now, 0)):
+                key.data(mask)
+            now = time.monotonic()
+            if now >= next_tick:
+                self.mix_tick()
+                next_tick += interval
+                if now - next_tick > interval:
+                    next_tick = now + interval   # fell behind, don't burst
+
+    def accept_connection(self, mask):
+        try:
             c, addr = self.s.accept()
+        except BlockingIOError:
+            return
+        c.setblocking(False)
+        c.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        token = secrets.randbits(32)
+        while token in self.sessions:
+            token = secrets.randbits(32)
+        client = Connection(c, addr, token)
+        self.connections[c] = client
+        self.sessions[token] = client
+        self.mixer.add(c, client.decoders.decode)
+        self.sel.register(c, selectors.EVENT_READ, lambda mask: self.service(client, mask))
+        self.send(client, voice_codec.pack_frame(voice_codec.SESSION, struct.pack("<I", token)))
+        print('Connection address:' + addr[0] + " " + str(addr[1]))
 
-            self.connections.append(c)
+    def service(self, client, mask):
+        if mask & selectors.EVENT_READ:
+            self.handle_read(client)
+        if mask & selectors.EVENT_WRITE and client.sock in self.connections:
+            self.handle_write(client)
 
-            threading.Thread(target=self.handle_client,args=(c,addr,)).start()
-        
-    def broadcast(self, sock, data):
-        for client in self.connections:
-            if client != self.s and client != sock:
-                try:
-                    client.send(data)
-                except:
-                    pass
+    def close(self, client):
+        if self.connections.pop(client.sock, None) is None:
+            return
+        self.sessions.pop(client.token, None)
+        self.sel.unregister(client.sock)
+        client.sock.close()
+        self.mixer.remove(client.sock)
+        self.proximity.colours.pop(client.sock, None)
+        print('Disconnected:' + client.addr[0] + " " + str(client.addr[1]))
+
+    # -- per-client I/O -------------------------------------------------------
+
+    def handle_read(self, client):
+        try:
+            data = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self.close(client)
+            return
+        for codec_id, payload in client.frames.feed(data):
+            if codec_id == voice_codec.HELLO:
+                self.proximity.colours[client.sock] = payload.decode('utf-8', 'replace').strip().lower()
 
-    def handle_client(self,c,addr):
-        while 1:
+    def handle_datagrams(self, mask):
+        while True:
             try:
-                data = c.recv(1024)
-                self.broadcast(c, data)
-            
-            except socket.error:
-                c.close()
+                datagram, addr = self.udp.recvfrom(voice_transport.MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionError):
+                return
+            packet = voice_transport.unpack_packet(datagram)
+            client = self.sessions.get(packet[0]) if packet else None
+            if client is None:
+                continue
+            token, seq, codec_id, payload = packet
+            client.udp_addr = addr
+            if not payload:
+                continue   # keepalive
+            self.mixer.push(client.sock, seq, codec_id, payload)
+            # answer each client in the codec it speaks
+            if (client.encoder is None or client.encoder.codec_id != codec_id) and codec_id in voice_codec.CODECS_BY_ID:
+                client.encoder = voice_codec.create_codec(voice_codec.CODECS_BY_ID[codec_id].name)
+
+    def handle_write(self, client):
+        try:
+            done = client.flush()
+        except OSError:
+            self.close(client)
+            return
+        if done and client.writing:
+            client.writing = False
+            self.sel.modify(client.sock, selectors.EVENT_READ, lambda mask: self.service(client, mask))
+
+    def send(self, client, data):
+        # control frames over TCP: queue and try to write straight away; only wait for EVENT_WRITE
+        # when the socket buffer is full
+        client.queue(data)
+        try:
+            done = client.flush()
+        except OSError:
+            self.close(client)
+            return
+        if not done and not client.writing:
+            client.writing = True
+            self.sel.modify(client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE,
+                            lambda mask: self.service(client, mask))
+
+    # -- mixing ---------------------------------------------------------------
+
+    def mix_tick(self):
+        listeners = list(self.connections)
+        for sock, frame in self.mixer.mix(listeners, self.proximity).items():
+            client = self.connections.get(sock)
+            if client is None or client.udp_addr is None:
+                continue
+            if frame is not None:
+                client.silent_ticks = 0
+                if client.encoder is None:
+                    client.encoder = voice_codec.create_codec()
+                packet = voice_transport.pack_packet(client.token, client.out_seq, client.encoder.codec_id,
+                                                     client.encoder.encode(frame.tobytes()))
+            else:
+                # nobody audible: a comfort-noise marker when the mix goes quiet, then every CN_INTERVAL
+                packet = None
+                if client.silent_ticks % voice_vad.CN_INTERVAL == 0:
+                    packet = voice_transport.pack_packet(client.token, client.out_seq, voice_codec.COMFORT_NOISE,
+                                                         bytes([self.mixer.comfort_level()]))
+                client.silent_ticks += 1
+            if packet:
+                try:
+                    self.udp.sendto(packet, client.udp_addr)
+                except (BlockingIOError, OSError):
+                    pass   # a full socket buffer drops the frame; the jitter buffer conceals it
+            client.out_seq = (client.out_seq + 1) & 0xFFFF
+
+    def apply_snapshot(self, entries):
+        players = {}
+        meeting = False
+        for entry in entries:
+            p = snapshot_codec.unpack_entry(entry)
+            if p[10] is None:
+                continue
+            players[str(p[10]).lower()] = (p[1], p[2], p[3])
+            if p[19] is not None or p[20] is not None:
+                meeting = True
+        self.proximity.update(players, meeting)
+
 
-server = Server()
+if __name__ == "__main__":
+    server = Server()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,7 @@
 import pygame
 
+import atlas
+
 # define some colors (R, G, B)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -193,6 +195,12 @@ DIVERT_POWER_TOP_REACTOR_RADIUS = 50
 ALIGN_ENGINE_OUTPUT = 50
 PICK_STORAGE_GAS_CAN_RADIUS = 50
 FUEL_ENGINE = 50
+# Where sabotages are fixed (also marked on the mini map while active)
+LIGHTS_FIX_POS = (2472, 1721)
+REACTOR_FIX_POS = (889, 999)
+
+# Mini map markers are repainted at most this often (ms), whatever the FPS
+MINI_MAP_REFRESH = 100
 
 # Pygame Mouse Button Codes
 LEFT_MOUSE_BUTTON = 1
@@ -200,372 +208,39 @@ MIDDLE_MOUSE_BUTTON = 2
 RIGHT_MOUSE_BUTTON = 3
 
 
-# PLAYER SPRITES MOVEMENTS ----------------------------
-# Red Player Movements
-# Player left movement
-red_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    red_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Red/red_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    red_player_imgs_left[i] = pygame.transform.smoothscale(red_player_imgs_left[i], (64, 86))
-
-# Player right movement
-red_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    red_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Red/red_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    red_player_imgs_right[i] = pygame.transform.smoothscale(red_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-red_player_imgs_down = []
-for i in range(1, 19):
-    red_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Red/red_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    red_player_imgs_down[i] = pygame.transform.smoothscale(red_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-red_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    red_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Red/red_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    red_player_imgs_up[i] = pygame.transform.smoothscale(red_player_imgs_up[i], (64, 86))
-
-red_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadred.png')
-
-red_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Red/red_ghost/step1_left.png')
-red_player_imgs_ghost_left = pygame.transform.smoothscale(red_player_imgs_ghost_left, (64, 86))
-
-red_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Red/red_ghost/step1_right.png')
-red_player_imgs_ghost_right = pygame.transform.smoothscale(red_player_imgs_ghost_right, (64, 86))
-
+# PLAYER SPRITES ----------------------------
+# Each colour's walk, ghost and dead frames are packed into one sheet
+# (atlas.py); PLAYER_ATLASES[colour].frames("left") etc. are subsurface views
+PLAYER_ATLASES = atlas.load_player_atlases()
+
+# The per-colour names (red_player_imgs_left ... white_player_imgs_dead,
+# red_player_imgs_ghost_left) are still looked up by name, e.g. eval'd
+# strings like "red_player_imgs_right[9]" sent between clients
+for _colour, _atlas in PLAYER_ATLASES.items():
+    _name = _colour.lower() + "_player_imgs_"
+    for _anim in atlas.WALKS:
+        globals()[_name + _anim] = _atlas.frames(_anim)
+    globals()[_name + "dead"] = _atlas.image("dead")
+    if "ghost_left" in _atlas:
+        globals()[_name + "ghost_left"] = _atlas.image("ghost_left")
+        globals()[_name + "ghost_right"] = _atlas.image("ghost_right")
+
+# Emergency meeting / report alerts (only the animated colours have them)
 red_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_red.png')
 red_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_red.png')
-
-# Blue Player Movements-----------------
-# Player left movement
-blue_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    blue_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Blue/blue_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    blue_player_imgs_left[i] = pygame.transform.smoothscale(blue_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-blue_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    blue_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Blue/blue_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    blue_player_imgs_right[i] = pygame.transform.smoothscale(blue_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-blue_player_imgs_down = []
-for i in range(1, 19):
-    blue_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Blue/blue_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    blue_player_imgs_down[i] = pygame.transform.smoothscale(blue_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-blue_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    blue_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Blue/blue_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    blue_player_imgs_up[i] = pygame.transform.smoothscale(blue_player_imgs_up[i], (64, 86))
-
-blue_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadblue.png')
-
-blue_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Blue/blue_ghost/step1_left.png')
-blue_player_imgs_ghost_left = pygame.transform.smoothscale(blue_player_imgs_ghost_left, (64, 86))
-
-blue_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Blue/blue_ghost/step1_right.png')
-blue_player_imgs_ghost_right = pygame.transform.smoothscale(blue_player_imgs_ghost_right, (64, 86))
-
 blue_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_blue.png')
 blue_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_blue.png')
-
-# Green Player Movements-----------------
-# Player left movement
-green_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    green_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Green/green_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    green_player_imgs_left[i] = pygame.transform.smoothscale(green_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-green_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    green_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Green/green_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    green_player_imgs_right[i] = pygame.transform.smoothscale(green_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-green_player_imgs_down = []
-for i in range(1, 19):
-    green_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Green/green_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    green_player_imgs_down[i] = pygame.transform.smoothscale(green_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-green_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    green_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Green/green_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    green_player_imgs_up[i] = pygame.transform.smoothscale(green_player_imgs_up[i], (64, 86))
-
-green_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadgreen.png')
-
-green_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Green/green_ghost/step1_left.png')
-green_player_imgs_ghost_left = pygame.transform.smoothscale(green_player_imgs_ghost_left, (64, 86))
-
-green_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Green/green_ghost/step1_right.png')
-green_player_imgs_ghost_right = pygame.transform.smoothscale(green_player_imgs_ghost_right, (64, 86))
-
 green_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_green.png')
 green_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_green.png')
-
-# Orange Player Movements-----------------
-# Player left movement
-orange_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    orange_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Orange/orange_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    orange_player_imgs_left[i] = pygame.transform.smoothscale(orange_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-orange_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    orange_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Orange/orange_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    orange_player_imgs_right[i] = pygame.transform.smoothscale(orange_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-orange_player_imgs_down = []
-for i in range(1, 19):
-    orange_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Orange/orange_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    orange_player_imgs_down[i] = pygame.transform.smoothscale(orange_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-orange_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    orange_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Orange/orange_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    orange_player_imgs_up[i] = pygame.transform.smoothscale(orange_player_imgs_up[i], (64, 86))
-
-orange_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadorange.png')
-
-orange_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Orange/orange_ghost/step1_left.png')
-orange_player_imgs_ghost_left = pygame.transform.smoothscale(orange_player_imgs_ghost_left, (64, 86))
-
-orange_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Orange/orange_ghost/step1_right.png')
-orange_player_imgs_ghost_right = pygame.transform.smoothscale(orange_player_imgs_ghost_right, (64, 86))
-
 orange_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_orange.png')
 orange_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_orange.png')
-
-# Yellow Player Movements-----------------
-# Player left movement
-yellow_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    yellow_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    yellow_player_imgs_left[i] = pygame.transform.smoothscale(yellow_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-yellow_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    yellow_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    yellow_player_imgs_right[i] = pygame.transform.smoothscale(yellow_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-yellow_player_imgs_down = []
-for i in range(1, 19):
-    yellow_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    yellow_player_imgs_down[i] = pygame.transform.smoothscale(yellow_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-yellow_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    yellow_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    yellow_player_imgs_up[i] = pygame.transform.smoothscale(yellow_player_imgs_up[i], (64, 86))
-    
-yellow_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadyellow.png')
-
-yellow_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Yellow/yellow_ghost/step1_left.png')
-yellow_player_imgs_ghost_left = pygame.transform.smoothscale(yellow_player_imgs_ghost_left, (64, 86))
-
-yellow_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Yellow/yellow_ghost/step1_right.png')
-yellow_player_imgs_ghost_right = pygame.transform.smoothscale(yellow_player_imgs_ghost_right, (64, 86))
-
 yellow_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_yellow.png')
 yellow_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_yellow.png')
 
-
-# Black Player Movements-----------------
-# Player left movement
-black_player_imgs_left = []
-black_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Black/black_left_walk/step1.png'))
-black_player_imgs_left[0] = pygame.transform.smoothscale(black_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-black_player_imgs_right = []
-black_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Black/black_right_walk/step1.png'))
-black_player_imgs_right[0] = pygame.transform.smoothscale(black_player_imgs_right[0], (64, 86))
-
-# Player down movement
-black_player_imgs_down = []
-black_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Black/black_down_walk/step1.png'))
-black_player_imgs_down[0] = pygame.transform.smoothscale(black_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-black_player_imgs_up = []
-black_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Black/black_up_walk/step1.png'))
-black_player_imgs_up[0] = pygame.transform.smoothscale(black_player_imgs_up[0], (64, 86))
-    
-black_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadblack.png')
-
-
-# Brown Player Movements-----------------
-# Player left movement
-brown_player_imgs_left = []
-brown_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Brown/brown_left_walk/step1.png'))
-brown_player_imgs_left[0] = pygame.transform.smoothscale(brown_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-brown_player_imgs_right = []
-brown_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Brown/brown_right_walk/step1.png'))
-brown_player_imgs_right[0] = pygame.transform.smoothscale(brown_player_imgs_right[0], (64, 86))
-
-# Player down movement
-brown_player_imgs_down = []
-brown_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Brown/brown_down_walk/step1.png'))
-brown_player_imgs_down[0] = pygame.transform.smoothscale(brown_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-brown_player_imgs_up = []
-brown_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Brown/brown_up_walk/step1.png'))
-brown_player_imgs_up[0] = pygame.transform.smoothscale(brown_player_imgs_up[0], (64, 86))
-    
-brown_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadbrown.png')
-
-
-# Pink Player Movements-----------------
-# Player left movement
-pink_player_imgs_left = []
-pink_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Pink/pink_left_walk/step1.png'))
-pink_player_imgs_left[0] = pygame.transform.smoothscale(pink_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-pink_player_imgs_right = []
-pink_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Pink/pink_right_walk/step1.png'))
-pink_player_imgs_right[0] = pygame.transform.smoothscale(pink_player_imgs_right[0], (64, 86))
-
-# Player down movement
-pink_player_imgs_down = []
-pink_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Pink/pink_down_walk/step1.png'))
-pink_player_imgs_down[0] = pygame.transform.smoothscale(pink_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-pink_player_imgs_up = []
-pink_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Pink/pink_up_walk/step1.png'))
-pink_player_imgs_up[0] = pygame.transform.smoothscale(pink_player_imgs_up[0], (64, 86))
-    
-pink_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadpink.png')
-
-
-# Purple Player Movements-----------------
-# Player left movement
-purple_player_imgs_left = []
-purple_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Purple/Purple_left_walk/step1.png'))
-purple_player_imgs_left[0] = pygame.transform.smoothscale(purple_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-purple_player_imgs_right = []
-purple_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Purple/Purple_right_walk/step1.png'))
-purple_player_imgs_right[0] = pygame.transform.smoothscale(purple_player_imgs_right[0], (64, 86))
-
-# Player down movement
-purple_player_imgs_down = []
-purple_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Purple/Purple_down_walk/step1.png'))
-purple_player_imgs_down[0] = pygame.transform.smoothscale(purple_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-purple_player_imgs_up = []
-purple_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Purple/Purple_up_walk/step1.png'))
-purple_player_imgs_up[0] = pygame.transform.smoothscale(purple_player_imgs_up[0], (64, 86))
-    
-purple_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/DeadPurple.png')
-
-
-# White Player Movements-----------------
-# Player left movement
-white_player_imgs_left = []
-white_player_imgs_left.append(pygame.image.load('Assets/Images/Player/White/White_left_walk/step1.png'))
-white_player_imgs_left[0] = pygame.transform.smoothscale(white_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-white_player_imgs_right = []
-white_player_imgs_right.append(pygame.image.load('Assets/Images/Player/White/White_right_walk/step1.png'))
-white_player_imgs_right[0] = pygame.transform.smoothscale(white_player_imgs_right[0], (64, 86))
-
-# Player down movement
-white_player_imgs_down = []
-white_player_imgs_down.append(pygame.image.load('Assets/Images/Player/White/White_down_walk/step1.png'))
-white_player_imgs_down[0] = pygame.transform.smoothscale(white_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-white_player_imgs_up = []
-white_player_imgs_up.append(pygame.image.load('Assets/Images/Player/White/White_up_walk/step1.png'))
-white_player_imgs_up[0] = pygame.transform.smoothscale(white_player_imgs_up[0], (64, 86))
-    
-white_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/DeadWhite.png')
\ No newline at end of file
+EMERGENCY_MEETING_IMGS = {
+    "Red": red_player_emergency_meeting,
+    "Blue": blue_player_emergency_meeting,
+    "Green": green_player_emergency_meeting,
+    "Orange": orange_player_emergency_meeting,
+    "Yellow": yellow_player_emergency_meeting,
+}
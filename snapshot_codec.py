@@ -0,0 +1,200 @@
+"""
+Snapshot Codec for MonadSus multiplayer.
+
+Packs the per-frame ("hot") part of each player in a 'player locations'
+snapshot into a fixed 9-byte motion record:
+
+    id/flags (u32)  : player id in the low 24 bits, alive flag in bit 24
+    x, y     (u16)  : position in 13.3 fixed point (1/8 px, map is 5792x3168)
+    anim     (u8)   : facing in the high 3 bits, animation frame in the low 5
+
+The facing/frame pair replaces the two sprite-expression strings
+(sync_img, sync_img_index) and the four per-direction frame indices.
+Everything else in a snapshot entry changes rarely and stays as-is.
+
+Wire layout of one entry (server -> client):
+    [motion_record, player_colour, tasks_completed, ..., eject_img]
+and unpack_entry() restores the original 25-field list, so the client
+keeps indexing p[0]..p[24] exactly as before.
+"""
+
+import struct
+from typing import List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Positions
+# ---------------------------------------------------------------------------
+
+POSITION_FRACTION_BITS = 3
+POSITION_SCALE = 1 << POSITION_FRACTION_BITS
+POSITION_MAX = 0xFFFF / POSITION_SCALE        # 8191.875 px
+POSITION_ERROR = 0.5 / POSITION_SCALE         # worst case error, in px
+
+
+def quantize_position(x: float, y: float) -> Tuple[int, int]:
+    """Map pixel coordinates onto 16-bit fixed point, clamped to the range."""
+    qx = int(round(min(max(x, 0.0), POSITION_MAX) * POSITION_SCALE))
+    qy = int(round(min(max(y, 0.0), POSITION_MAX) * POSITION_SCALE))
+    return qx, qy
+
+
+def dequantize_position(qx: int, qy: int) -> Tuple[float, float]:
+    return qx / POSITION_SCALE, qy / POSITION_SCALE
+
+
+# ---------------------------------------------------------------------------
+# Facing / Animation Frame
+# ---------------------------------------------------------------------------
+
+FACING_NONE = 0
+FACING_LEFT = 1
+FACING_RIGHT = 2
+FACING_UP = 3
+FACING_DOWN = 4
+FACING_DEAD = 5
+FACING_GHOST = 6
+
+FRAME_BITS = 5
+FRAME_MASK = (1 << FRAME_BITS) - 1
+
+# Sprite expressions the client evaluates; index in the entry of the
+# per-direction frame counter for the walking animations.
+_WALK_SPRITES = {
+    FACING_LEFT: ("self.Players[p[0]].player_imgs_left", 6),
+    FACING_RIGHT: ("self.Players[p[0]].player_imgs_right", 7),
+    FACING_UP: ("self.Players[p[0]].player_imgs_up", 8),
+    FACING_DOWN: ("self.Players[p[0]].player_imgs_down", 9),
+}
+_DEAD_SPRITE = "self.Players[p[0]].image_dead"
+_GHOST_SPRITE = "self.invsible_player_image"
+
+
+def encode_anim(sync_img: Optional[str], sync_img_index: Optional[str],
+                frame_indices: List[int]) -> int:
+    """Reduce a (sprite expression, index expression) pair to one byte.
+
+    frame_indices are the left/right/up/down frame counters (entry fields
+    6..9), needed to resolve index expressions like "[p[6]]".
+    """
+    if not sync_img:
+        return FACING_NONE << FRAME_BITS
+    if sync_img.endswith("image_dead"):
+        return FACING_DEAD << FRAME_BITS
+    if sync_img.endswith("invsible_player_image"):
+        return FACING_GHOST << FRAME_BITS
+    for facing, (sprite, _) in _WALK_SPRITES.items():
+        if sync_img.endswith(sprite.rsplit(".", 1)[1]):
+            break
+    else:
+        return FACING_NONE << FRAME_BITS
+    index = (sync_img_index or "")[1:-1]
+    if index.startswith("p[") and index[2:-1] in ("6", "7", "8", "9"):
+        frame = frame_indices[int(index[2:-1]) - 6]
+    elif index.isdigit():
+        frame = int(index)
+    else:
+        frame = 0
+    return (facing << FRAME_BITS) | (min(max(int(frame), 0), FRAME_MASK))
+
+
+def decode_anim(anim: int) -> Tuple[Optional[str], Optional[str], List[int]]:
+    """Inverse of encode_anim: (sync_img, sync_img_index, frame indices)."""
+    facing, frame = anim >> FRAME_BITS, anim & FRAME_MASK
+    frames = [0, 0, 0, 0]
+    if facing in _WALK_SPRITES:
+        sprite, slot = _WALK_SPRITES[facing]
+        frames[slot - 6] = frame
+        return sprite, "[%d]" % frame, frames
+    if facing == FACING_DEAD:
+        return _DEAD_SPRITE, "", frames
+    if facing == FACING_GHOST:
+        return _GHOST_SPRITE, "", frames
+    return None, None, frames
+
+
+# ---------------------------------------------------------------------------
+# Motion Records / Snapshot Entries
+# ---------------------------------------------------------------------------
+
+MOTION = struct.Struct("<IHHB")
+MOTION_SIZE = MOTION.size
+PLAYER_ID_MASK = 0xFFFFFF
+ALIVE_FLAG = 1 << 24
+
+
+def pack_motion(player_id: int, x: float, y: float, alive: bool, anim: int) -> bytes:
+    qx, qy = quantize_position(x, y)
+    id_flags = (player_id & PLAYER_ID_MASK) | (ALIVE_FLAG if alive else 0)
+    return MOTION.pack(id_flags, qx, qy, anim)
+
+
+def unpack_motion(record: bytes) -> Tuple[int, float, float, bool, int]:
+    id_flags, qx, qy, anim = MOTION.unpack(record)
+    x, y = dequantize_position(qx, qy)
+    return id_flags & PLAYER_ID_MASK, x, y, bool(id_flags & ALIVE_FLAG), anim
+
+
+def pack_entry(fields: list) -> list:
+    """Compress a 25-field snapshot entry (server side)."""
+    anim = encode_anim(fields[4], fields[5], fields[6:10])
+    return [pack_motion(fields[0], fields[1], fields[2], fields[3], anim)] + list(fields[10:])
+
+
+def unpack_entry(entry: list) -> list:
+    """Restore the 25-field snapshot entry layout (client side)."""
+    player_id, x, y, alive, anim = unpack_motion(entry[0])
+    sync_img, sync_img_index, frames = decode_anim(anim)
+    return [player_id, x, y, alive, sync_img, sync_img_index] + frames + list(entry[1:])
+
+
+# ---------------------------------------------------------------------------
+# Self-check
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import pickle
+    import random
+
+    rng = random.Random(7)
+
+    # Position error is bounded by half a quantization step across the map
+    worst = 0.0
+    for _ in range(100000):
+        x, y = rng.uniform(0, 5792), rng.uniform(0, 3168)
+        dx, dy = dequantize_position(*quantize_position(x, y))
+        worst = max(worst, abs(dx - x), abs(dy - y))
+    assert worst <= POSITION_ERROR + 1e-9, worst
+    assert dequantize_position(*quantize_position(-20.0, 99999.0)) == (0.0, POSITION_MAX)
+
+    # Facing / frame round-trips for every sprite expression the client sends
+    frames = [3, 11, 7, 17]
+    cases = [
+        ("self.Players[p[0]].player_imgs_left", "[p[6]]", FACING_LEFT, 3),
+        ("self.Players[p[0]].player_imgs_right", "[p[7]]", FACING_RIGHT, 11),
+        ("self.Players[p[0]].player_imgs_up", "[p[8]]", FACING_UP, 7),
+        ("self.Players[p[0]].player_imgs_down", "[p[9]]", FACING_DOWN, 17),
+        ("self.Players[p[0]].player_imgs_down", "[0]", FACING_DOWN, 0),
+        ("self.player.player_imgs_down", "[0]", FACING_DOWN, 0),
+        ("self.Players[p[0]].image_dead", "", FACING_DEAD, 0),
+        ("self.invsible_player_image", "", FACING_GHOST, 0),
+        (None, None, FACING_NONE, 0),
+    ]
+    for sync_img, sync_index, facing, frame in cases:
+        anim = encode_anim(sync_img, sync_index, frames)
+        assert (anim >> FRAME_BITS, anim & FRAME_MASK) == (facing, frame), (sync_img, sync_index)
+        assert encode_anim(*decode_anim(anim)) == anim
+
+    # Full entry round trip
+    entry = [482113, 2345.678, 1502.25, True, "self.Players[p[0]].player_imgs_right", "[p[7]]",
+             3, 11, 7, 17, "Red", 4, 1, 0, 0, False, 2, None, 0, None, None, 0, False, False, None]
+    packed = pack_entry(entry)
+    restored = unpack_entry(packed)
+    assert len(packed[0]) == MOTION_SIZE < 10
+    assert restored[0] == entry[0] and restored[3] is True
+    assert abs(restored[1] - entry[1]) <= POSITION_ERROR and abs(restored[2] - entry[2]) <= POSITION_ERROR
+    assert restored[4:6] == ["self.Players[p[0]].player_imgs_right", "[11]"]
+    assert restored[10:] == entry[10:]
+
+    print(f"Motion record: {MOTION_SIZE} bytes/player, max position error {worst:.4f}px")
+    print(f"Pickled entry: {len(pickle.dumps(entry))} -> {len(pickle.dumps(packed))} bytes")
@@ -0,0 +1,256 @@
+"""
+Live MJPEG Stream of the Spectator View for MonadSus.
+
+Serves the autonomous match over HTTP so spectators can watch from a
+browser instead of sitting at the machine running main_autonomous.py:
+
+    /             a page with the stream
+    /stream.mjpg  multipart/x-mixed-replace MJPEG stream
+    /frame.jpg    the latest frame
+
+Frames come from the game's shared-memory capture ring (frame_capture.py),
+so this runs in its own process and never touches the game tick. One
+encoder thread takes the newest frame at --fps, scales it to --size and
+encodes one JPEG; every connected viewer is sent that same JPEG, so ten
+viewers cost one encode. A viewer too slow for the frame rate just skips
+to the newest JPEG. With nobody watching, frames are released unencoded.
+
+    python main_autonomous.py --stream 8080        # capture + this server
+    python spectator_stream.py --ring monadsus_frames --port 8080 --fps 15 --size 640x320
+"""
+
+import argparse
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pygame as pg
+
+from frame_capture import DEFAULT_NAME, FrameRingReader, ring_written
+
+BOUNDARY = "monadsusframe"
+STALE_AFTER = 3.0                             # s without a new frame before checking for a new ring
+PAGE = """<!doctype html>
+<html><head><title>MonadSus live</title>
+<style>body{{margin:0;background:#111;display:flex;height:100vh}}
+img{{margin:auto;max-width:100%;max-height:100%}}</style></head>
+<body><img src="/stream.mjpg" width="{0}" height="{1}" alt="MonadSus live"></body></html>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Encoder
+# ---------------------------------------------------------------------------
+
+class StreamEncoder:
+    """Encodes the newest captured frame as JPEG at a fixed rate, shared by all viewers."""
+
+    def __init__(self, ring: str = DEFAULT_NAME, fps: float = 15, size=None):
+        self.ring = ring
+        self.fps = fps
+        self.size = size                      # None = the game's resolution
+        self.reader = None
+        self.jpeg = None                      # latest encoded frame
+        self.seq = 0                          # bumped per encode
+        self.viewers = 0
+        self.encoded = 0
+        self.encode_ms = 0.0                  # last encode (scale + JPEG)
+        self.running = False
+        self.cond = threading.Condition()
+        self.last_written = -1                # writer's frame count at the last check
+        self.progress_at = 0.0                # when that count last moved
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+
+    def _attach(self):
+        # the game may start after us: keep retrying
+        while self.running and self.reader is None:
+            try:
+                self.reader = FrameRingReader(self.ring)
+                self.last_written, self.progress_at = -1, time.perf_counter()
+                print(f"  [STREAM] attached to '{self.ring}' "
+                      f"({self.reader.width}x{self.reader.height})")
+            except FileNotFoundError:
+                time.sleep(0.5)
+
+    def _stale(self) -> bool:
+        """True when the ring we hold was replaced or removed (and it is now detached).
+
+        A restarted game unlinks the ring and creates a new one under the
+        same name; our mapping still points at the old, frozen block. When
+        no frame arrives for STALE_AFTER, look the name up again: gone, or a
+        block whose frame count differs from ours, means reattach.
+        """
+        written = self.reader.stats()[0]
+        now = time.perf_counter()
+        if written != self.last_written:
+            self.last_written, self.progress_at = written, now
+            return False
+        if now - self.progress_at < STALE_AFTER:
+            return False
+        self.progress_at = now
+        current = ring_written(self.ring)       # header only: no reader, tracker untouched
+        replaced = current != written
+        if replaced:
+            print(f"  [STREAM] ring '{self.ring}' was {'removed' if current is None else 'recreated'}, "
+                  f"reattaching")
+            self.reader.close()
+            self.reader = None
+        return replaced
+
+    def _run(self):
+        interval = 1.0 / self.fps
+        next_at = time.perf_counter()
+        while self.running:
+            self._attach()
+            if self.reader is None:
+                break                         # stopped while waiting for the game
+            now = time.perf_counter()
+            if now < next_at:
+                time.sleep(next_at - now)
+            next_at = max(next_at + interval, time.perf_counter())
+            if self._stale():
+                continue
+            frame = self.reader.acquire(latest=True)
+            if frame is None:
+                continue
+            if not self.viewers:
+                self.reader.release()
+                continue
+
+            t0 = time.perf_counter()
+            surface = frame.surface()
+            size = self.size or (frame.width, frame.height)
+            if size != (frame.width, frame.height):
+                scaled = pg.transform.smoothscale(surface, size)
+            else:
+                scaled = surface.copy()
+            del surface
+            self.reader.release()             # pixels copied: the game may reuse the slot
+            out = io.BytesIO()
+            pg.image.save(scaled, out, "frame.jpg")
+            with self.cond:
+                self.jpeg = out.getvalue()
+                self.seq += 1
+                self.cond.notify_all()
+            self.encoded += 1
+            self.encode_ms = (time.perf_counter() - t0) * 1000
+
+    def wait(self, seq: int, timeout: float = 5.0):
+        """(seq, jpeg) of the first frame newer than seq; jpeg is None on timeout / stop."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq > seq or not self.running, timeout)
+            if self.seq > seq and self.running:
+                return self.seq, self.jpeg
+            return seq, None
+
+    def add_viewer(self, delta: int):
+        with self.cond:
+            self.viewers += delta
+        print(f"  [STREAM] {self.viewers} viewer(s)")
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class StreamHandler(BaseHTTPRequestHandler):
+    encoder: StreamEncoder = None             # set by serve()
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/":
+            reader = self.encoder.reader
+            size = self.encoder.size or ((reader.width, reader.height) if reader else (640, 320))
+            self._send(200, "text/html; charset=utf-8", PAGE.format(*size).encode())
+        elif path == "/frame.jpg":
+            # frames are only encoded while someone watches: wait for a fresh one
+            self.encoder.add_viewer(1)
+            try:
+                _, jpeg = self.encoder.wait(self.encoder.seq)
+            finally:
+                self.encoder.add_viewer(-1)
+            if jpeg is None:
+                self._send(503, "text/plain", b"no frames yet\n")
+            else:
+                self._send(200, "image/jpeg", jpeg)
+        elif path == "/stream.mjpg":
+            self._stream()
+        else:
+            self._send(404, "text/plain", b"not found\n")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.encoder.add_viewer(1)
+        seq = 0
+        try:
+            while self.encoder.running:
+                seq, jpeg = self.encoder.wait(seq)
+                if jpeg is None:
+                    continue
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.encoder.add_viewer(-1)
+
+    def log_message(self, format, *args):
+        pass                                  # one line per JPEG part is too chatty
+
+
+def serve(ring: str = DEFAULT_NAME, port: int = 8080, fps: float = 15, size=None, host: str = ""):
+    encoder = StreamEncoder(ring, fps, size)
+    handler = type("Handler", (StreamHandler,), {"encoder": encoder})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    encoder.start()
+    print(f"  [STREAM] http://localhost:{port}/  ({fps:g} fps"
+          f"{', %dx%d' % size if size else ''}, ring '{ring}')")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        encoder.stop()
+        server.server_close()
+        if encoder.reader:
+            encoder.reader.close()
+
+
+def parse_size(text: str):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the MonadSus spectator view as MJPEG over HTTP.")
+    parser.add_argument("--ring", default=DEFAULT_NAME, help="capture ring name (main_autonomous.py --capture)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--host", default="", help="bind address (default: all interfaces)")
+    parser.add_argument("--fps", type=float, default=15)
+    parser.add_argument("--size", type=parse_size, default=None, metavar="WxH",
+                        help="stream resolution (default: the game's)")
+    args = parser.parse_args()
+    serve(args.ring, args.port, args.fps, args.size, args.host)
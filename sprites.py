@@ -2,6 +2,8 @@ import time
 import pygame as pg
 from os import path
 import sys
+import fonts
+import asset_cache
 from settings import *
 vec = pg.math.Vector2
 from os import path
@@ -27,7 +29,7 @@ class Player(pg.sprite.Sprite):
         self.player_imgs_right = []
         self.player_imgs_down = []
         self.player_imgs_up = []
-        self.image = red_player_imgs_down[0]
+        self.image = PLAYER_ATLASES["Red"].image("down")
         self.sync_img = "self.Players[p[0]].player_imgs_down"
         self.sync_img_index = "[0]"
         self.left_img_index = 0
@@ -37,71 +39,24 @@ class Player(pg.sprite.Sprite):
         self.image_dead = None
         self.player_colour = player_colour
         self.autonomous = False  # Set True for agent-controlled mode
-        if self.player_colour == "Red":
-            self.player_imgs_left = red_player_imgs_left
-            self.player_imgs_right = red_player_imgs_right
-            self.player_imgs_down = red_player_imgs_down
-            self.player_imgs_up = red_player_imgs_up
-            self.image = red_player_imgs_down[0]
-            self.image_dead = red_player_imgs_dead
-            self.image_ghost_left = red_player_imgs_ghost_left
-            self.image_ghost_right = red_player_imgs_ghost_right
-            self.emergency_meeting_img = red_player_emergency_meeting
-            self.emergency_meeting_img_sync = "red_player_emergency_meeting"
-            self.emergency_meeting_img_sync_report = "red_player_emergency_meeting_report"
-            self.eject_img = "red_player_imgs_right[9]"
-        if self.player_colour == "Blue":
-            self.player_imgs_left = blue_player_imgs_left
-            self.player_imgs_right = blue_player_imgs_right
-            self.player_imgs_down = blue_player_imgs_down
-            self.player_imgs_up = blue_player_imgs_up
-            self.image = blue_player_imgs_down[0]
-            self.image_dead = blue_player_imgs_dead
-            self.image_ghost_left = blue_player_imgs_ghost_left
-            self.image_ghost_right = blue_player_imgs_ghost_right
-            self.emergency_meeting_img = blue_player_emergency_meeting
-            self.emergency_meeting_img_sync = "blue_player_emergency_meeting"
-            self.emergency_meeting_img_sync_report = "blue_player_emergency_meeting_report"
-            self.eject_img = "blue_player_imgs_right[9]"
-        if self.player_colour == "Orange":
-            self.player_imgs_left = orange_player_imgs_left
-            self.player_imgs_right = orange_player_imgs_right
-            self.player_imgs_down = orange_player_imgs_down
-            self.player_imgs_up = orange_player_imgs_up
-            self.image = orange_player_imgs_down[0]
-            self.image_dead = orange_player_imgs_dead
-            self.image_ghost_left = orange_player_imgs_ghost_left
-            self.image_ghost_right = orange_player_imgs_ghost_right
-            self.emergency_meeting_img = orange_player_emergency_meeting
-            self.emergency_meeting_img_sync = "orange_player_emergency_meeting"
-            self.emergency_meeting_img_sync_report = "orange_player_emergency_meeting_report"
-            self.eject_img = "orange_player_imgs_right[9]"
-        if self.player_colour == "Yellow":
-            self.player_imgs_left = yellow_player_imgs_left
-            self.player_imgs_right = yellow_player_imgs_right
-            self.player_imgs_down = yellow_player_imgs_down
-            self.player_imgs_up = yellow_player_imgs_up
-            self.image = yellow_player_imgs_down[0]
-            self.image_dead = yellow_player_imgs_dead
-            self.image_ghost_left = yellow_player_imgs_ghost_left
-            self.image_ghost_right = yellow_player_imgs_ghost_right
-            self.emergency_meeting_img = yellow_player_emergency_meeting
-            self.emergency_meeting_img_sync = "yellow_player_emergency_meeting"
-            self.emergency_meeting_img_sync_report = "yellow_player_emergency_meeting_report"
-            self.eject_img = "yellow_player_imgs_right[9]"
-        if self.player_colour == "Green":
-            self.player_imgs_left = green_player_imgs_left
-            self.player_imgs_right = green_player_imgs_right
-            self.player_imgs_down = green_player_imgs_down
-            self.player_imgs_up = green_player_imgs_up
-            self.image = green_player_imgs_down[0]
-            self.image_dead = green_player_imgs_dead
-            self.image_ghost_left = green_player_imgs_ghost_left
-            self.image_ghost_right = green_player_imgs_ghost_right
-            self.emergency_meeting_img = green_player_emergency_meeting
-            self.emergency_meeting_img_sync = "green_player_emergency_meeting"
-            self.emergency_meeting_img_sync_report = "green_player_emergency_meeting_report"
-            self.eject_img = "green_player_imgs_right[9]"
+        atlas = PLAYER_ATLASES.get(self.player_colour)
+        if atlas is not None:
+            name = self.player_colour.lower()
+            self.player_imgs_left = atlas.frames("left")
+            self.player_imgs_right = atlas.frames("right")
+            self.player_imgs_down = atlas.frames("down")
+            self.player_imgs_up = atlas.frames("up")
+            self.image = self.player_imgs_down[0]
+            self.image_dead = atlas.image("dead")
+            # eval'd by game.py (and sent over the network) as a settings name
+            self.eject_img = f"{name}_player_imgs_right[{min(9, len(self.player_imgs_right) - 1)}]"
+            if "ghost_left" in atlas:
+                self.image_ghost_left = atlas.image("ghost_left")
+                self.image_ghost_right = atlas.image("ghost_right")
+            if self.player_colour in EMERGENCY_MEETING_IMGS:
+                self.emergency_meeting_img = EMERGENCY_MEETING_IMGS[self.player_colour]
+                self.emergency_meeting_img_sync = f"{name}_player_emergency_meeting"
+                self.emergency_meeting_img_sync_report = f"{name}_player_emergency_meeting_report"
         #self.image = game.player_imgs_left[0]
         self.rect = self.image.get_rect()
         self.hit_rect = self.rect
@@ -309,130 +264,9 @@ class Bot(pg.sprite.Sprite):
         self.bot_direction = bot_direction
         self.bot_colour = bot_colour
         
-        if bot_direction == "Left":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_left[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_left[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_left[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_left[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_left[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_left[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_left[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_left[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_left[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_left[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Right":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_right[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_right[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_right[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_right[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_right[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_right[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_right[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_right[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_right[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_right[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Up":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_up[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_up[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_up[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_up[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_up[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_up[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_up[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_up[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_up[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_up[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Down":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_down[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_down[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_down[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_down[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_down[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_down[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_down[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_down[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_down[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_down[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
+        atlas = PLAYER_ATLASES[bot_colour]
+        self.image = atlas.image(bot_direction.lower())
+        self.dead_player_img = atlas.image("dead")
         
         self.rect = self.image.get_rect()
         self.hit_rect = self.rect
@@ -539,8 +373,7 @@ class Button:
         self.height = height
         #self.image = pg.image.load(path.join(self.game.game_folder, img_addr))
         if img_addr is not None:
-            self.image = pg.image.load(path.join(self.game.game_folder, img_addr)).convert_alpha()
-            self.image = pg.transform.smoothscale(self.image, (a,b)).convert_alpha()
+            self.image = asset_cache.load(path.join(self.game.game_folder, img_addr), (a, b))
             self.image.set_alpha(opacity)
 
             #self.image = pg.image.load(img_addr)
@@ -553,8 +386,7 @@ class Button:
         # Draw button on screen
         pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.height))
         # font = pygame.font.SysFont("comicsans", self.text_size)
-        font = pg.font.Font(FONT, self.text_size)
-        text = font.render(self.text, 1, self.text_color)
+        text = fonts.render_text(FONT, self.text_size, self.text, 1, self.text_color)
         win.blit(text, (self.x + round(self.width / 2) - round(text.get_width() / 2),
                                 self.y + round(self.height / 2) - round(text.get_height() / 2)))
     def draw_Image(self, screen):
@@ -1,3 +1,6 @@
+import math
+from collections import OrderedDict
+
 import pygame as pg
 from settings import *
 import pytmx
@@ -34,10 +37,98 @@ class TiledMap:
                     if tile:
                         surface.blit(tile, (x * self.tmxdata.tilewidth,
                                             y * self.tmxdata.tileheight))
-    def make_map(self):
-        temp_surface = pg.Surface((self.width, self.height))
-        self.render(temp_surface)
-        return temp_surface
+
+    def render_area(self, surface, area):
+        """Draw only the tiles that overlap `area` (map pixels) onto surface at -area.topleft."""
+        tw, th = self.tmxdata.tilewidth, self.tmxdata.tileheight
+        ti = self.tmxdata.get_tile_image_by_gid
+        # tiles are drawn at the top-left of their cell and can be larger than
+        # the grid, so they spill right/down: include cells left of and above area
+        spill_x, spill_y = self.max_tile_size()
+        first_x = max((area.left - spill_x) // tw, 0)
+        last_x = min((area.right - 1) // tw, self.tmxdata.width - 1)
+        first_y = max((area.top - spill_y) // th, 0)
+        last_y = min((area.bottom - 1) // th, self.tmxdata.height - 1)
+        for layer in self.tmxdata.visible_layers:
+            if isinstance(layer, pytmx.TiledTileLayer):
+                for y in range(first_y, last_y + 1):
+                    row = layer.data[y]
+                    for x in range(first_x, last_x + 1):
+                        tile = ti(row[x]) if row[x] else None
+                        if tile:
+                            surface.blit(tile, (x * tw - area.left, y * th - area.top))
+
+    def max_tile_size(self):
+        # how far (px) a tile image reaches past its own grid cell
+        if not hasattr(self, '_spill'):
+            images = [img for img in self.tmxdata.images if img]
+            self._spill = (max([img.get_width() for img in images] + [self.tmxdata.tilewidth]) - self.tmxdata.tilewidth,
+                           max([img.get_height() for img in images] + [self.tmxdata.tileheight]) - self.tmxdata.tileheight)
+        return self._spill
+
+
+class ChunkedMap:
+    """The rendered map, kept as CHUNK_SIZE squares instead of one huge Surface.
+
+    Chunks are rendered from the tmx layers the first time the camera sees
+    them and kept in an LRU of at most MAX_CHUNKS (always enough for one
+    screen); only chunks that intersect the view are blitted. The map is
+    immutable: anything drawn over it is composited per frame by its owner.
+    """
+
+    CHUNK_SIZE = 512
+    MAX_CHUNKS = 16
+
+    def __init__(self, tiled_map, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS):
+        self.tiled_map = tiled_map
+        self.width = tiled_map.width
+        self.height = tiled_map.height
+        self.chunk_size = chunk_size
+        # a screen straddles at most ceil(W/size)+1 x ceil(H/size)+1 chunks
+        on_screen = (math.ceil(WIDTH / chunk_size) + 1) * (math.ceil(HEIGHT / chunk_size) + 1)
+        self.max_chunks = max(max_chunks, on_screen)
+        self.chunks = OrderedDict()   # (cx, cy) -> Surface, least recently used first
+
+    def get_rect(self, **kwargs):
+        rect = pg.Rect(0, 0, self.width, self.height)
+        for attr, value in kwargs.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def chunk_rect(self, cx, cy):
+        size = self.chunk_size
+        return pg.Rect(cx * size, cy * size, size, size).clip(pg.Rect(0, 0, self.width, self.height))
+
+    def chunks_in(self, rect):
+        """Chunk coordinates covering rect (map pixels)."""
+        rect = rect.clip(pg.Rect(0, 0, self.width, self.height))
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+        size = self.chunk_size
+        return [(cx, cy)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def chunk(self, cx, cy):
+        surface = self.chunks.get((cx, cy))
+        if surface is not None:
+            self.chunks.move_to_end((cx, cy))
+            return surface
+        area = self.chunk_rect(cx, cy)
+        surface = pg.Surface(area.size)
+        self.tiled_map.render_area(surface, area)
+        self.chunks[(cx, cy)] = surface
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def draw(self, screen, camera):
+        """Blit the chunks that intersect the camera's view of the map."""
+        offset_x, offset_y = camera.camera.topleft
+        view = pg.Rect(-offset_x, -offset_y, screen.get_width(), screen.get_height())
+        for cx, cy in self.chunks_in(view):
+            surface = self.chunk(cx, cy)
+            screen.blit(surface, (cx * self.chunk_size + offset_x, cy * self.chunk_size + offset_y))
 
 
 class Camera:
@@ -70,3 +161,120 @@ class Camera:
 
         # Adjust camera rectangle
         self.camera = pg.Rect(x, y, self.width, self.height)
+
+    def view_rect(self, size=(WIDTH, HEIGHT)):
+        """The part of the map (map pixels) the screen shows."""
+        return pg.Rect(-self.camera.x, -self.camera.y, size[0], size[1])
+
+
+class SpatialGrid:
+    """Uniform grid over map pixels: cell -> sprites whose rect overlaps it.
+
+    move() re-buckets a sprite only when its rect changed, so keeping the
+    grid current costs a tuple compare for sprites that stand still.
+    """
+
+    CELL_SIZE = 256
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}     # (cx, cy) -> set of sprites
+        self.placed = {}    # sprite -> (rect tuple, cell keys)
+
+    def cells_in(self, rect):
+        size = self.cell_size
+        return [(cx, cy)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def move(self, sprite):
+        """Insert sprite, or re-bucket it if its rect moved since last time."""
+        rect = sprite.rect
+        key = (rect.x, rect.y, rect.w, rect.h)
+        placed = self.placed.get(sprite)
+        if placed is not None:
+            if placed[0] == key:
+                return
+            self.remove(sprite)
+        cells = self.cells_in(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(sprite)
+        self.placed[sprite] = (key, cells)
+
+    def remove(self, sprite):
+        placed = self.placed.pop(sprite, None)
+        if placed is None:
+            return
+        for cell in placed[1]:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(sprite)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query(self, rect):
+        """Sprites whose rect intersects rect."""
+        found = set()
+        for cell in self.cells_in(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return [sprite for sprite in found if sprite.rect.colliderect(rect)]
+
+
+class SpatialLayeredUpdates(pg.sprite.LayeredUpdates):
+    """LayeredUpdates that also keeps its sprites in a SpatialGrid.
+
+    Sprites with their own update() are re-bucketed after every update();
+    sprites added before they have a rect (Sprite.__init__ runs first) are
+    placed on the next update() or visible(). visible() returns the sprites
+    overlapping a rect in the same layer order iteration would give.
+    """
+
+    def __init__(self, *sprites, cell_size=SpatialGrid.CELL_SIZE, **kwargs):
+        self.grid = SpatialGrid(cell_size)
+        self._order = {}        # sprite -> insertion serial, ties within a layer
+        self._serial = 0
+        self._mobile = set()
+        self._pending = set()
+        pg.sprite.LayeredUpdates.__init__(self, *sprites, **kwargs)
+
+    def add_internal(self, sprite, layer=None):
+        pg.sprite.LayeredUpdates.add_internal(self, sprite, layer)
+        self._serial += 1
+        self._order[sprite] = self._serial
+        if type(sprite).update is not pg.sprite.Sprite.update:
+            self._mobile.add(sprite)
+        self._pending.add(sprite)
+
+    def remove_internal(self, sprite):
+        pg.sprite.LayeredUpdates.remove_internal(self, sprite)
+        self.grid.remove(sprite)
+        self._order.pop(sprite, None)
+        self._mobile.discard(sprite)
+        self._pending.discard(sprite)
+
+    def change_layer(self, sprite, new_layer):
+        pg.sprite.LayeredUpdates.change_layer(self, sprite, new_layer)
+        # change_layer puts the sprite last in its new layer
+        self._serial += 1
+        self._order[sprite] = self._serial
+
+    def _place_pending(self):
+        for sprite in list(self._pending):
+            if getattr(sprite, 'rect', None) is not None:
+                self.grid.move(sprite)
+                self._pending.discard(sprite)
+
+    def update(self, *args, **kwargs):
+        pg.sprite.LayeredUpdates.update(self, *args, **kwargs)
+        self._place_pending()
+        for sprite in self._mobile:
+            if sprite not in self._pending:
+                self.grid.move(sprite)
+
+    def visible(self, rect):
+        """Sprites intersecting rect (map pixels), in draw order."""
+        self._place_pending()
+        layers = self._spritelayers
+        return sorted(self.grid.query(rect), key=lambda s: (layers[s], self._order[s]))
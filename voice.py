@@ -1,9 +1,16 @@
 #!/usr/bin/python3
 
+import os
 import socket
+import struct
 import threading
+import time
 import pyaudio
 
+import voice_codec
+import voice_transport
+import voice_vad
+
 class Client:
     def __init__(self):
         self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -20,37 +27,114 @@ class Client:
             except:
                 print("Couldn't connect to server")
 
-        chunk_size = 1024 # 512
+        chunk_size = voice_codec.FRAME_SAMPLES
         audio_format = pyaudio.paInt16
         channels = 1
-        rate = 20000
+        rate = voice_codec.SAMPLE_RATE
+
+        # outgoing frames use one codec, incoming frames carry their own codec id
+        self.codec = voice_codec.create_codec()
+        self.decoders = voice_codec.DecoderBank()
+        self.frames = voice_codec.FrameReader()
 
         # initialise microphone recording
         self.p = pyaudio.PyAudio()
         self.playing_stream = self.p.open(format=audio_format, channels=channels, rate=rate, output=True, frames_per_buffer=chunk_size)
         self.recording_stream = self.p.open(format=audio_format, channels=channels, rate=rate, input=True, frames_per_buffer=chunk_size)
-        
-        print("Connected to Server")
+
+        # announce our in-game colour so the server can attenuate by distance
+        colour = os.environ.get("VOICE_PLAYER_COLOUR") or input('Enter your player colour (blank for global voice) --> ')
+        if colour.strip():
+            self.s.sendall(voice_codec.pack_frame(voice_codec.HELLO, colour.strip().encode('utf-8')))
+
+        # the TCP connection is the session; audio goes over UDP tagged with its token
+        self.token = self.wait_for_session()
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server_udp = (self.target_ip, self.target_port)
+        self.seq = 0
+        self.last_sent = 0.0
+        self.jitter = voice_transport.JitterBuffer(self.decoders.decode)
+        self.vad = voice_vad.VoiceActivityDetector()
+        self.silent_frames = 0
+        self.running = True
+        self.send_keepalive()
+
+        print("Connected to Server (codec: " + self.codec.name + ")")
 
         # start threads
-        receive_thread = threading.Thread(target=self.receive_server_data).start()
+        threading.Thread(target=self.watch_session, daemon=True).start()
+        threading.Thread(target=self.receive_server_data, daemon=True).start()
+        threading.Thread(target=self.play_received_audio, daemon=True).start()
         self.send_data_to_server()
 
-    def receive_server_data(self):
+    def wait_for_session(self):
         while True:
+            data = self.s.recv(1024)
+            if not data:
+                raise SystemExit("Server closed the connection")
+            for codec_id, payload in self.frames.feed(data):
+                if codec_id == voice_codec.SESSION:
+                    return struct.unpack("<I", payload)[0]
+
+    def watch_session(self):
+        # nothing but control frames arrive here; EOF ends the session
+        while self.running:
             try:
                 data = self.s.recv(1024)
-                self.playing_stream.write(data)
+            except OSError:
+                data = b''
+            if not data:
+                print("Disconnected from server")
+                self.running = False
+
+    def send_keepalive(self):
+        # lets the server learn (and NATs keep open) our UDP address while we are quiet
+        self.udp.sendto(voice_transport.pack_packet(self.token, self.seq, self.codec.codec_id), self.server_udp)
+        self.last_sent = time.monotonic()
+
+    def receive_server_data(self):
+        while self.running:
+            try:
+                datagram, addr = self.udp.recvfrom(voice_transport.MAX_DATAGRAM)
+                packet = voice_transport.unpack_packet(datagram)
+                if packet and packet[3]:
+                    self.jitter.put(packet[1], packet[2], packet[3])
             except:
                 pass
 
+    def play_received_audio(self):
+        # the output device paces this loop: one 20 ms frame per write
+        while self.running:
+            try:
+                pcm = self.jitter.pop()
+                self.playing_stream.write(pcm or voice_codec.SILENT_FRAME)
+            except:
+                pass
 
     def send_data_to_server(self):
-        while True:
+        while self.running:
             try:
-                data = self.recording_stream.read(1024)
-                self.s.sendall(data)
+                data = self.recording_stream.read(voice_codec.FRAME_SAMPLES, exception_on_overflow=False)
+                # only speech is sent; silence is a comfort-noise marker every CN_INTERVAL frames.
+                # The sequence number still advances every frame so receivers keep time.
+                if self.vad.process(data):
+                    self.silent_frames = 0
+                    packet = voice_transport.pack_packet(self.token, self.seq, self.codec.codec_id, self.codec.encode(data))
+                else:
+                    packet = None
+                    if self.silent_frames % voice_vad.CN_INTERVAL == 0:
+                        packet = voice_transport.pack_packet(self.token, self.seq, voice_codec.COMFORT_NOISE,
+                                                             bytes([self.vad.noise_level]))
+                    self.silent_frames += 1
+                if packet:
+                    self.udp.sendto(packet, self.server_udp)
+                    self.last_sent = time.monotonic()
+                elif time.monotonic() - self.last_sent > voice_transport.KEEPALIVE_INTERVAL:
+                    # keep the server's view of our UDP address (and any NAT mapping) fresh
+                    self.send_keepalive()
+                self.seq = (self.seq + 1) & 0xFFFF
             except:
                 pass
 
-client = Client()
+if __name__ == "__main__":
+    client = Client()
@@ -0,0 +1,390 @@
+"""
+Headless Voice Pipeline Benchmark for MonadSus voice chat.
+
+Starts server_voice.Server in its own process and drives N synthetic
+clients against it over loopback - no PyAudio, no audio devices. Each
+client behaves like voice.py: it "captures" a generated waveform every
+20 ms, runs the VAD, encodes and sends over UDP, and plays received
+audio out of a JitterBuffer on the same 20 ms clock.
+
+Every client talks in bursts of its own tone (250 Hz + 100 Hz * id) over
+a low noise floor, staggered so that about --talkers clients speak at a
+time. Listeners look for each tone's onset in what they pop from their
+jitter buffer; the time from the onset's capture tick to that pop is the
+end-to-end latency through encode, server jitter buffer, mix, re-encode,
+client jitter buffer and decode.
+
+Measured:
+- server CPU (time.process_time inside the server process) per wall
+  second and per 20 ms mix tick
+- per-listener downlink and per-speaker uplink in kbit/s, including
+  IP/UDP headers
+- onset latency percentiles and missed onsets
+- jitter-buffer counters (concealed, late, trimmed) summed over clients
+
+Results are printed and written as JSON so runs can be compared:
+
+    python voice_bench.py --clients 16 --talkers 3 --duration 20 --output before.json
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+import voice_codec
+import voice_transport
+import voice_vad
+
+
+# ---------------------------------------------------------------------------
+# Synthetic Speech
+# ---------------------------------------------------------------------------
+
+TICK = voice_codec.FRAME_MS / 1000
+BURST_TICKS = 15            # 300 ms talk spurts
+TONE_AMPLITUDE = 6000
+NOISE_RMS = 30.0            # about -60 dBFS of background
+BASE_FREQ = 250.0
+FREQ_STEP = 100.0
+MAX_CLIENTS = int((voice_codec.SAMPLE_RATE / 2 - 500 - BASE_FREQ) // FREQ_STEP)
+ONSET_ON = 1500.0           # detected tone amplitude that counts as an onset...
+ONSET_OFF = 500.0           # ...after it was below this
+ONSET_WINDOW = 0.5          # seconds; later detections are not matched to an onset
+IP_UDP_OVERHEAD = 28
+
+
+def tone_freq(client_id: int) -> float:
+    return BASE_FREQ + FREQ_STEP * client_id
+
+
+class Schedule:
+    """Which client talks on which tick: bursts staggered so ~talkers overlap."""
+
+    def __init__(self, clients: int, talkers: int, warmup_ticks: int):
+        self.clients = clients
+        self.warmup = warmup_ticks
+        self.period = max(math.ceil(BURST_TICKS * clients / max(talkers, 1)), 2 * BURST_TICKS)
+
+    def phase(self, client_id: int) -> int:
+        return self.warmup + client_id * self.period // self.clients
+
+    def talking(self, client_id: int, tick: int) -> bool:
+        offset = tick - self.phase(client_id)
+        return offset >= 0 and offset % self.period < BURST_TICKS
+
+    def last_onset(self, client_id: int, tick: int):
+        offset = tick - self.phase(client_id)
+        return None if offset < 0 else tick - offset % self.period
+
+    def onsets(self, client_id: int, ticks: int):
+        return range(self.phase(client_id), ticks, self.period)
+
+
+class ToneDetector:
+    """Amplitude of every client's tone in one frame (a bank of DFT probes)."""
+
+    def __init__(self, clients: int):
+        n = np.arange(voice_codec.FRAME_SAMPLES)
+        freqs = np.array([tone_freq(i) for i in range(clients)])
+        self.probes = np.exp(-2j * np.pi * np.outer(freqs, n) / voice_codec.SAMPLE_RATE)
+        self.window = np.hanning(voice_codec.FRAME_SAMPLES)
+        self.scale = 2.0 / self.window.sum()
+
+    def amplitudes(self, pcm: bytes) -> np.ndarray:
+        samples = np.frombuffer(pcm, dtype=np.int16) * self.window
+        return np.abs(self.probes @ samples) * self.scale
+
+
+# ---------------------------------------------------------------------------
+# Synthetic Client
+# ---------------------------------------------------------------------------
+
+class SyntheticClient:
+    """voice.py without the sound card: same VAD, codec, packets and jitter buffer."""
+
+    def __init__(self, client_id, address, codec, schedule, detector, loss, rng):
+        self.id = client_id
+        self.freq = tone_freq(client_id)
+        self.schedule = schedule
+        self.detector = detector
+        self.loss = loss
+        self.rng = rng
+        self.noise = np.random.default_rng(client_id)
+
+        self.tcp = socket.create_connection(address)
+        frames = voice_codec.FrameReader()
+        self.token = None
+        while self.token is None:
+            data = self.tcp.recv(1024)
+            if not data:
+                raise ConnectionError("voice server closed the connection")
+            for codec_id, payload in frames.feed(data):
+                if codec_id == voice_codec.SESSION:
+                    self.token = struct.unpack("<I", payload)[0]
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.setblocking(False)
+        self.server = address
+
+        self.codec = voice_codec.create_codec(codec)
+        self.decoders = voice_codec.DecoderBank()
+        self.jitter = voice_transport.JitterBuffer(self.decoders.decode)
+        self.vad = voice_vad.VoiceActivityDetector()
+        self.seq = 0
+        self.silent_frames = 0
+        self.heard = np.zeros(detector.probes.shape[0], dtype=bool)
+
+        self.measuring = False
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.latencies = []
+        self.detected = set()        # (speaker, onset tick)
+        self.udp.sendto(voice_transport.pack_packet(self.token, 0, self.codec.codec_id), self.server)
+
+    def capture(self, tick: int) -> bytes:
+        frame = self.noise.normal(0.0, NOISE_RMS, voice_codec.FRAME_SAMPLES)
+        if self.schedule.talking(self.id, tick):
+            n = tick * voice_codec.FRAME_SAMPLES + np.arange(voice_codec.FRAME_SAMPLES)
+            frame += TONE_AMPLITUDE * np.sin(2 * np.pi * self.freq * n / voice_codec.SAMPLE_RATE)
+        return np.clip(frame, -32768, 32767).astype(np.int16).tobytes()
+
+    def send(self, tick: int):
+        pcm = self.capture(tick)
+        if self.vad.process(pcm):
+            self.silent_frames = 0
+            packet = voice_transport.pack_packet(self.token, self.seq, self.codec.codec_id, self.codec.encode(pcm))
+        else:
+            packet = None
+            if self.silent_frames % voice_vad.CN_INTERVAL == 0:
+                packet = voice_transport.pack_packet(self.token, self.seq, voice_codec.COMFORT_NOISE,
+                                                     bytes([self.vad.noise_level]))
+            self.silent_frames += 1
+        if packet and self.rng.random() >= self.loss:
+            self.udp.sendto(packet, self.server)
+            if self.measuring:
+                self.bytes_up += len(packet) + IP_UDP_OVERHEAD
+        self.seq = (self.seq + 1) & 0xFFFF
+
+    def receive(self, now: float):
+        while True:
+            try:
+                datagram = self.udp.recv(voice_transport.MAX_DATAGRAM)
+            except (BlockingIOError, ConnectionError):
+                return
+            packet = voice_transport.unpack_packet(datagram)
+            if packet and packet[3]:
+                self.jitter.put(packet[1], packet[2], packet[3], now)
+            if self.measuring:
+                self.bytes_down += len(datagram) + IP_UDP_OVERHEAD
+
+    def play(self, tick: int, now: float, start_at: float):
+        pcm = self.jitter.pop()
+        if pcm is None:
+            self.heard[:] = False
+            return
+        amplitudes = self.detector.amplitudes(pcm)
+        onsets = np.flatnonzero((amplitudes > ONSET_ON) & ~self.heard)
+        self.heard = np.where(amplitudes > ONSET_ON, True, np.where(amplitudes < ONSET_OFF, False, self.heard))
+        for speaker in onsets.tolist():
+            if speaker == self.id:
+                continue
+            onset = self.schedule.last_onset(speaker, tick)
+            if onset is None or (speaker, onset) in self.detected:
+                continue
+            latency = now - (start_at + onset * TICK)
+            if latency <= ONSET_WINDOW:
+                self.detected.add((speaker, onset))
+                if self.measuring:
+                    self.latencies.append(latency)
+
+    def close(self):
+        self.udp.close()
+        self.tcp.close()
+
+
+# ---------------------------------------------------------------------------
+# Processes
+# ---------------------------------------------------------------------------
+
+def run_server(host, port, ready, measure, stop, results):
+    """Server process: serve until told to stop, report CPU over the measured window."""
+    import server_voice
+
+    server = server_voice.Server(ip=host, port=port, game_server=host)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ready.set()
+    measure.wait()
+    cpu0, wall0 = time.process_time(), time.monotonic()
+    stop.wait()
+    results.put({"cpu_seconds": time.process_time() - cpu0, "wall_seconds": time.monotonic() - wall0})
+
+
+def run_clients(ids, args, barrier, start_value, results):
+    """Client worker: drives its share of the synthetic clients on a 20 ms clock."""
+    warmup_ticks = int(args.warmup / TICK)
+    total_ticks = warmup_ticks + int(args.duration / TICK)
+    schedule = Schedule(args.clients, args.talkers, warmup_ticks)
+    detector = ToneDetector(args.clients)
+    rng = random.Random(args.seed * 1000 + ids[0])
+    clients = [SyntheticClient(i, (args.host, args.port), args.codec, schedule, detector, args.loss, rng)
+               for i in ids]
+    barrier.wait()
+    barrier.wait()                   # parent has published the start time
+    start_at = start_value.value
+    overrun = 0.0
+    for tick in range(total_ticks):
+        due = start_at + tick * TICK
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.monotonic()
+        overrun = max(overrun, now - due)
+        if tick == warmup_ticks:
+            for client in clients:
+                client.measuring = True
+        for client in clients:
+            client.send(tick)
+        for client in clients:
+            client.receive(now)
+        for client in clients:
+            client.play(tick, now, start_at)
+
+    report = []
+    for client in clients:
+        expected = sum(1 for speaker in range(args.clients) if speaker != client.id
+                       for onset in schedule.onsets(speaker, total_ticks)
+                       if onset >= warmup_ticks and (onset + 1) * TICK + ONSET_WINDOW < total_ticks * TICK)
+        detected = sum(1 for _, onset in client.detected if onset >= warmup_ticks)
+        report.append({
+            "id": client.id,
+            "down_kbps": client.bytes_down * 8 / args.duration / 1000,
+            "up_kbps": client.bytes_up * 8 / args.duration / 1000,
+            "latencies": client.latencies,
+            "onsets_expected": expected,
+            "onsets_detected": min(detected, expected),
+            "jitter": dict(client.jitter.stats),
+        })
+        client.close()
+    results.put({"clients": report, "overrun_ms": overrun * 1000})
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def percentiles(values, points=(50, 95, 99)):
+    if not values:
+        return {f"p{p}": None for p in points}
+    return {f"p{p}": round(float(np.percentile(values, p)), 2) for p in points}
+
+
+def run(args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    ready, measure, stop = ctx.Event(), ctx.Event(), ctx.Event()
+    server_results, client_results = ctx.Queue(), ctx.Queue()
+    server = ctx.Process(target=run_server, args=(args.host, args.port, ready, measure, stop, server_results),
+                         daemon=True)
+    server.start()
+    if not ready.wait(10):
+        raise RuntimeError("voice server did not start")
+
+    workers = args.workers = max(1, min(args.workers or os.cpu_count() or 1, args.clients))
+    shares = [list(range(args.clients))[w::workers] for w in range(workers)]
+    barrier = ctx.Barrier(workers + 1)
+    start_value = ctx.Value("d", 0.0)
+    procs = [ctx.Process(target=run_clients, args=(ids, args, barrier, start_value, client_results), daemon=True)
+             for ids in shares]
+    for proc in procs:
+        proc.start()
+    barrier.wait(30)                 # every client has its session
+    start_value.value = time.monotonic() + 0.1
+    barrier.wait(30)
+
+    time.sleep(max(start_value.value + args.warmup - time.monotonic(), 0))
+    measure.set()
+    parts = [client_results.get(timeout=args.warmup + args.duration + 60) for _ in procs]
+    stop.set()
+    cpu = server_results.get(timeout=10)
+    for proc in procs + [server]:
+        proc.join(5)
+
+    clients = sorted((c for part in parts for c in part["clients"]), key=lambda c: c["id"])
+    latencies = [lat * 1000 for c in clients for lat in c["latencies"]]
+    down = [c["down_kbps"] for c in clients]
+    up = [c["up_kbps"] for c in clients]
+    jitter = {key: sum(c["jitter"].get(key, 0) for c in clients) for key in clients[0]["jitter"]}
+    ticks = cpu["wall_seconds"] / TICK
+    return {
+        "config": {key: getattr(args, key) for key in
+                   ("clients", "talkers", "codec", "duration", "warmup", "loss", "seed", "workers")},
+        "server": {
+            "cpu_seconds": round(cpu["cpu_seconds"], 3),
+            "cpu_percent": round(100 * cpu["cpu_seconds"] / cpu["wall_seconds"], 1),
+            "cpu_ms_per_tick": round(cpu["cpu_seconds"] * 1000 / ticks, 3),
+        },
+        "bandwidth_kbps": {
+            "down_mean": round(float(np.mean(down)), 2),
+            "down_max": round(float(np.max(down)), 2),
+            "up_mean": round(float(np.mean(up)), 2),
+        },
+        "latency_ms": dict(percentiles(latencies),
+                           max=round(max(latencies), 2) if latencies else None,
+                           samples=len(latencies)),
+        "onsets": {
+            "expected": sum(c["onsets_expected"] for c in clients),
+            "detected": sum(c["onsets_detected"] for c in clients),
+        },
+        "jitter_buffers": jitter,
+        "client_overrun_ms": round(max(p["overrun_ms"] for p in parts), 2),
+        "listeners": [{
+            "id": c["id"],
+            "down_kbps": round(c["down_kbps"], 2),
+            "latency_ms": percentiles([lat * 1000 for lat in c["latencies"]], (50, 95)),
+        } for c in clients],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MonadSus voice pipeline benchmark")
+    parser.add_argument("--clients", type=int, default=8, help="synthetic clients (max %d)" % MAX_CLIENTS)
+    parser.add_argument("--talkers", type=int, default=2, help="clients talking at the same time, on average")
+    parser.add_argument("--codec", default=voice_codec.DEFAULT_CODEC, choices=sorted(voice_codec.CODECS))
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before measuring")
+    parser.add_argument("--loss", type=float, default=0.0, help="uplink packet loss probability")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=0, help="client processes (default: one per CPU)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4422)
+    parser.add_argument("--output", default="voice_bench.json")
+    args = parser.parse_args()
+    if not 2 <= args.clients <= MAX_CLIENTS:
+        parser.error(f"--clients must be between 2 and {MAX_CLIENTS}")
+
+    results = run(args)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    lat, bw, srv = results["latency_ms"], results["bandwidth_kbps"], results["server"]
+    print(f"  [BENCH] {args.clients} clients, {args.talkers} talking, codec {args.codec}, {args.duration:.0f} s")
+    print(f"  [BENCH] server CPU {srv['cpu_percent']}% ({srv['cpu_ms_per_tick']} ms per 20 ms tick)")
+    print(f"  [BENCH] downlink {bw['down_mean']} kbit/s per listener (max {bw['down_max']}), "
+          f"uplink {bw['up_mean']} kbit/s per speaker")
+    print(f"  [BENCH] latency p50 {lat['p50']} / p95 {lat['p95']} / p99 {lat['p99']} ms, "
+          f"onsets {results['onsets']['detected']}/{results['onsets']['expected']}")
+    if results["client_overrun_ms"] > voice_codec.FRAME_MS:
+        print(f"  [BENCH] warning: clients fell {results['client_overrun_ms']} ms behind their clock, "
+              f"use more --workers or fewer --clients")
+    print(f"  [BENCH] results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
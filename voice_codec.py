@@ -0,0 +1,305 @@
+"""
+Voice Codec Layer for MonadSus voice chat.
+
+Compresses the 16-bit mono microphone frames exchanged by voice.py and
+server_voice.py:
+- pcm   : raw passthrough (reference / debugging)
+- mulaw : G.711 mu-law, 8 bits per sample (2x), vectorized with NumPy
+- adpcm : IMA-ADPCM, 4 bits per sample (~4x), dependency-free default
+- opus  : Opus via opuslib (~15-20x), used when installed
+
+Audio runs at 16 kHz in 20 ms frames: Opus only accepts 8/12/16/24/48 kHz
+and 2.5-60 ms frames, and a fixed frame size keeps the server mixer and
+receive buffers aligned.
+
+Every payload carries its codec id, so a receiver can decode any codec
+without prior negotiation. Audio travels in UDP packets
+(voice_transport.py); the TCP session uses the same codec-id/length
+framing for its control frames (HELLO, SESSION).
+
+Select the send codec with VOICE_CODEC=pcm|mulaw|adpcm|opus.
+"""
+
+import os
+import struct
+from bisect import bisect_right
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+# Opus is optional - fall back to ADPCM if opuslib (and libopus) are missing
+try:
+    import opuslib
+    OPUS_AVAILABLE = True
+except Exception:
+    opuslib = None  # type: ignore
+    OPUS_AVAILABLE = False
+
+
+# ---------------------------------------------------------------------------
+# Audio Format
+# ---------------------------------------------------------------------------
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000   # 320 samples
+FRAME_BYTES = FRAME_SAMPLES * 2                  # 16-bit mono PCM
+SILENT_FRAME = bytes(FRAME_BYTES)
+
+
+# ---------------------------------------------------------------------------
+# Codecs
+# ---------------------------------------------------------------------------
+
+class VoiceCodec:
+    """Encodes one 20 ms PCM frame to a payload and back.
+
+    Instances are per stream: stateful codecs (Opus, the ADPCM encoder)
+    must not be shared between speakers.
+    """
+
+    codec_id = 0
+    name = "pcm"
+
+    def encode(self, pcm: bytes) -> bytes:
+        return pcm
+
+    def decode(self, payload: bytes) -> bytes:
+        return payload
+
+
+class MuLawCodec(VoiceCodec):
+    """G.711 mu-law companding, one byte per sample."""
+
+    codec_id = 1
+    name = "mulaw"
+
+    BIAS = 0x84
+    CLIP = 32635
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.int32)
+        sign = (samples < 0).astype(np.int32) << 7
+        magnitude = np.minimum(np.abs(samples), self.CLIP) + self.BIAS
+        exponent = np.clip(np.frexp(magnitude)[1] - 8, 0, 7)
+        mantissa = (magnitude >> (exponent + 3)) & 0x0F
+        return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+    def decode(self, payload: bytes) -> bytes:
+        u = ~np.frombuffer(payload, dtype=np.uint8).astype(np.int32) & 0xFF
+        exponent = (u >> 4) & 0x07
+        magnitude = (((u & 0x0F) << 3) + self.BIAS) << exponent
+        samples = np.where(u & 0x80, self.BIAS - magnitude, magnitude - self.BIAS)
+        return samples.astype(np.int16).tobytes()
+
+
+_IMA_STEPS = (
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+)
+_IMA_INDEX = (-1, -1, -1, -1, 2, 4, 6, 8)
+
+# The ADPCM recursion is sequential (each code depends on the predictor the
+# previous one left), so it cannot be vectorized; instead every per-sample
+# branch is folded into tables indexed by step index and 3-bit magnitude:
+#   _IMA_LEVELS[i][m] : |delta| the decoder adds for magnitude m at step index i,
+#                       ascending in m, so the encoder's magnitude for |diff| is
+#                       bisect_right(levels, |diff|) - 1 (the reference encoder's
+#                       successive subtraction picks the same code)
+#   _IMA_VPDIFF[i][m] : that delta plus the step >> 3 rounding term
+#   _IMA_NEXT[i][m]   : the step index after magnitude m
+_IMA_LEVELS = tuple(tuple((m >> 2) * s + ((m >> 1) & 1) * (s >> 1) + (m & 1) * (s >> 2) for m in range(8))
+                    for s in _IMA_STEPS)
+_IMA_VPDIFF = tuple(tuple(level + (s >> 3) for level in levels) for s, levels in zip(_IMA_STEPS, _IMA_LEVELS))
+_IMA_NEXT = tuple(tuple(min(max(i + _IMA_INDEX[m], 0), 88) for m in range(8)) for i in range(len(_IMA_STEPS)))
+
+
+class AdpcmCodec(VoiceCodec):
+    """IMA-ADPCM, 4 bits per sample.
+
+    Each payload starts with the predictor state (<hB + pad) so frames
+    decode independently; only the encoder carries state between frames.
+    """
+
+    codec_id = 2
+    name = "adpcm"
+
+    STATE = struct.Struct("<hBx")
+
+    def __init__(self):
+        self.predictor = 0
+        self.index = 0
+
+    def encode(self, pcm: bytes) -> bytes:
+        header = self.STATE.pack(self.predictor, self.index)
+        predictor, index = self.predictor, self.index
+        levels, vpdiffs, nexts = _IMA_LEVELS, _IMA_VPDIFF, _IMA_NEXT
+        codes = bytearray(len(pcm) // 2)
+        for n, sample in enumerate(np.frombuffer(pcm, dtype=np.int16).tolist()):
+            diff = sample - predictor
+            if diff < 0:
+                m = bisect_right(levels[index], -diff) - 1
+                predictor -= vpdiffs[index][m]
+                if predictor < -32768:
+                    predictor = -32768
+                codes[n] = m | 8
+            else:
+                m = bisect_right(levels[index], diff) - 1
+                predictor += vpdiffs[index][m]
+                if predictor > 32767:
+                    predictor = 32767
+                codes[n] = m
+            index = nexts[index][m]
+        self.predictor, self.index = predictor, index
+        nibbles = np.frombuffer(codes, dtype=np.uint8)
+        if len(nibbles) % 2:
+            nibbles = np.append(nibbles, np.uint8(0))
+        return header + (nibbles[0::2] | (nibbles[1::2] << 4)).tobytes()
+
+    def decode(self, payload: bytes) -> bytes:
+        predictor, index = self.STATE.unpack_from(payload)
+        packed = np.frombuffer(payload, dtype=np.uint8, offset=self.STATE.size)
+        nibbles = np.empty(len(packed) * 2, dtype=np.uint8)
+        nibbles[0::2] = packed & 0x0F
+        nibbles[1::2] = packed >> 4
+        vpdiffs, nexts = _IMA_VPDIFF, _IMA_NEXT
+        out = [0] * len(nibbles)
+        for n, code in enumerate(nibbles.tolist()):
+            m = code & 7
+            if code & 8:
+                predictor -= vpdiffs[index][m]
+                if predictor < -32768:
+                    predictor = -32768
+            else:
+                predictor += vpdiffs[index][m]
+                if predictor > 32767:
+                    predictor = 32767
+            index = nexts[index][m]
+            out[n] = predictor
+        return np.array(out, dtype=np.int16).tobytes()
+
+
+class OpusCodec(VoiceCodec):
+    """Opus (VoIP mode) through opuslib."""
+
+    codec_id = 3
+    name = "opus"
+
+    BITRATE = 20000
+
+    def __init__(self):
+        if not OPUS_AVAILABLE:
+            raise RuntimeError("opuslib is not installed")
+        self.encoder = opuslib.Encoder(SAMPLE_RATE, 1, opuslib.APPLICATION_VOIP)
+        self.encoder.bitrate = self.BITRATE
+        self.decoder = opuslib.Decoder(SAMPLE_RATE, 1)
+
+    def encode(self, pcm: bytes) -> bytes:
+        return self.encoder.encode(pcm, FRAME_SAMPLES)
+
+    def decode(self, payload: bytes) -> bytes:
+        return self.decoder.decode(payload, FRAME_SAMPLES)
+
+
+CODECS = {cls.name: cls for cls in (VoiceCodec, MuLawCodec, AdpcmCodec, OpusCodec)}
+CODECS_BY_ID = {cls.codec_id: cls for cls in CODECS.values()}
+DEFAULT_CODEC = "adpcm"
+
+# Not a codec: marks the start (and continuation) of a silent stretch.
+# Payload is one byte, the background level in -dBFS (see voice_vad.py).
+COMFORT_NOISE = 13
+
+
+def create_codec(name: Optional[str] = None) -> VoiceCodec:
+    """Build a codec by name (default: VOICE_CODEC env var, then ADPCM)."""
+    name = (name or os.environ.get("VOICE_CODEC", DEFAULT_CODEC)).lower()
+    if name not in CODECS:
+        print(f"  [VOICE] Unknown codec '{name}', using {DEFAULT_CODEC}")
+        name = DEFAULT_CODEC
+    if name == "opus" and not OPUS_AVAILABLE:
+        print(f"  [VOICE] opuslib not available, using {DEFAULT_CODEC}")
+        name = DEFAULT_CODEC
+    return CODECS[name]()
+
+
+class DecoderBank:
+    """Lazily creates one decoder per codec id seen on a stream."""
+
+    def __init__(self):
+        self.decoders = {}
+
+    def decode(self, codec_id: int, payload: bytes) -> Optional[bytes]:
+        codec = self.decoders.get(codec_id)
+        if codec is None:
+            cls = CODECS_BY_ID.get(codec_id)
+            if cls is None or (cls is OpusCodec and not OPUS_AVAILABLE):
+                return None
+            codec = self.decoders[codec_id] = cls()
+        return codec.decode(payload)
+
+
+# ---------------------------------------------------------------------------
+# Stream Framing
+# ---------------------------------------------------------------------------
+
+FRAME_HEADER = struct.Struct("<BH")
+HELLO = 0xFF     # control frame: payload is the sender's player colour (utf-8)
+SESSION = 0xFE   # control frame: payload is the UDP session token (u32)
+
+
+def pack_frame(codec_id: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(codec_id, len(payload)) + payload
+
+
+class FrameReader:
+    """Reassembles (codec_id, payload) frames from arbitrary recv() chunks."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> Iterator[Tuple[int, bytes]]:
+        self.buffer += data
+        offset = 0
+        while len(self.buffer) - offset >= FRAME_HEADER.size:
+            codec_id, length = FRAME_HEADER.unpack_from(self.buffer, offset)
+            end = offset + FRAME_HEADER.size + length
+            if end > len(self.buffer):
+                break
+            yield codec_id, bytes(self.buffer[offset + FRAME_HEADER.size:end])
+            offset = end
+        del self.buffer[:offset]
+
+
+# ---------------------------------------------------------------------------
+# Self-check
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import time
+
+    t = np.arange(FRAME_SAMPLES * 50) / SAMPLE_RATE
+    speech = (6000 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))).astype(np.int16)
+    frames = [speech[i:i + FRAME_SAMPLES].tobytes() for i in range(0, len(speech), FRAME_SAMPLES)]
+    raw_kbps = 20000 * 16 / 1000   # the original 20 kHz PCM stream
+
+    for name in CODECS:
+        if name == "opus" and not OPUS_AVAILABLE:
+            print(f"{name:>6}: skipped (opuslib not installed)")
+            continue
+        enc, dec = CODECS[name](), CODECS[name]()
+        reader = FrameReader()
+        start = time.perf_counter()
+        wire = b"".join(pack_frame(enc.codec_id, enc.encode(f)) for f in frames)
+        decoded = b"".join(dec.decode(p) for _, p in reader.feed(wire))
+        elapsed = (time.perf_counter() - start) / len(frames) * 1000
+        out = np.frombuffer(decoded, dtype=np.int16).astype(np.float64)
+        assert len(out) == len(speech), name
+        snr = 10 * np.log10(np.sum(speech.astype(np.float64) ** 2) / max(np.sum((out - speech) ** 2), 1e-9))
+        kbps = len(wire) * 8 / (len(frames) * FRAME_MS)
+        print(f"{name:>6}: {kbps:6.1f} kbit/s ({raw_kbps / kbps:4.1f}x), SNR {snr:5.1f} dB, "
+              f"{elapsed:.2f} ms/frame")
@@ -0,0 +1,168 @@
+"""
+Server-side Voice Mixer for MonadSus voice chat.
+
+Every 20 ms tick the server takes at most one decoded frame per speaker
+and mixes them into a single frame per listener, leaving the listener's
+own voice out. Mixing is one matrix product:
+
+    out[listener] = sum over speakers of gains[listener, speaker] * frame[speaker]
+
+with gains 1 everywhere except 0 on the listener's own column (or a
+distance falloff from ProximityGains), followed by a per-listener peak
+limiter so loud overlapping speakers are scaled down instead of
+hard-clipping. Speakers nobody can hear and listeners who hear nobody are
+culled before the mix, so they cost neither mixing nor encoding.
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from voice_transport import JitterBuffer
+
+
+# ---------------------------------------------------------------------------
+# Mixing
+# ---------------------------------------------------------------------------
+
+INT16_MAX = 32767
+
+
+def self_excluding_gains(listeners: List[Hashable], speakers: List[Hashable]) -> np.ndarray:
+    """Unity gain matrix (listeners x speakers) with each listener's own voice muted."""
+    gains = np.ones((len(listeners), len(speakers)), dtype=np.float32)
+    column = {key: i for i, key in enumerate(speakers)}
+    for row, key in enumerate(listeners):
+        if key in column:
+            gains[row, column[key]] = 0.0
+    return gains
+
+
+def mix_frames(frames: np.ndarray, gains: np.ndarray) -> np.ndarray:
+    """Mix (speakers x samples) int16 frames into (listeners x samples) int16.
+
+    Rows whose peak exceeds int16 range are scaled down to fit; the final
+    clip only catches rounding.
+    """
+    mixed = gains @ frames.astype(np.float32)
+    peaks = np.abs(mixed).max(axis=1, keepdims=True)
+    mixed *= np.minimum(1.0, INT16_MAX / np.maximum(peaks, 1.0))
+    return np.clip(np.rint(mixed), -INT16_MAX - 1, INT16_MAX).astype(np.int16)
+
+
+# ---------------------------------------------------------------------------
+# Proximity
+# ---------------------------------------------------------------------------
+
+FULL_VOLUME_RANGE = 250.0   # px, full volume up to the task/report radius
+HEARING_RANGE = 800.0       # px, speakers further away are culled
+
+
+class ProximityGains:
+    """Gain matrix from player positions in the latest game snapshot.
+
+    Stream keys are mapped to player colours via `colours`. Outside
+    meetings alive speakers fade linearly from FULL_VOLUME_RANGE to
+    HEARING_RANGE, and dead speakers are only heard by other ghosts.
+    During a meeting everyone hears everyone. Pairs where either side has
+    no known position (colour not announced, not in the game, no game
+    server) keep global voice.
+    """
+
+    def __init__(self, full_range: float = FULL_VOLUME_RANGE, hearing_range: float = HEARING_RANGE):
+        self.full_range = full_range
+        self.hearing_range = hearing_range
+        self.colours: Dict[Hashable, str] = {}
+        self.players: Dict[str, tuple] = {}   # colour -> (x, y, alive)
+        self.meeting = False
+
+    def update(self, players: Dict[str, tuple], meeting: bool):
+        self.players = players
+        self.meeting = meeting
+
+    def _lookup(self, keys: List[Hashable]):
+        states = [self.players.get(self.colours.get(key)) for key in keys]
+        known = np.array([st is not None for st in states], dtype=bool)
+        xy = np.array([st[:2] if st else (0.0, 0.0) for st in states], dtype=np.float32).reshape(-1, 2)
+        alive = np.array([bool(st[2]) if st else True for st in states], dtype=bool)
+        return known, xy, alive
+
+    def __call__(self, listeners: List[Hashable], speakers: List[Hashable]) -> np.ndarray:
+        gains = self_excluding_gains(listeners, speakers)
+        if self.meeting or not self.players:
+            return gains
+        l_known, l_xy, l_alive = self._lookup(listeners)
+        s_known, s_xy, s_alive = self._lookup(speakers)
+        dist = np.hypot(l_xy[:, None, 0] - s_xy[None, :, 0], l_xy[:, None, 1] - s_xy[None, :, 1])
+        falloff = np.clip((self.hearing_range - dist) / (self.hearing_range - self.full_range), 0.0, 1.0)
+        # alive speakers by distance; dead speakers only reach ghosts
+        proximity = np.where(s_alive[None, :], falloff, (~l_alive[:, None]).astype(np.float32))
+        known = l_known[:, None] & s_known[None, :]
+        return np.where(known, gains * proximity, gains).astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Frame Queues
+# ---------------------------------------------------------------------------
+
+COMFORT_LEVEL = 70   # -dBFS, when no speaker has reported its background yet
+
+
+class VoiceMixer:
+    """Per-speaker jitter buffers feeding a fixed-rate mix.
+
+    push() is called as packets arrive; mix() once per tick by the mixer
+    clock. Each speaker's buffer reorders, conceals losses and keeps its
+    own latency bounded, so a speaker that bursts or drops packets never
+    delays the others.
+    """
+
+    def __init__(self):
+        self.buffers: Dict[Hashable, JitterBuffer] = {}
+
+    def add(self, key: Hashable, decode: Callable[[int, bytes], Optional[bytes]]):
+        # silent speakers pop None (no comfort noise) so the mix culls them
+        self.buffers.setdefault(key, JitterBuffer(decode, comfort_noise=False))
+
+    def remove(self, key: Hashable):
+        self.buffers.pop(key, None)
+
+    def push(self, key: Hashable, seq: int, codec_id: int, payload: bytes):
+        buffer = self.buffers.get(key)
+        if buffer is not None:
+            buffer.put(seq, codec_id, payload)
+
+    def comfort_level(self, default: int = COMFORT_LEVEL) -> int:
+        """Background level to announce to a listener whose mix went silent."""
+        levels = [b.comfort_level for b in self.buffers.values() if b.comfort_level is not None]
+        return int(np.mean(levels)) if levels else default
+
+    def pop_frames(self):
+        """Take this tick's frame from every speaker that is playing: (keys, frames)."""
+        speakers, frames = [], []
+        for key, buffer in list(self.buffers.items()):
+            pcm = buffer.pop()
+            if pcm is not None:
+                speakers.append(key)
+                frames.append(np.frombuffer(pcm, dtype=np.int16))
+        return speakers, frames
+
+    def mix(self, listeners: List[Hashable], gains_fn=None) -> Dict[Hashable, Optional[np.ndarray]]:
+        """One tick: the mixed frame for each listener, None when nobody is audible.
+
+        gains_fn(listeners, speakers) may supply a custom gain matrix; the
+        default is unity gain minus the listener's own voice.
+        """
+        speakers, frames = self.pop_frames()
+        if not speakers or not listeners:
+            return {key: None for key in listeners}
+        gains = (gains_fn or self_excluding_gains)(listeners, speakers)
+        result: Dict[Hashable, Optional[np.ndarray]] = {key: None for key in listeners}
+        rows = np.flatnonzero(gains.any(axis=1))
+        cols = np.flatnonzero(gains.any(axis=0))
+        if not len(rows):
+            return result
+        mixed = mix_frames(np.stack([frames[c] for c in cols]), gains[np.ix_(rows, cols)])
+        for i, row in enumerate(rows):
+            result[listeners[row]] = mixed[i]
+        return result
@@ -0,0 +1,185 @@
+"""
+UDP Voice Transport for MonadSus voice chat.
+
+Audio frames travel as sequenced UDP datagrams; the TCP connection to
+server_voice.py is kept for the session only (HELLO, session token,
+disconnect). Every receiver - the client's playback path and the server
+for each speaker - plays frames out of an adaptive jitter buffer:
+
+- packets are reordered by sequence number, late ones are dropped
+- the target depth follows the measured inter-arrival jitter
+  (RFC 3550 estimator), between MIN_DEPTH and MAX_DEPTH frames
+- a missing frame is concealed by repeating the last one at decaying
+  gain; after MAX_CONCEALED frames the stream goes quiet and rebuffers
+- a buffer that runs deeper than needed is trimmed so latency recovers
+  after a burst
+- after a comfort-noise marker the sender goes quiet on purpose: the gap
+  is filled with noise at the marker's level (or nothing, on the server)
+  rather than concealed, and the next talk spurt rebuffers
+
+Packet layout: token (u32) | sequence (u16) | codec id (u8) | payload.
+A packet with an empty payload is a keepalive that only registers the
+sender's UDP address.
+"""
+
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from voice_codec import FRAME_MS, FRAME_BYTES, COMFORT_NOISE
+from voice_vad import comfort_noise
+
+
+# ---------------------------------------------------------------------------
+# Packets
+# ---------------------------------------------------------------------------
+
+PACKET_HEADER = struct.Struct("<IHB")
+MAX_DATAGRAM = 2048
+KEEPALIVE_INTERVAL = 1.0   # seconds
+
+
+def pack_packet(token: int, seq: int, codec_id: int, payload: bytes = b"") -> bytes:
+    return PACKET_HEADER.pack(token, seq & 0xFFFF, codec_id) + payload
+
+
+def unpack_packet(datagram: bytes):
+    """(token, seq, codec_id, payload), or None for a runt datagram."""
+    if len(datagram) < PACKET_HEADER.size:
+        return None
+    token, seq, codec_id = PACKET_HEADER.unpack_from(datagram)
+    return token, seq, codec_id, datagram[PACKET_HEADER.size:]
+
+
+def seq_diff(a: int, b: int) -> int:
+    """a - b in 16-bit serial number arithmetic."""
+    return ((a - b + 0x8000) & 0xFFFF) - 0x8000
+
+
+# ---------------------------------------------------------------------------
+# Jitter Buffer
+# ---------------------------------------------------------------------------
+
+MIN_DEPTH = 2
+MAX_DEPTH = 12
+MAX_CONCEALED = 5
+CONCEAL_FADE = 0.6
+
+
+class JitterBuffer:
+    """Reorders one stream's frames and plays them out one per tick.
+
+    put() is called from the receive path, pop() once per 20 ms from the
+    playout clock (PyAudio on the client, the mix tick on the server).
+    `decode(codec_id, payload)` turns a payload into PCM in playout order,
+    so stateful codecs see their packets in sequence. With comfort_noise
+    False, silent stretches pop None so a mixer can skip the stream.
+    """
+
+    def __init__(self, decode: Callable[[int, bytes], Optional[bytes]],
+                 min_depth: int = MIN_DEPTH, max_depth: int = MAX_DEPTH,
+                 comfort_noise: bool = True):
+        self.decode = decode
+        self.comfort_noise = comfort_noise
+        self.comfort_level: Optional[int] = None   # set while the sender is quiet
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.packets: Dict[int, tuple] = {}
+        self.next_seq: Optional[int] = None
+        self.playing = False
+        self.jitter = 0.0            # seconds, smoothed
+        self.last_arrival = None
+        self.last_seq = None
+        self.last_frame: Optional[np.ndarray] = None
+        self.concealed = 0
+        self.lock = threading.Lock()
+        self.stats = {"received": 0, "late": 0, "concealed": 0, "trimmed": 0, "comfort": 0}
+
+    @property
+    def target_depth(self) -> int:
+        frames = int(np.ceil(3 * self.jitter * 1000 / FRAME_MS)) + 1
+        return min(max(frames, self.min_depth), self.max_depth)
+
+    def depth(self) -> int:
+        return len(self.packets)
+
+    def put(self, seq: int, codec_id: int, payload: bytes, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.stats["received"] += 1
+            if self.last_arrival is not None:
+                transit = (now - self.last_arrival) - seq_diff(seq, self.last_seq) * FRAME_MS / 1000
+                self.jitter += (abs(transit) - self.jitter) / 16
+            self.last_arrival, self.last_seq = now, seq
+            if codec_id == COMFORT_NOISE and not self.playing and not self.packets:
+                # nothing queued ahead of it: start the comfort noise straight away
+                self.comfort_level = payload[0] if payload else 127
+                return
+            if self.next_seq is not None and self.playing and seq_diff(seq, self.next_seq) < 0:
+                self.stats["late"] += 1
+                return
+            self.packets[seq] = (codec_id, payload)
+            if self.next_seq is None or (not self.playing and seq_diff(seq, self.next_seq) < 0):
+                self.next_seq = seq
+
+    def pop(self) -> Optional[bytes]:
+        """The next frame of PCM, a concealment frame, or None while idle."""
+        with self.lock:
+            if not self.playing:
+                if len(self.packets) < self.target_depth:
+                    return self._comfort()
+                self.playing = True
+            # trim: skip ahead when we hold far more than the jitter needs
+            while len(self.packets) > self.target_depth + 2 and self.next_seq in self.packets:
+                del self.packets[self.next_seq]
+                self.next_seq = (self.next_seq + 1) & 0xFFFF
+                self.stats["trimmed"] += 1
+            item = self.packets.pop(self.next_seq, None)
+            self.next_seq = (self.next_seq + 1) & 0xFFFF
+            if item is not None and item[0] == COMFORT_NOISE:
+                self.comfort_level = item[1][0] if item[1] else 127
+                self.last_frame = None
+                return self._quiet()
+            if item is not None:
+                pcm = self.decode(*item)
+                if pcm and len(pcm) == FRAME_BYTES:
+                    self.concealed = 0
+                    self.comfort_level = None
+                    self.last_frame = np.frombuffer(pcm, dtype=np.int16)
+                    return pcm
+            if self.comfort_level is not None:
+                return self._quiet()
+            return self._conceal()
+
+    def _quiet(self) -> Optional[bytes]:
+        # discontinuous transmission: wait for the next talk spurt
+        if not self.packets:
+            self.playing = False
+            self.next_seq = None
+        return self._comfort()
+
+    def _comfort(self) -> Optional[bytes]:
+        if self.comfort_level is None or not self.comfort_noise:
+            return None
+        self.stats["comfort"] += 1
+        return comfort_noise(self.comfort_level)
+
+    def _conceal(self) -> Optional[bytes]:
+        self.concealed += 1
+        self.stats["concealed"] += 1
+        if self.last_frame is None or self.concealed > MAX_CONCEALED:
+            if not self.packets:
+                # the talker stopped (or the link died): rebuffer
+                self.playing = False
+                self.next_seq = None
+                self.last_frame = None
+                return None
+            # jump over a long gap to the next packet we do have
+            self.next_seq = min(self.packets, key=lambda s: seq_diff(s, self.next_seq))
+            self.concealed = 0
+            return bytes(FRAME_BYTES)
+        gain = CONCEAL_FADE ** (self.concealed - 1)
+        return (self.last_frame * gain).astype(np.int16).tobytes()
@@ -0,0 +1,110 @@
+"""
+Voice Activity Detection for MonadSus voice chat.
+
+Classifies each 20 ms microphone frame as speech or silence from its
+energy and zero-crossing rate, both computed with NumPy over the whole
+frame:
+- voiced speech: energy well above the tracked noise floor
+- unvoiced speech (s, f, sh): a smaller energy rise with a high
+  zero-crossing rate
+- a hangover keeps the detector open for a few hundred ms after the last
+  speech frame so word endings and short pauses are not clipped
+
+While silent the client sends only a comfort-noise (CN) marker carrying
+the background level, on the transition and then every CN_INTERVAL
+frames; receivers fill the gap with noise at that level instead of dead
+silence.
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from voice_codec import FRAME_SAMPLES
+
+
+# ---------------------------------------------------------------------------
+# Detector
+# ---------------------------------------------------------------------------
+
+SPEECH_MARGIN_DB = 9.0      # voiced: this far above the noise floor
+UNVOICED_MARGIN_DB = 4.0    # unvoiced: smaller rise...
+UNVOICED_ZCR = 0.25         # ...with at least this zero-crossing rate
+MIN_SPEECH_DBFS = -55.0     # never call anything quieter speech
+HANGOVER_FRAMES = 15        # 300 ms
+FLOOR_RISE = 0.02           # noise floor follows rising background slowly
+FLOOR_WINDOW = 150          # 3 s: the floor is never below the quietest frame in this window
+CN_INTERVAL = 25            # re-send the CN marker every 500 ms of silence
+
+
+def frame_energy_db(samples: np.ndarray) -> float:
+    """Mean power of an int16 frame in dBFS."""
+    power = np.mean(np.square(samples.astype(np.float32) / 32768.0))
+    return float(10.0 * np.log10(max(power, 1e-10)))
+
+
+def zero_crossing_rate(samples: np.ndarray) -> float:
+    signs = np.signbit(samples)
+    return float(np.count_nonzero(signs[1:] != signs[:-1])) / max(len(samples) - 1, 1)
+
+
+class VoiceActivityDetector:
+    """Energy / zero-crossing VAD with an adaptive noise floor and hangover."""
+
+    def __init__(self, hangover: int = HANGOVER_FRAMES):
+        self.hangover = hangover
+        self.noise_floor = MIN_SPEECH_DBFS
+        self.recent = deque(maxlen=FLOOR_WINDOW)   # energies of the last FLOOR_WINDOW frames
+        self.remaining = 0
+        self.active = False
+
+    def process(self, pcm: bytes) -> bool:
+        """Feed one frame; True while the frame should be transmitted."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        energy = frame_energy_db(samples)
+        zcr = zero_crossing_rate(samples)
+
+        rise = energy - self.noise_floor
+        speech = energy > MIN_SPEECH_DBFS and (
+            rise > SPEECH_MARGIN_DB or (rise > UNVOICED_MARGIN_DB and zcr > UNVOICED_ZCR))
+
+        if speech:
+            self.remaining = self.hangover
+        else:
+            # track the background: drop immediately, rise slowly
+            if energy < self.noise_floor:
+                self.noise_floor = energy
+            else:
+                self.noise_floor += (energy - self.noise_floor) * FLOOR_RISE
+            self.remaining = max(self.remaining - 1, 0)
+
+        # A background that jumps by more than SPEECH_MARGIN_DB (a fan, traffic)
+        # makes every frame look like speech, so the update above never runs.
+        # Speech always has quieter gaps within a few seconds: once even the
+        # quietest recent frame is above the floor, the floor moves up to it.
+        self.recent.append(energy)
+        if len(self.recent) == FLOOR_WINDOW:
+            self.noise_floor = max(self.noise_floor, min(self.recent))
+
+        self.active = speech or self.remaining > 0
+        return self.active
+
+    @property
+    def noise_level(self) -> int:
+        """Background level for the CN marker: attenuation in dB (0..127)."""
+        return int(min(max(-self.noise_floor, 0), 127))
+
+
+# ---------------------------------------------------------------------------
+# Comfort Noise
+# ---------------------------------------------------------------------------
+
+_rng = np.random.default_rng()
+
+
+def comfort_noise(level: int, rng: Optional[np.random.Generator] = None) -> bytes:
+    """One frame of white noise at -level dBFS."""
+    rms = 32768.0 * 10 ** (-level / 20.0)
+    noise = (rng or _rng).normal(0.0, rms, FRAME_SAMPLES)
+    return np.clip(noise, -32768, 32767).astype(np.int16).tobytes()